@@ -0,0 +1,155 @@
+import os
+import csv
+import random
+import struct
+from pathlib import Path
+
+
+class Audit:
+    def __init__(self):
+        self.matched_csv_path = "frames.csv"
+        self.realsense_csv_path = "realsense/csv/frames.csv"
+
+        # (매칭 결과 컬럼, realsense CSV 컬럼, 디렉토리)
+        self.references = [
+            ('rgb_path', 'color_file_path', "realsense/color"),
+            ('depth_path', 'depth_file_path', "realsense/depth"),
+            ('aligned_depth_path', 'aligned_depth_file_path', "realsense/depth_aligned"),
+        ]
+
+        # 0바이트 파일 검사 (opt-in). POSIX에서는 디렉토리 항목마다 lstat 1회가 추가되므로
+        # 기본은 stat 없이 디렉토리 목록만 읽는다 (Windows는 scandir 결과에 크기가 포함됨)
+        self.check_empty = False
+
+        # 임의 표본 파일의 해상도/크기 검사
+        self.spot_check = 0
+        self.color_shape = None     # (height, width)
+        self.depth_shape = None     # (height, width), uint16
+        self.seed = None
+
+    ##
+    # Private
+
+    def _scan(self, directory):
+        """디렉토리를 한 번만 훑어 파일 상대 경로 집합과 0바이트 파일 집합 반환
+
+        bucket 배치(하위 디렉토리)도 따라 내려가며, 경로는 CSV와 같은 '/' 구분 상대 경로.
+        """
+        names = set()
+        empty = set()
+        if not directory.exists():
+            return names, empty
+
+        pending = [(directory, "")]
+        while pending:
+            current, prefix = pending.pop()
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    name = prefix + entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append((entry.path, name + "/"))
+                        continue
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+                    names.add(name)
+                    if self.check_empty and entry.stat(follow_symlinks=False).st_size == 0:
+                        empty.add(name)
+        return names, empty
+
+    def _read_column(self, csv_file, column):
+        if not csv_file.exists():
+            return None
+        with open(csv_file, 'r', newline='') as f:
+            reader = csv.DictReader(f)
+            if column not in (reader.fieldnames or []):
+                return None
+            return {row[column] for row in reader if row[column]}
+
+    def _png_shape(self, path):
+        """PNG IHDR에서 (height, width)"""
+        with open(path, 'rb') as f:
+            header = f.read(24)
+        if len(header) < 24 or header[:8] != b"\x89PNG\r\n\x1a\n":
+            return None
+        width, height = struct.unpack(">II", header[16:24])
+        return height, width
+
+    def _spot_check(self, directory, names, column):
+        """표본 파일이 예상 해상도/크기와 맞는지 확인"""
+        bad = []
+        # 정렬된 깊이는 컬러 해상도를 따른다
+        depth_shape = {'depth_path': self.depth_shape, 'aligned_depth_path': self.color_shape}.get(column)
+
+        sample = random.Random(self.seed).sample(sorted(names), min(self.spot_check, len(names)))
+        for name in sample:
+            path = directory / name
+            if column == 'rgb_path' and self.color_shape is not None:
+                shape = self._png_shape(path)
+                if shape != tuple(self.color_shape):
+                    bad.append((name, f"shape {shape} != {tuple(self.color_shape)}"))
+            elif depth_shape is not None:
+                expected = depth_shape[0] * depth_shape[1] * 2
+                size = path.stat().st_size
+                if size != expected:
+                    bad.append((name, f"size {size} != {expected}"))
+        return sample, bad
+
+    ##
+    # Public
+
+    def audit(self, output_dir):
+        """매칭 결과가 참조하는 프레임 파일이 모두 있는지 일괄 검사"""
+        print("출력 무결성 검사 시작...")
+        output_path = Path(output_dir)
+
+        matched_csv = output_path / self.matched_csv_path
+        if not matched_csv.exists():
+            print(f"매칭 결과 파일을 찾을 수 없습니다: {matched_csv}")
+            return None
+
+        report = {}
+        for column, source_column, dir_name in self.references:
+            directory = output_path / dir_name
+            referenced = self._read_column(matched_csv, column)
+            if referenced is None:
+                continue
+
+            names, empty = self._scan(directory)
+            extracted = self._read_column(output_path / self.realsense_csv_path, source_column)
+
+            missing = referenced - names
+            orphaned = names - extracted if extracted is not None else set()
+            sample, bad = self._spot_check(directory, referenced & names, column) if self.spot_check else ([], [])
+
+            report[column] = {
+                'directory': str(directory),
+                'files': len(names),
+                'referenced': len(referenced),
+                'missing': sorted(missing),
+                'empty': sorted(empty & referenced),
+                'orphaned': sorted(orphaned),
+                'unreferenced': len(names - referenced),
+                'spot_checked': len(sample),
+                'bad_size': bad,
+            }
+
+            print(f"\n[{column}] {directory}")
+            print(f"  Files on disk: {len(names):,}")
+            print(f"  Referenced by {self.matched_csv_path}: {len(referenced):,}")
+            print(f"  Missing: {len(missing):,}")
+            if self.check_empty:
+                print(f"  Zero-byte (referenced): {len(empty & referenced):,}")
+            print(f"  Orphaned (not in {self.realsense_csv_path}): {len(orphaned):,}")
+            if sample:
+                print(f"  Spot-checked: {len(sample):,}, mismatched: {len(bad):,}")
+            for name in sorted(missing)[:5]:
+                print(f"    missing: {name}")
+
+        print(f"\n출력 무결성 검사 {'통과' if self.passed(report) else '실패'}")
+        return report
+
+    def passed(self, report):
+        """audit() 결과에 누락/0바이트/크기 불일치 파일이 없는지 (매칭 결과가 없으면 실패)"""
+        if report is None:
+            return False
+        return all(not info['missing'] and not info['empty'] and not info['bad_size'] for info in report.values())
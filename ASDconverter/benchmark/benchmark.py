@@ -0,0 +1,229 @@
+import os
+import json
+import time
+import shutil
+import platform
+from pathlib import Path
+from datetime import datetime
+
+
+class _TimedStage:
+    """단계 객체 대신 Converter에 넣어 진입 메서드 실행 시간을 누적하는 대리 객체
+
+    속성 읽기/쓰기는 원래 단계 객체로 넘긴다 (Realsense는 원래 객체가 pool로 전달되므로
+    대리 객체는 pickle되지 않는다).
+    """
+
+    def __init__(self, stage, methods, timings, name):
+        object.__setattr__(self, '_stage', stage)
+        object.__setattr__(self, '_methods', methods)
+        object.__setattr__(self, '_timings', timings)
+        object.__setattr__(self, '_name', name)
+
+    def __getattr__(self, name):
+        attribute = getattr(self._stage, name)
+        if name not in self._methods:
+            return attribute
+
+        def timed(*args, **kwargs):
+            timing = self._timings.setdefault(self._name, {'seconds': 0.0, 'calls': 0, 'result': None})
+            started = time.perf_counter()
+            try:
+                timing['result'] = attribute(*args, **kwargs)
+                return timing['result']
+            finally:
+                timing['seconds'] += time.perf_counter() - started
+                timing['calls'] += 1
+        return timed
+
+    def __setattr__(self, name, value):
+        setattr(self._stage, name, value)
+
+
+class Benchmark:
+    """Converter.convert 전체를 실행하며 단계별 처리량 측정
+
+    입력(필요하면 Synthetic으로 생성)을 새 출력 디렉토리로 변환하고, 단계별 시간과
+    출력 행 수로 처리량(행/s)을, RealSense는 bag 크기로 MB/s를 계산한다.
+    checkpoint로 건너뛰는 세션이 없도록 매번 새 하위 디렉토리에 출력한다.
+    """
+
+    def __init__(self):
+        # Converter 속성 이름 -> 시간을 잴 진입 메서드
+        self.stage_methods = {
+            'realsense': ('convert', 'stream'),
+            'tobii': ('convert', 'stream'),
+            'gaze': ('process',),
+            'user': ('convert',),
+            'played': ('convert',),
+            'filter': ('filter_frames', 'filter_stream'),
+            'matcher': ('match_frames', 'match_stream'),
+            'audit': ('audit',),
+            'packer': ('pack',),
+        }
+
+        self.run_dir_pattern = "bench_{time}"
+        self.result_file_pattern = "bench_{time}.json"
+
+        # 측정 후 변환 출력 삭제 (결과 JSON은 output_dir에 남김)
+        self.cleanup = False
+
+    ##
+    # Private
+
+    def _enabled_stages(self, converter):
+        """이번 실행에서 사용할 단계만 대리 객체로 교체 (사용하지 않는 단계는 import하지 않음)"""
+        skipped = set()
+        if not converter.gaze_preprocess or converter.streaming:
+            skipped.add('gaze')
+        if not converter.run_audit:
+            skipped.add('audit')
+        if not converter.run_pack:
+            skipped.add('packer')
+        return [name for name in self.stage_methods if name not in skipped]
+
+    def _install(self, converter, timings):
+        for name in self._enabled_stages(converter):
+            stage = getattr(converter, name)
+            setattr(converter, name, _TimedStage(stage, self.stage_methods[name], timings, name))
+
+    def _count_rows(self, csv_file):
+        """헤더를 제외한 CSV 행 수 (없으면 0)"""
+        if not csv_file.exists():
+            return 0
+        with open(csv_file, 'rb') as f:
+            return max(0, sum(1 for line in f if line.strip()) - 1)
+
+    def _bag_bytes(self, input_path):
+        return sum(bag.stat().st_size for bag in input_path.glob("session_*_realsense/*.bag"))
+
+    def _dir_bytes(self, path):
+        if not path.is_dir():
+            return 0
+        return sum(
+            (Path(root) / name).stat().st_size
+            for root, dirs, files in os.walk(path) for name in files
+        )
+
+    def _items(self, converter, output_path, timings):
+        """단계별 처리 항목 수 (출력 행 수 기준, pack은 묶은 파일 수)"""
+        realsense_rows = self._count_rows(output_path / converter.filter.realsense_csv_path)
+        tobii_rows = self._count_rows(output_path / converter.filter.tobii_csv_path)
+        matched_rows = self._count_rows(output_path / converter.matcher.matched_output_path)
+        index_file = output_path / converter.matcher.index_output_path
+        if matched_rows == 0 and index_file.exists():
+            import numpy as np
+            matched_rows = len(np.load(index_file, mmap_mode='r'))
+
+        return {
+            'realsense': realsense_rows,
+            'tobii': tobii_rows,
+            'gaze': tobii_rows,
+            'user': 1,
+            'played': self._count_rows(output_path / converter.filter.played_csv_path),
+            'filter': (
+                self._count_rows(output_path / converter.filter.filtered_realsense_filename)
+                + self._count_rows(output_path / converter.filter.filtered_tobii_filename)
+            ),
+            'matcher': matched_rows,
+            'audit': matched_rows,
+            'packer': (timings.get('packer', {}).get('result') or (0, 0))[1],
+        }
+
+    def _report(self, results, wall_seconds, streaming):
+        print("\n=== Benchmark 결과 ===")
+        print(f"  {'stage':<10} {'seconds':>9} {'items':>10} {'items/s':>11} {'MB/s':>8}")
+        for name, result in results.items():
+            mb_per_second = f"{result['mb_per_second']:.1f}" if 'mb_per_second' in result else '-'
+            print(
+                f"  {name:<10} {result['seconds']:>9.3f} {result['items']:>10,}"
+                f" {result['items_per_second']:>11,.1f} {mb_per_second:>8}"
+            )
+        print(f"  {'total':<10} {wall_seconds:>9.3f}")
+        if streaming:
+            print("  (스트리밍 모드: 단계들이 동시에 실행되므로 단계별 시간은 서로 겹칩니다)")
+
+    ##
+    # Public
+
+    def run(self, converter, input_dir, output_dir, synthetic=None):
+        """converter 설정 그대로 전체 변환을 실행하고 단계별 결과 반환
+
+        synthetic이 주어지면 input_dir에 합성 입력을 먼저 생성한다.
+        """
+        input_path = Path(input_dir)
+        output_path = Path(output_dir)
+
+        params = {}
+        if synthetic is not None:
+            params['synthetic'] = synthetic.generate(input_path)
+
+        run_time = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        run_path = output_path / self.run_dir_pattern.format(time=run_time)
+        run_path.mkdir(parents=True)
+
+        # rs-convert가 없는 환경(Linux 등)에서도 측정할 수 있도록 직접 기록으로 전환
+        if not converter.realsense.inline_frames and not converter.realsense.has_rs_convert():
+            print(f"  rs-convert를 찾을 수 없어 프레임 파일을 디코딩 중 직접 기록합니다: {converter.realsense.rs_convert_exe}")
+            converter.realsense.inline_frames = True
+
+        timings = {}
+        self._install(converter, timings)
+
+        started = time.perf_counter()
+        converter.convert(str(input_path), str(run_path))
+        wall_seconds = time.perf_counter() - started
+
+        items = self._items(converter, run_path, timings)
+        bag_bytes = self._bag_bytes(input_path)
+
+        results = {}
+        for name in self.stage_methods:
+            if name not in timings:
+                continue
+            seconds = timings[name]['seconds']
+            result = {
+                'seconds': seconds,
+                'calls': timings[name]['calls'],
+                'items': items[name],
+                'items_per_second': items[name] / seconds if seconds > 0 else 0.0,
+            }
+            if name == 'realsense':
+                result['input_bytes'] = bag_bytes
+                result['mb_per_second'] = bag_bytes / 1024 ** 2 / seconds if seconds > 0 else 0.0
+            if name == 'packer':
+                result['output_bytes'] = self._dir_bytes(run_path / converter.packer.pack_dir_name)
+            results[name] = result
+
+        self._report(results, wall_seconds, converter.streaming)
+
+        params.update({
+            'streaming': converter.streaming,
+            'range_pushdown': converter.range_pushdown,
+            'timestamp_unit': converter.timestamp.unit,
+            'shard_count': converter.realsense.shard_count,
+            'inline_frames': converter.realsense.inline_frames,
+            'match_workers': converter.matcher.workers,
+        })
+        summary = {
+            'input_dir': str(input_path),
+            'output_dir': str(run_path),
+            'params': params,
+            'machine': {
+                'platform': platform.platform(),
+                'python': platform.python_version(),
+                'cpu_count': os.cpu_count(),
+            },
+            'wall_seconds': wall_seconds,
+            'stages': results,
+        }
+
+        if self.cleanup:
+            shutil.rmtree(run_path)
+            print(f"  변환 출력 삭제: {run_path}")
+
+        result_file = output_path / self.result_file_pattern.format(time=run_time)
+        with open(result_file, 'w') as f:
+            json.dump(summary, f, indent=2)
+        print(f"  결과 저장: {result_file}")
+        return summary
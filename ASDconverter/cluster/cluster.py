@@ -0,0 +1,278 @@
+import os
+import json
+import time
+import random
+import socket
+import threading
+from pathlib import Path
+
+
+class JobQueue:
+    """공유 파일시스템(NFS) 위의 lease 파일로 참가자 디렉토리를 나누어 처리
+
+    중앙 서버 없이 각 worker가 같은 queue 디렉토리를 보며
+    - leases/<participant>/<generation>.lease : 세대별 lease. 가장 높은 세대가 현재 lease
+    - ledger/<participant>.json  : 처리 완료 기록 (성공한 참가자만)
+    - failed/<participant>.json  : 실패 기록. max_attempts회까지 다시 시도
+    을 사용한다.
+
+    점유와 인수는 다음 세대 파일을 link로 만드는 것 하나뿐이라(이미 있으면 실패)
+    같은 세대를 두 worker가 동시에 얻을 수 없다. 세대 파일은 소유자만 고쳐 쓰므로
+    갱신은 임시 파일 rename으로 원자적이며, 갱신 뒤 더 높은 세대가 생겼으면 lease를 잃은 것이다.
+    lease를 잃은 worker는 변환이 끝나도 ledger/failed에 기록하지 않는다 (fencing).
+
+    만료 판단은 각 노드의 시계(time.time)로 하므로 노드 간 시계가 NTP 등으로 맞춰져 있어야 한다.
+    시계 오차는 lease_seconds - renew_interval보다 충분히 작아야 하며,
+    그렇지 않으면 살아 있는 lease를 다른 worker가 만료로 보고 넘겨받을 수 있다.
+    """
+
+    def __init__(self):
+        self.lease_dir_name = "leases"
+        self.ledger_dir_name = "ledger"
+        self.failed_dir_name = "failed"
+
+        self.lease_seconds = 120.0      # lease 유효 시간
+        self.renew_interval = 30.0      # lease 갱신 주기
+        self.poll_interval = 30.0       # 남은 작업이 모두 다른 worker 점유 중일 때 대기
+        self.max_attempts = 3           # 참가자별 최대 시도 횟수 (실패 후 재시도 포함)
+
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}"
+
+    ##
+    # Private
+
+    def _lease_dir(self, queue_path, name):
+        return queue_path / self.lease_dir_name / name
+
+    def _lease_file(self, queue_path, name, generation):
+        return self._lease_dir(queue_path, name) / f"{generation:08d}.lease"
+
+    def _generations(self, queue_path, name):
+        """존재하는 lease 세대 번호 (오름차순)"""
+        return sorted(int(path.stem) for path in self._lease_dir(queue_path, name).glob("*.lease"))
+
+    def _ledger_file(self, queue_path, name):
+        return queue_path / self.ledger_dir_name / f"{name}.json"
+
+    def _failed_file(self, queue_path, name):
+        return queue_path / self.failed_dir_name / f"{name}.json"
+
+    def _attempts(self, queue_path, name):
+        try:
+            with open(self._failed_file(queue_path, name), 'r') as f:
+                return json.load(f).get('attempts', 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def _is_done(self, queue_path, name):
+        """성공했거나 시도 횟수를 모두 쓴 참가자"""
+        return self._ledger_file(queue_path, name).exists() or self._attempts(queue_path, name) >= self.max_attempts
+
+    def _lease_body(self, expires):
+        return json.dumps({
+            'worker': self.worker_id,
+            'expires': expires,
+        })
+
+    def _read_lease(self, lease_file):
+        try:
+            with open(lease_file, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _is_expired(self, lease_file):
+        lease = self._read_lease(lease_file)
+        # 읽을 수 없는 lease는 아직 살아 있는 것으로 본다 (방금 지워졌거나 쓰는 중)
+        return lease is not None and lease.get('expires', 0) < time.time()
+
+    def _write_atomic(self, path, body):
+        """임시 파일 기록 + fsync 후 rename (같은 디렉토리 내 rename은 원자적)"""
+        tmp_path = path.with_name(f".{path.name}.{self.worker_id}.tmp")
+        with open(tmp_path, 'w') as f:
+            f.write(body)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _create_lease(self, lease_file):
+        """내용을 다 쓴 임시 파일을 link로 게시. 이미 있으면 실패 (O_EXCL과 같고 빈 파일이 보이지 않음)"""
+        tmp_path = lease_file.with_name(f".{lease_file.name}.{self.worker_id}.tmp")
+        with open(tmp_path, 'w') as f:
+            f.write(self._lease_body(time.time() + self.lease_seconds))
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.link(tmp_path, lease_file)
+            return True
+        except FileExistsError:
+            return False
+        finally:
+            tmp_path.unlink()
+
+    def _claim(self, queue_path, name):
+        """참가자 lease 점유. 성공 시 lease 세대(token) 반환"""
+        if self._is_done(queue_path, name):
+            return None
+
+        self._lease_dir(queue_path, name).mkdir(parents=True, exist_ok=True)
+        generations = self._generations(queue_path, name)
+        if not generations:
+            token = 0
+        else:
+            current = generations[-1]
+            if not self._is_expired(self._lease_file(queue_path, name, current)):
+                return None
+            token = current + 1
+
+        if not self._create_lease(self._lease_file(queue_path, name, token)):
+            return None
+
+        if token > 0:
+            # 만료를 확인한 뒤 새 세대를 만들기 전에 이전 소유자가 갱신했다면 물러난다
+            previous = self._lease_file(queue_path, name, token - 1)
+            if not self._is_expired(previous) and previous.exists():
+                self._lease_file(queue_path, name, token).unlink(missing_ok=True)
+                return None
+            lease = self._read_lease(previous) or {}
+            if lease.get('expires', 0) > 0:
+                print(f"  만료된 lease 인수: {name} (이전 worker: {lease.get('worker')})")
+
+        # ledger 확인과 lease 생성 사이에 다른 worker가 완료했을 수 있다
+        if self._is_done(queue_path, name):
+            self._release(queue_path, name, token)
+            return None
+        return token
+
+    def _holds(self, queue_path, name, token):
+        """token 세대가 여전히 가장 높은 세대인지 확인"""
+        generations = self._generations(queue_path, name)
+        return bool(generations) and generations[-1] == token
+
+    def _renew(self, queue_path, name, token):
+        """자기 세대 파일만 rename으로 갱신한 뒤 더 높은 세대가 없는지 확인"""
+        lease_file = self._lease_file(queue_path, name, token)
+        if not lease_file.exists():
+            return False
+        self._write_atomic(lease_file, self._lease_body(time.time() + self.lease_seconds))
+        return self._holds(queue_path, name, token)
+
+    def _heartbeat(self, queue_path, name, token, stop_event, lost_event):
+        while not stop_event.wait(self.renew_interval):
+            if not self._renew(queue_path, name, token):
+                print(f"  경고: lease를 잃었습니다: {name} (결과를 기록하지 않습니다)")
+                lost_event.set()
+                return
+
+    def _release(self, queue_path, name, token):
+        """자기 세대를 만료 처리. 파일은 남겨 다음 세대 번호의 기준으로 쓴다"""
+        lease_file = self._lease_file(queue_path, name, token)
+        if lease_file.exists():
+            self._write_atomic(lease_file, self._lease_body(0))
+
+    def _record(self, queue_path, name, started, success, error=None):
+        """성공은 ledger에, 실패는 시도 횟수와 함께 failed에 기록"""
+        record = {
+            'participant': name,
+            'worker': self.worker_id,
+            'started': started,
+            'finished': time.time(),
+            'success': success,
+        }
+        if success:
+            self._write_atomic(self._ledger_file(queue_path, name), json.dumps(record))
+            self._failed_file(queue_path, name).unlink(missing_ok=True)
+            return
+
+        record['attempts'] = self._attempts(queue_path, name) + 1
+        record['error'] = error
+        self._write_atomic(self._failed_file(queue_path, name), json.dumps(record))
+
+    def _participants(self, input_path, queue_path):
+        return [
+            entry.name for entry in sorted(input_path.iterdir())
+            if entry.is_dir() and entry.resolve() != queue_path.resolve()
+        ]
+
+    ##
+    # Public
+
+    def process(self, queue_path, name, input_path, output_path, convert):
+        """lease를 갱신하면서 참가자 하나를 변환하고 ledger에 기록"""
+        token = self._claim(queue_path, name)
+        if token is None:
+            return False
+
+        print(f"\n[{self.worker_id}] {name} 처리 시작")
+        stop_event = threading.Event()
+        lost_event = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat, args=(queue_path, name, token, stop_event, lost_event), daemon=True
+        )
+        heartbeat.start()
+
+        started = time.time()
+        success = False
+        error = None
+        try:
+            # convert는 성공 여부를 반환한다 (False면 실패로 기록해 다시 시도)
+            success = bool(convert(str(input_path / name), str(output_path / name)))
+            if not success:
+                error = "convert가 False를 반환"
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            print(f"변환 실패: {name}: {e}")
+        finally:
+            stop_event.set()
+            heartbeat.join()
+
+        # fencing: 기록 직전에 갱신해 lease가 아직 자기 것인지 확인
+        if lost_event.is_set() or not self._renew(queue_path, name, token):
+            print(f"[{self.worker_id}] {name}: lease를 잃어 결과를 기록하지 않습니다 (다른 worker가 다시 처리)")
+            return True
+
+        self._record(queue_path, name, started, success, error)
+        self._release(queue_path, name, token)
+        print(f"[{self.worker_id}] {name} 처리 {'완료' if success else '실패'}")
+        return True
+
+    def run(self, queue_dir, input_dir, output_dir, convert):
+        """모든 참가자가 성공하거나 max_attempts회 실패할 때까지 점유 가능한 작업을 처리"""
+        queue_path = Path(queue_dir)
+        input_path = Path(input_dir)
+        output_path = Path(output_dir)
+
+        (queue_path / self.lease_dir_name).mkdir(parents=True, exist_ok=True)
+        (queue_path / self.ledger_dir_name).mkdir(parents=True, exist_ok=True)
+        (queue_path / self.failed_dir_name).mkdir(parents=True, exist_ok=True)
+
+        processed = 0
+        while True:
+            pending = [
+                name for name in self._participants(input_path, queue_path)
+                if not self._is_done(queue_path, name)
+            ]
+            if not pending:
+                break
+
+            # worker끼리 같은 순서로 경쟁하지 않도록 섞는다
+            random.shuffle(pending)
+
+            claimed = False
+            for name in pending:
+                if self.process(queue_path, name, input_path, output_path, convert):
+                    processed += 1
+                    claimed = True
+
+            if not claimed:
+                # 나머지는 다른 worker가 처리 중. lease 만료 여부를 다시 확인
+                time.sleep(self.poll_interval)
+
+        failed = [
+            name for name in self._participants(input_path, queue_path)
+            if not self._ledger_file(queue_path, name).exists()
+        ]
+        print(f"\n[{self.worker_id}] 처리한 참가자: {processed}개")
+        if failed:
+            print(f"  {self.max_attempts}회 시도 후에도 실패한 참가자: {', '.join(failed)}")
+        return processed
@@ -1,67 +1,593 @@
-from ASDconverter.device.realsense import Realsense
-from ASDconverter.device.tobii import Tobii
-from ASDconverter.device.played import Played
-from ASDconverter.device.user import User
-from ASDconverter.filter.filter import Filter
-from ASDconverter.matcher.matcher import Matcher
+import shutil
+import importlib
+from pathlib import Path
+
+from ASDconverter.selection.selection import Selection
+from ASDconverter.timestamp.timestamp import Timestamp
+
+# 단계별 구현 모듈. 필요한 단계가 처음 사용될 때만 import 한다
+# (pyrealsense2, multiprocessing, pytz 등을 filter/match 재실행 시 불러오지 않기 위함)
+STAGES = {
+    'realsense': ('ASDconverter.device.realsense', 'Realsense'),
+    'tobii': ('ASDconverter.device.tobii', 'Tobii'),
+    'user': ('ASDconverter.device.user', 'User'),
+    'played': ('ASDconverter.device.played', 'Played'),
+    'gaze': ('ASDconverter.gaze.gaze', 'Gaze'),
+    'audit': ('ASDconverter.audit.audit', 'Audit'),
+    'filter': ('ASDconverter.filter.filter', 'Filter'),
+    'matcher': ('ASDconverter.matcher.matcher', 'Matcher'),
+    'packer': ('ASDconverter.pack.pack', 'Packer'),
+}
 
 class Converter:
     def __init__(self):
-        self.realsense = Realsense()
-        self.tobii = Tobii()
-        self.user = User()
-        self.played = Played()
+        # played.csv 유효 구간을 먼저 만들어 RealSense 추출 범위로 사용
+        self.range_pushdown = False
+
+        # Tobii 병합 후 양안 융합/결측 보간 단계 실행
+        self.gaze_preprocess = False
+
+        # RealSense/Tobii → Filter → Matcher를 크기 제한 큐로 연결해 동시에 실행
+        self.streaming = False
+        self.stream_queue_size = 1024
+
+        # 매칭 후 프레임 파일 참조 무결성 검사
+        self.run_audit = False
+
+        # 마지막에 출력 전체를 pack 파일로 묶음
+        self.run_pack = False
+
+        # 지정한 video_id / 시간 구간만 다시 처리해 기존 출력에 교체해 넣음
+        self.selection = Selection()
+        self.selection_file_name = "selection.json"
+
+        # 모든 단계가 공유하는 타임스탬프 기록 형식 ("ms" 소수 / "us" int64 정수)
+        self.timestamp = Timestamp()
+
+    def __getattr__(self, name):
+        if name not in STAGES:
+            raise AttributeError(name)
+        module_name, class_name = STAGES[name]
+        stage = getattr(importlib.import_module(module_name), class_name)()
+        if hasattr(stage, 'timestamp'):
+            stage.timestamp = self.timestamp
+        setattr(self, name, stage)
+        return stage
+
+    def _push_down_ranges(self, input_dir, output_dir):
+        played_csv = Path(output_dir) / self.filter.played_csv_path
+        if not played_csv.exists():
+            self.played.convert(input_dir, output_dir)
+        if played_csv.exists():
+            self.realsense.valid_ranges = self.filter._extract_valid_ranges(played_csv)
+
+    def _select(self, stage, output_dir):
+        """선택 재처리 시 played.csv 기준 windows를 정해 단계에 전달"""
+        if self.selection.is_active():
+            # played 단계에서 기록한 windows(수정 전 구간 포함)가 있으면 그대로 사용
+            if not self.selection.windows and not self.selection.load(Path(output_dir) / self.selection_file_name):
+                self.selection.resolve(Path(output_dir) / self.filter.played_csv_path)
+            stage.selection = self.selection
+
+    def run_stage(self, stage, input_dir, output_dir):
+        """단일 단계 실행"""
+        if stage in ('realsense', 'filter', 'match'):
+            self._select(self.matcher if stage == 'match' else getattr(self, stage), output_dir)
+        elif stage == 'played' and self.selection.is_active():
+            return self._convert_played_selected(input_dir, output_dir)
+
+        if stage == 'realsense':
+            if self.range_pushdown:
+                self._push_down_ranges(input_dir, output_dir)
+            return self.realsense.convert(input_dir, output_dir)
+        if stage in ('tobii', 'user', 'played'):
+            return getattr(self, stage).convert(input_dir, output_dir)
+        if stage == 'gaze':
+            return self.gaze.process(output_dir)
+        if stage == 'filter':
+            return self.filter.filter_frames(output_dir)
+        if stage == 'match':
+            return self.matcher.match_frames(output_dir)
+        if stage == 'audit':
+            return self.audit.audit(output_dir)
+        if stage == 'pack':
+            return self.packer.pack(output_dir)
+        raise ValueError(f"알 수 없는 단계: {stage}")
+
+    def _convert_played_selected(self, input_dir, output_dir):
+        """선택된 play-stop 쌍만 교체. windows는 수정 전/후 쌍을 모두 포함"""
+        played_csv = Path(output_dir) / self.filter.played_csv_path
+        previous_csv = played_csv.with_name(f".{played_csv.name}.previous")
+        if played_csv.exists():
+            shutil.copyfile(played_csv, previous_csv)
+
+        try:
+            self.played.selection = self.selection
+            success = self.played.convert(input_dir, output_dir)
+            self.selection.resolve(previous_csv, played_csv)
+            self.selection.save(played_csv.parent / self.selection_file_name)
+        finally:
+            previous_csv.unlink(missing_ok=True)
+        return success
+
+    def _convert_selected(self, input_dir, output_dir):
+        """선택된 video_id / 시간 구간만 다시 변환해 기존 출력에 교체
+
+        Tobii/User 단계는 play 로그와 무관하므로 다시 실행하지 않는다.
+        """
+        print("=== ASD Converter 시작 (선택 재처리) ===")
+        print(f"입력 디렉토리: {input_dir}")
+        print(f"출력 디렉토리: {output_dir}")
+        if self.streaming:
+            print("경고: 선택 재처리에서는 스트리밍 모드를 사용하지 않습니다.")
+
+        # 필수 단계(Played, RealSense, 필터링, 매칭) 중 하나라도 실패하면 False
+        print("\n[1/4] Played 선택 구간 교체...")
+        success = self._convert_played_selected(input_dir, output_dir)
+        if not self.selection.windows:
+            print("선택된 재처리 구간이 없습니다.")
+            return False
+        for start, end in self.selection.windows:
+            print(f"  window: {start:.3f} ~ {end:.3f}")
+        print("[1/4] Played 선택 구간 교체 완료")
+
+        print("\n[2/4] Realsense 선택 구간 디코딩...")
+        if self.range_pushdown:
+            self._push_down_ranges(input_dir, output_dir)
+        self.realsense.selection = self.selection
+        success = self.realsense.convert(input_dir, output_dir) and success
+        print("[2/4] Realsense 선택 구간 디코딩 완료")
+
+        print("\n[3/4] 선택 구간 필터링...")
+        self.filter.selection = self.selection
+        success = self.filter.filter_frames(output_dir) and success
+        print("[3/4] 선택 구간 필터링 완료")
+
+        print("\n[4/4] 선택 구간 매칭...")
+        self.matcher.selection = self.selection
+        success = self.matcher.match_frames(output_dir) and success
+        print("[4/4] 선택 구간 매칭 완료")
+
+        if self.run_audit:
+            print("\n[4/4] 출력 무결성 검사 시작...")
+            success = self.audit.passed(self.audit.audit(output_dir)) and success
+            print("[4/4] 출력 무결성 검사 완료")
+
+        if self.run_pack:
+            print("\n[4/4] 출력 pack 생성 시작...")
+            self.packer.pack(output_dir)
+            print("[4/4] 출력 pack 생성 완료")
+
+        print("\n=== ASD Converter 완료 ===")
+        print(f"결과가 {output_dir}에 저장되었습니다.")
+        if not success:
+            print("경고: 일부 단계가 실패했습니다.")
+        return bool(success)
+
+    def _convert_streaming(self, input_dir, output_dir):
+        """디코딩과 필터링/매칭을 겹쳐 실행하는 파이프라인 모드"""
+        import queue
+        import threading
+
+        output_path = Path(output_dir)
+
+        print("=== ASD Converter 시작 (스트리밍) ===")
+        print(f"입력 디렉토리: {input_dir}")
+        print(f"출력 디렉토리: {output_dir}")
+
+        if self.gaze_preprocess:
+            print("경고: 스트리밍 모드에서는 Tobii 시선 전처리 단계를 건너뜁니다.")
+        if self.matcher.match_mode != "nearest":
+            print(f"경고: 스트리밍 모드는 nearest 매칭만 지원합니다. {self.matcher.match_mode} 대신 nearest로 매칭합니다.")
+
+        print("\n[1/2] User / Played 데이터 변환 시작...")
+        self.user.convert(input_dir, output_dir)
+        self.played.convert(input_dir, output_dir)
+
+        played_csv = output_path / self.filter.played_csv_path
+        if not played_csv.exists():
+            print(f"Played CSV 파일을 찾을 수 없습니다: {played_csv}")
+            return False
+
+        filter_ranges = self.filter._extract_valid_ranges(played_csv)
+        match_ranges = self.matcher._extract_valid_ranges(played_csv)
+        if self.range_pushdown:
+            self.realsense.valid_ranges = filter_ranges
+        print("[1/2] User / Played 데이터 변환 완료")
+
+        realsense_queue = queue.Queue(maxsize=self.stream_queue_size)
+        tobii_queue = queue.Queue(maxsize=self.stream_queue_size)
+        # 매칭은 스트림별 큐에서 읽어 Tobii가 RealSense보다 너무 앞서면 Tobii 쪽을 멈춘다
+        match_queues = {
+            'realsense': queue.Queue(maxsize=self.stream_queue_size),
+            'tobii': queue.Queue(maxsize=self.stream_queue_size),
+        }
+
+        # 단계별 결과와 스레드에서 발생한 예외 (join 후 예외는 다시 발생시킨다)
+        results = {}
+        errors = []
+
+        def produce(name, stage, target):
+            try:
+                results[name] = stage.stream(input_dir, output_dir, target.put)
+            except Exception as error:
+                errors.append(error)
+            finally:
+                target.put(None)
+
+        def consume(name, source, output_file):
+            try:
+                self.filter.filter_stream(source, match_queues[name].put, filter_ranges, output_file)
+            except Exception as error:
+                errors.append(error)
+                # 생산자가 가득 찬 큐에서 멈추지 않도록 끝까지 비움
+                while source.get() is not None:
+                    pass
+            finally:
+                match_queues[name].put(None)
 
-        self.filter = Filter()
-        self.matcher = Matcher()
+        threads = [
+            threading.Thread(target=produce, args=('realsense', self.realsense, realsense_queue), daemon=True),
+            threading.Thread(target=produce, args=('tobii', self.tobii, tobii_queue), daemon=True),
+            threading.Thread(target=consume, args=('realsense', realsense_queue, output_path / self.filter.filtered_realsense_filename), daemon=True),
+            threading.Thread(target=consume, args=('tobii', tobii_queue, output_path / self.filter.filtered_tobii_filename), daemon=True),
+        ]
+
+        print("\n[2/2] RealSense / Tobii 디코딩 + 필터링 + 매칭 (동시 실행)...")
+        for thread in threads:
+            thread.start()
+
+        # 필수 단계(RealSense, Tobii, 매칭) 중 하나라도 실패하면 False
+        success = self.matcher.match_stream(match_queues['realsense'], match_queues['tobii'], output_dir, match_ranges)
+
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+        success = results['realsense'] and results['tobii'] and success
+        print("[2/2] RealSense / Tobii 디코딩 + 필터링 + 매칭 완료")
+
+        if self.run_audit:
+            print("\n[2/2] 출력 무결성 검사 시작...")
+            success = self.audit.passed(self.audit.audit(output_dir)) and success
+            print("[2/2] 출력 무결성 검사 완료")
+
+        if self.run_pack:
+            print("\n[2/2] 출력 pack 생성 시작...")
+            self.packer.pack(output_dir)
+            print("[2/2] 출력 pack 생성 완료")
+
+        print("\n=== ASD Converter 완료 ===")
+        print(f"결과가 {output_dir}에 저장되었습니다.")
+        if not success:
+            print("경고: 일부 단계가 실패했습니다.")
+        return bool(success)
 
     def convert(self, input_dir, output_dir):
+        if self.selection.is_active():
+            return self._convert_selected(input_dir, output_dir)
+        if self.streaming:
+            return self._convert_streaming(input_dir, output_dir)
+
         print("=== ASD Converter 시작 ===")
         print(f"입력 디렉토리: {input_dir}")
         print(f"출력 디렉토리: {output_dir}")
         
+        if self.range_pushdown:
+            print("\n[0/6] 유효 재생 구간 추출 (RealSense 추출 범위)...")
+            self.played.convert(input_dir, output_dir)
+            self._push_down_ranges(input_dir, output_dir)
+            print("[0/6] 유효 재생 구간 추출 완료")
+
+        # 필수 단계(RealSense, Tobii, 필터링, 매칭) 중 하나라도 실패하면 False
         print("\n[1/6] Realsense 데이터 변환 시작...")
-        self.realsense.convert(input_dir, output_dir)
+        success = self.realsense.convert(input_dir, output_dir)
         print("[1/6] Realsense 데이터 변환 완료")
         
         print("\n[2/6] Tobii 데이터 변환 시작...")
-        self.tobii.convert(input_dir, output_dir)
+        success = self.tobii.convert(input_dir, output_dir) and success
         print("[2/6] Tobii 데이터 변환 완료")
+
+        if self.gaze_preprocess:
+            print("\n[2/6] Tobii 시선 전처리 시작...")
+            self.gaze.process(output_dir)
+            print("[2/6] Tobii 시선 전처리 완료")
         
         print("\n[3/6] User 데이터 변환 시작...")
         self.user.convert(input_dir, output_dir)
         print("[3/6] User 데이터 변환 완료")
         
         print("\n[4/6] Played 데이터 변환 시작...")
-        self.played.convert(input_dir, output_dir)
+        if not self.range_pushdown:
+            self.played.convert(input_dir, output_dir)
         print("[4/6] Played 데이터 변환 완료")
 
         print("\n[5/6] 프레임 필터링 시작...")
-        self.filter.filter_frames(output_dir)
+        success = self.filter.filter_frames(output_dir) and success
         print("[5/6] 프레임 필터링 완료")
 
         print("\n[6/6] 프레임 매칭 시작...")
-        self.matcher.match_frames(output_dir)
+        success = self.matcher.match_frames(output_dir) and success
         print("[6/6] 프레임 매칭 완료")
+
+        if self.run_audit:
+            print("\n[6/6] 출력 무결성 검사 시작...")
+            success = self.audit.passed(self.audit.audit(output_dir)) and success
+            print("[6/6] 출력 무결성 검사 완료")
+
+        if self.run_pack:
+            print("\n[6/6] 출력 pack 생성 시작...")
+            self.packer.pack(output_dir)
+            print("[6/6] 출력 pack 생성 완료")
         
         print("\n=== ASD Converter 완료 ===")
         print(f"결과가 {output_dir}에 저장되었습니다.")
+        if not success:
+            print("경고: 일부 단계가 실패했습니다.")
+        return bool(success)
 
 
-def argparser():
+def argparser(argv=None):
     import argparse
 
     parser = argparse.ArgumentParser()
-    parser.add_argument("--input_path")
-    parser.add_argument("--output_path")
+    subparsers = parser.add_subparsers(dest="stage", required=True)
+
+    def add_stage(name, help, input_path=True):
+        stage_parser = subparsers.add_parser(name, help=help)
+        if input_path:
+            stage_parser.add_argument("--input_path", required=True)
+        stage_parser.add_argument("--output_path")
+        return stage_parser
+
+    def add_realsense_options(stage_parser):
+        stage_parser.add_argument("--shards", type=int, default=1, help="bag 하나를 나누어 디코딩할 시간 구간 수")
+        stage_parser.add_argument("--range_pushdown", action="store_true", help="유효 재생 구간 밖 RealSense 프레임 추출 생략")
+        stage_parser.add_argument("--align_depth", action="store_true", help="깊이를 컬러 좌표계로 정렬해 함께 저장")
+        stage_parser.add_argument("--drop_raw_depth", action="store_true", help="정렬 시 원본 깊이는 저장하지 않음")
+        stage_parser.add_argument("--crop", type=int, nargs=4, default=None, metavar=("X", "Y", "WIDTH", "HEIGHT"), help="컬러 좌표 기준 ROI")
+        stage_parser.add_argument("--session_crops", default=None, help="세션 폴더 이름 -> [x, y, width, height] JSON 파일")
+        stage_parser.add_argument("--color_decimation", type=int, default=1, help="컬러 정수배 축소")
+        stage_parser.add_argument("--depth_decimation", type=int, default=1, help="깊이 정수배 축소")
+        stage_parser.add_argument("--frame_layout", choices=["flat", "bucket"], default="flat", help="프레임 파일 배치 (bucket: 세션/시간 하위 디렉토리)")
+        stage_parser.add_argument("--bucket_ms", type=float, default=60000.0, help="bucket 배치의 시간 단위 (ms)")
+        stage_parser.add_argument("--checkpoint_frames", type=int, default=300, help="디코딩 checkpoint 주기 (프레임, 0이면 사용 안 함)")
+        stage_parser.add_argument("--rs_convert", default=None, help="rs-convert 실행 파일 경로 (기본: RS_CONVERT_EXE 환경 변수)")
+        stage_parser.add_argument("--inline_frames", action="store_true", help="rs-convert 없이 디코딩 중 프레임 파일 직접 기록")
+
+    def add_timestamp_options(stage_parser):
+        stage_parser.add_argument("--timestamp_unit", choices=["ms", "us"], default="ms", help="타임스탬프 기록 형식 (us: int64 마이크로초, 파일 이름 포함)")
+        return stage_parser
+
+    def add_synthetic_options(stage_parser):
+        stage_parser.add_argument("--width", type=int, default=640)
+        stage_parser.add_argument("--height", type=int, default=480)
+        stage_parser.add_argument("--fps", type=int, default=30)
+        stage_parser.add_argument("--duration", type=float, default=10.0, help="세션 길이 (초)")
+        stage_parser.add_argument("--sessions", type=int, default=1, help="세션 수")
+        stage_parser.add_argument("--segments", type=int, default=1, help="세션당 bag 수 (분할 녹화)")
+        stage_parser.add_argument("--drop_rate", type=float, default=0.0, help="기록하지 않을 프레임 비율")
+        stage_parser.add_argument("--drop_frames", type=int, nargs="+", default=[], help="기록하지 않을 프레임 번호 (세션 기준)")
+        stage_parser.add_argument("--tobii_hz", type=int, default=120)
+        stage_parser.add_argument("--play_videos", type=int, default=3, help="세션마다 재생할 video 수")
+        stage_parser.add_argument("--seed", type=int, default=0)
+        return stage_parser
+
+    def add_selection_options(stage_parser):
+        stage_parser.add_argument("--videos", nargs="+", default=None, help="다시 처리할 video_id 목록")
+        stage_parser.add_argument("--time_range", type=float, nargs=2, default=None, metavar=("START_MS", "END_MS"), help="다시 처리할 구간 (epoch ms)")
+        return stage_parser
+
+    all_parser = add_stage("all", "전체 변환")
+    add_realsense_options(all_parser)
+    add_selection_options(all_parser)
+    add_timestamp_options(all_parser)
+    all_parser.add_argument("--gaze", action="store_true", help="Tobii 양안 융합/결측 보간 단계 실행")
+    all_parser.add_argument("--match_mode", choices=["nearest", "interpolate"], default="nearest", help="매칭 방식")
+    all_parser.add_argument("--match_workers", type=int, default=1, help="시간축 빈 구간별 병렬 매칭 프로세스 수")
+    all_parser.add_argument("--match_output", choices=["csv", "index"], default="csv", help="매칭 결과 형식 (index: frames.npy)")
+    all_parser.add_argument("--streaming", action="store_true", help="디코딩, 필터링, 매칭을 큐로 연결해 동시에 실행")
+    all_parser.add_argument("--audit", action="store_true", help="매칭 후 프레임 파일 참조 무결성 검사")
+    all_parser.add_argument("--check_empty", action="store_true", help="--audit에서 0바이트 프레임 파일도 검사 (파일마다 stat 1회 추가)")
+    all_parser.add_argument("--pack", action="store_true", help="변환 후 출력 전체를 pack 파일로 묶음")
+    all_parser.add_argument("--remove_source", action="store_true", help="pack 후 원본 파일 삭제")
+    all_parser.add_argument("--max_gap_ms", type=float, default=None, help="보간할 최대 결측 구간 (ms)")
+    all_parser.add_argument("--queue_dir", default=None, help="공유 queue 디렉토리. 지정 시 input/output_path 하위 참가자들을 여러 노드가 나누어 처리")
+
+    realsense_parser = add_stage("realsense", "RealSense bag 변환")
+    add_realsense_options(realsense_parser)
+    add_selection_options(realsense_parser)
+    add_timestamp_options(realsense_parser)
+    add_timestamp_options(add_stage("tobii", "Tobii CSV 병합"))
+    add_stage("user", "user.txt 복사")
+    add_timestamp_options(add_selection_options(add_stage("played", "Play 이벤트 변환")))
+    gaze_parser = add_stage("gaze", "Tobii 양안 융합/결측 보간", input_path=False)
+    gaze_parser.add_argument("--max_gap_ms", type=float, default=None, help="보간할 최대 결측 구간 (ms)")
+    add_selection_options(add_stage("filter", "유효 재생 구간 필터링", input_path=False))
 
-    return parser.parse_args()
+    audit_parser = add_stage("audit", "매칭 결과의 프레임 파일 참조 검사", input_path=False)
+    audit_parser.add_argument("--spot_check", type=int, default=0, help="해상도/크기를 확인할 표본 파일 수")
+    audit_parser.add_argument("--check_empty", action="store_true", help="0바이트 프레임 파일 검사 (파일마다 stat 1회 추가)")
+    audit_parser.add_argument("--color_shape", type=int, nargs=2, default=None, metavar=("HEIGHT", "WIDTH"))
+    audit_parser.add_argument("--depth_shape", type=int, nargs=2, default=None, metavar=("HEIGHT", "WIDTH"))
+
+    pack_parser = add_stage("pack", "출력 전체를 seek 가능한 pack 파일로 묶음", input_path=False)
+    pack_parser.add_argument("--remove_source", action="store_true", help="pack 후 원본 파일 삭제")
+    pack_parser.add_argument("--max_pack_gb", type=float, default=4.0, help="pack 파일 하나의 최대 크기 (GiB)")
+
+    synthetic_parser = subparsers.add_parser("synthetic", help="합성 bag/Tobii/play 입력 생성")
+    synthetic_parser.add_argument("--output_path", required=True, help="입력 구조(session_*_realsense 등)를 만들 디렉토리")
+    add_synthetic_options(synthetic_parser)
+
+    benchmark_parser = add_stage("benchmark", "전체 변환 실행 후 단계별 처리량 측정")
+    add_realsense_options(benchmark_parser)
+    add_timestamp_options(benchmark_parser)
+    add_synthetic_options(benchmark_parser)
+    benchmark_parser.add_argument("--generate", action="store_true", help="input_path에 합성 입력을 먼저 생성")
+    benchmark_parser.add_argument("--gaze", action="store_true", help="Tobii 양안 융합/결측 보간 단계 포함")
+    benchmark_parser.add_argument("--streaming", action="store_true", help="스트리밍 모드로 측정")
+    benchmark_parser.add_argument("--match_workers", type=int, default=1, help="시간축 빈 구간별 병렬 매칭 프로세스 수")
+    benchmark_parser.add_argument("--cleanup", action="store_true", help="측정 후 변환 출력 삭제")
+
+    replay_parser = subparsers.add_parser("replay", help="CSV/bag을 도착 순서대로 재생하며 실시간 매칭")
+    # RealSense 입력은 CSV와 bag 중 정확히 하나 (없으면 argparse가 안내 후 종료)
+    replay_source = replay_parser.add_mutually_exclusive_group(required=True)
+    replay_source.add_argument("--realsense", default=None, help="RealSense frames/filtered CSV")
+    replay_source.add_argument("--bag", default=None, help="RealSense bag (CSV 대신)")
+    replay_parser.add_argument("--tobii", required=True, help="Tobii frames/filtered CSV")
+    replay_parser.add_argument("--played", default=None, help="played.csv (video_id 구간)")
+    replay_parser.add_argument("--out", default=None, help="매칭 결과 CSV")
+    replay_parser.add_argument("--speed", type=float, default=0.0, help="재생 속도 (1.0 = 실시간, 0 = 최대 속도)")
+    replay_parser.add_argument("--report_ms", type=float, default=5000.0, help="통계 출력 주기 (스트림 시각 ms)")
+    replay_parser.add_argument("--max_diff", type=float, default=None, help="Max time diff in ms (override).")
+    add_timestamp_options(replay_parser)
+
+    match_parser = add_stage("match", "RealSense-Tobii 프레임 매칭", input_path=False)
+    match_parser.add_argument("--realsense", default=None, help="Realsense filtered CSV path (지정 시 valid range 없이 매칭)")
+    match_parser.add_argument("--tobii", default=None, help="Tobii filtered CSV path")
+    match_parser.add_argument("--out", default=None, help="Output CSV file path (or directory). Default: frames.csv")
+    match_parser.add_argument("--max-diff", type=float, default=None, help="Max time diff in ms (override).")
+    match_parser.add_argument("--match_mode", choices=["nearest", "interpolate"], default="nearest", help="매칭 방식")
+    match_parser.add_argument("--match_workers", type=int, default=1, help="시간축 빈 구간별 병렬 매칭 프로세스 수")
+    match_parser.add_argument("--match_output", choices=["csv", "index"], default="csv", help="매칭 결과 형식 (index: frames.npy)")
+    add_selection_options(match_parser)
+    add_timestamp_options(match_parser)
+
+    # 하위 명령 없이 옵션만 준 경우 기존처럼 전체 변환
+    if argv and argv[0].startswith("-") and argv[0] not in ("-h", "--help"):
+        argv = ["all", *argv]
+
+    args = parser.parse_args(argv)
+
+    # match: CSV 두 개를 직접 지정하거나, 출력 디렉토리의 filtered CSV를 사용
+    if args.stage == "match":
+        if args.realsense and not args.tobii:
+            match_parser.error("--realsense를 지정하면 --tobii도 지정해야 합니다.")
+        if args.tobii and not args.realsense:
+            match_parser.error("--tobii를 지정하면 --realsense도 지정해야 합니다.")
+        if not args.realsense and not args.output_path:
+            match_parser.error("--realsense/--tobii를 지정하지 않으면 --output_path가 필요합니다.")
+
+    return args
     
-def main():
-    args = argparser()
+def main(argv=None):
+    import sys
+
+    args = argparser(sys.argv[1:] if argv is None else argv)
     
     converter = Converter()
-    converter.convert(args.input_path, args.output_path)
+
+    if getattr(args, "videos", None) is not None:
+        converter.selection.video_ids = args.videos
+    if getattr(args, "time_range", None) is not None:
+        converter.selection.time_range = tuple(args.time_range)
+
+    if getattr(args, "timestamp_unit", None) is not None:
+        converter.timestamp.unit = args.timestamp_unit
+
+    if args.stage in ("all", "realsense", "benchmark"):
+        converter.realsense.shard_count = args.shards
+        converter.range_pushdown = args.range_pushdown
+        converter.realsense.align_depth = args.align_depth
+        converter.realsense.keep_raw_depth = not (args.align_depth and args.drop_raw_depth)
+        converter.realsense.crop_box = tuple(args.crop) if args.crop else None
+        converter.realsense.color_decimation = args.color_decimation
+        converter.realsense.depth_decimation = args.depth_decimation
+        converter.realsense.frame_layout = args.frame_layout
+        converter.realsense.bucket_ms = args.bucket_ms
+        converter.realsense.checkpoint_frames = args.checkpoint_frames
+        converter.realsense.inline_frames = args.inline_frames
+        if args.rs_convert:
+            converter.realsense.rs_convert_exe = args.rs_convert
+        if args.session_crops:
+            import json
+            with open(args.session_crops, 'r') as f:
+                converter.realsense.session_crop_boxes = {name: tuple(box) for name, box in json.load(f).items()}
+
+    if args.stage in ("all", "benchmark"):
+        converter.gaze_preprocess = args.gaze
+        converter.streaming = args.streaming
+    if args.stage == "all":
+        converter.run_audit = args.audit
+        if args.check_empty:
+            converter.audit.check_empty = True
+        converter.run_pack = args.pack
+
+    if args.stage == "pack" or (args.stage == "all" and args.pack):
+        converter.packer.remove_source = args.remove_source
+    if args.stage == "pack":
+        converter.packer.max_pack_bytes = int(args.max_pack_gb * 1024 ** 3)
+
+    if args.stage == "audit":
+        converter.audit.spot_check = args.spot_check
+        converter.audit.check_empty = args.check_empty
+        converter.audit.color_shape = args.color_shape
+        converter.audit.depth_shape = args.depth_shape
+
+    if args.stage == "benchmark":
+        converter.matcher.workers = args.match_workers
+
+    if args.stage in ("all", "match"):
+        converter.matcher.match_mode = args.match_mode
+        converter.matcher.workers = args.match_workers
+        converter.matcher.output_format = args.match_output
+
+    if args.stage in ("all", "gaze") and args.max_gap_ms is not None:
+        converter.gaze.max_gap_ms = args.max_gap_ms
+
+    synthetic = None
+    if args.stage == "synthetic" or getattr(args, "generate", False):
+        from ASDconverter.synthetic.synthetic import Synthetic
+        synthetic = Synthetic()
+        synthetic.width = args.width
+        synthetic.height = args.height
+        synthetic.fps = args.fps
+        synthetic.duration = args.duration
+        synthetic.sessions = args.sessions
+        synthetic.segments = args.segments
+        synthetic.drop_rate = args.drop_rate
+        synthetic.dropped_frames = args.drop_frames
+        synthetic.tobii_hz = args.tobii_hz
+        synthetic.videos = args.play_videos
+        synthetic.seed = args.seed
+
+    if args.stage == "synthetic":
+        synthetic.generate(args.output_path)
+    elif args.stage == "benchmark":
+        from ASDconverter.benchmark.benchmark import Benchmark
+        benchmark = Benchmark()
+        benchmark.cleanup = args.cleanup
+        benchmark.run(converter, args.input_path, args.output_path, synthetic)
+    elif args.stage == "replay":
+        from ASDconverter.matcher.replay import Replay
+        replay = Replay()
+        replay.speed = args.speed
+        replay.report_interval = args.report_ms
+        replay.matcher.timestamp = converter.timestamp
+        if args.max_diff is not None:
+            replay.matcher.max_time_diff = args.max_diff
+        if args.bag:
+            replay.replay_bag(args.bag, args.tobii, args.played, args.out)
+        else:
+            replay.replay_csv(args.realsense, args.tobii, args.played, args.out)
+    elif args.stage == "match" and args.realsense:
+        converter.matcher.match_frames_simple(
+            realsense_csv=args.realsense,
+            tobii_csv=args.tobii,
+            output_csv=args.out,
+            max_time_diff=args.max_diff
+        )
+    elif args.stage == "match":
+        if args.max_diff is not None:
+            converter.matcher.max_time_diff = args.max_diff
+        converter.run_stage("match", None, args.output_path)
+    elif args.stage != "all":
+        converter.run_stage(args.stage, getattr(args, "input_path", None), args.output_path)
+    elif args.queue_dir:
+        from ASDconverter.cluster.cluster import JobQueue
+        JobQueue().run(args.queue_dir, args.input_path, args.output_path, converter.convert)
+    else:
+        converter.convert(args.input_path, args.output_path)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
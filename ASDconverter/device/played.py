@@ -3,12 +3,20 @@ from pathlib import Path
 from datetime import datetime
 import pytz
 
+from ASDconverter.timestamp.timestamp import Timestamp
+
 
 class Played:
     def __init__(self):
         self.csv_dir_name = "."
         self.csv_filename = "played.csv"
 
+        # timestamp 컬럼 표기 (Timestamp.unit)
+        self.timestamp = Timestamp()
+
+        # 지정 시 선택된 play-stop 쌍만 기존 played.csv에 교체해 넣음
+        self.selection = None
+
     def _convert_timestamp(self, iso_timestamp):
         """ISO 8601 UTC 형식을 한국 시간 기준 밀리초 타임스탬프로 변환"""
         dt_utc = datetime.fromisoformat(iso_timestamp.replace('Z', '+00:00'))
@@ -65,7 +73,7 @@ class Played:
                     # 같은 video_id의 end event
                     if next_event['type'] == 'end' and next_event['video_id'] == video_id:
                         stop_time = self._convert_timestamp(next_event['time'])
-                        stop_time_str = f"{stop_time:.14f}"
+                        stop_time_str = self.timestamp.format(stop_time)
                         stop_type = 'end'
                         stop_index = j
                         break
@@ -73,7 +81,7 @@ class Played:
                     # 같은 video_id의 pause event
                     elif next_event['type'] == 'pause' and next_event['video_id'] == video_id:
                         pause_time = self._convert_timestamp(next_event['time'])
-                        stop_time_str = f"{pause_time:.14f}"
+                        stop_time_str = self.timestamp.format(pause_time)
                         stop_type = 'pause'
                         stop_index = j
                         break
@@ -81,7 +89,7 @@ class Played:
                 # pair가 없는 경우 기본값 처리
                 if stop_time_str is None:
                     stop_time = start_time + 30000
-                    stop_time_str = f"{stop_time:.14f}"
+                    stop_time_str = self.timestamp.format(stop_time)
                     stop_type = 'end'
                 
                 # valid 값 결정
@@ -98,7 +106,7 @@ class Played:
                 play_stop_pairs.extend([
                     {
                         'index': 0,
-                        'timestamp': f"{start_time:.14f}",
+                        'timestamp': self.timestamp.format(start_time),
                         'video_id': video_id,
                         'type': 'play',
                         'valid': valid
@@ -118,6 +126,29 @@ class Played:
         
         return play_stop_pairs
 
+    def _pairs(self, rows):
+        return [rows[i:i + 2] for i in range(0, len(rows) - 1, 2)]
+
+    def _is_selected(self, pair):
+        play, stop = pair
+        return self.selection.selects_pair(
+            play['video_id'], self.timestamp.parse(play['timestamp']), self.timestamp.parse(stop['timestamp'])
+        )
+
+    def _splice_pairs(self, converted_rows, output_csv_path):
+        """기존 played.csv에서 선택된 쌍만 새로 만든 쌍으로 교체"""
+        existing_rows = []
+        if output_csv_path.exists():
+            with open(output_csv_path, 'r', newline='') as f:
+                existing_rows = list(csv.DictReader(f))
+
+        kept = [pair for pair in self._pairs(existing_rows) if not self._is_selected(pair)]
+        selected = [pair for pair in self._pairs(converted_rows) if self._is_selected(pair)]
+        print(f"  선택된 play-stop 쌍: {len(selected)}개 (유지: {len(kept)}개)")
+
+        pairs = sorted(kept + selected, key=lambda pair: self.timestamp.parse(pair[0]['timestamp']))
+        return [row for pair in pairs for row in pair]
+
     def _convert_play_csv(self, input_csv_path, output_csv_path):
         # 원본 데이터 읽기
         with open(input_csv_path, 'r', newline='') as f:
@@ -126,6 +157,8 @@ class Played:
         
         # play-stop 쌍 생성
         converted_rows = self._create_play_stop_pairs(all_rows)
+        if self.selection is not None and self.selection.is_active():
+            converted_rows = self._splice_pairs(converted_rows, output_csv_path)
         
         # CSV 파일 생성
         if converted_rows:
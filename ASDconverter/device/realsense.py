@@ -1,12 +1,24 @@
+import os
 import csv
+import json
+import math
 import time
+import zlib
+import shutil
+import struct
+import hashlib
 import subprocess
 
 from pathlib import Path
+from datetime import timedelta
+import numpy as np
 import pyrealsense2 as rs
 import multiprocessing as mp
 from dotenv import load_dotenv
 
+from ASDconverter.device.session import find_session_dirs
+from ASDconverter.timestamp.timestamp import Timestamp
+
 load_dotenv()
 
 # #
@@ -30,107 +42,904 @@ def measure_time(func):
 
 class Realsense:
     def __init__(self):
-        self.rs_convert_exe = 'C:/Users/insighter/workspace/sdk/realsense/tools/rs-convert.exe'
+        # rs-convert 경로 (RS_CONVERT_EXE 환경 변수/.env로 변경)
+        self.rs_convert_exe = os.getenv('RS_CONVERT_EXE', 'C:/Users/insighter/workspace/sdk/realsense/tools/rs-convert.exe')
+
+        # rs-convert 없이 디코딩 중 직접 프레임 파일 기록 (crop/정렬 등 옵션이 있으면 항상 직접 기록)
+        self.inline_frames = False
         
         self.csv_dir_name = "realsense/csv"
         self.csv_filename = "frames.csv"
         
         self.color_dir_name = "realsense/color"
         self.color_prefix = "color"
-        self.color_file_pattern = "color_Color_{timestamp:.14f}.png"
+        self.color_file_pattern = "color_Color_{timestamp}.png"
 
         self.depth_dir_name = "realsense/depth"
         self.depth_prefix = "depth"
-        self.depth_file_pattern = "depth_Depth_{timestamp:.14f}.bin"
+        self.depth_file_pattern = "depth_Depth_{timestamp}.bin"
+
+        self.csv_fieldnames = [
+            'index', 
+            'frame_timestamp', 
+            'color_frame_index', 
+            'color_timestamp', 
+            'color_backend_timestamp', 
+            'color_hardware_timestamp', 
+            'color_arrival_time', 
+            'color_file_path', 
+            'depth_frame_index', 
+            'depth_timestamp', 
+            'depth_backend_timestamp', 
+            'depth_hardware_timestamp', 
+            'depth_arrival_time', 
+            'depth_file_path'
+        ]
+
+        # bag 하나를 시간 구간(shard)으로 나누어 병렬 디코딩
+        self.shard_count = 1
+        self.shard_margin = 1.0  # seek 여유 구간 (초)
+        self.shard_part_pattern = "frames.part{shard:03d}.csv"
+
+        # 세션 폴더에 bag이 여러 개(분할 녹화)면 첫 프레임 순서로 정렬해 병렬 디코딩 후 병합
+        # 겹친 구간은 다음 segment 프레임을 사용하고, segment_gap_ms보다 긴 빈 구간은 경고
+        self.segment_part_pattern = "frames.seg{segment:03d}.part{shard:03d}.csv"
+        self.segment_gap_ms = 100.0
+
+        # 유효 재생 구간 (Filter._extract_valid_ranges 형식)
+        # 지정 시 구간 밖 프레임은 CSV/이미지 모두 기록하지 않는다
+        self.valid_ranges = None
+
+        # 선택 재처리 (Selection). 지정 시 windows 구간만 seek로 디코딩해
+        # 기존 frames.csv에 교체해 넣는다
+        self.selection = None
+
+        # 디코딩 중 깊이를 컬러 좌표계로 정렬(rs.align)해 저장
+        self.align_depth = False
+        self.keep_raw_depth = True
+        self.aligned_depth_dir_name = "realsense/depth_aligned"
+        self.aligned_depth_file_pattern = "depth_Aligned_{timestamp}.bin"
+
+        # 세션별 카메라 파라미터/추출 옵션
+        self.meta_dir_name = "realsense/meta"
+
+        # 인코딩 전 ROI 잘라내기 (컬러 픽셀 좌표 (x, y, width, height))
+        self.crop_box = None
+        self.session_crop_boxes = {}    # 세션 폴더 이름 -> crop box (crop_box보다 우선)
+
+        # 인코딩 전 정수배 축소
+        self.color_decimation = 1
+        self.depth_decimation = 1
+
+        # 프레임 파일 배치
+        # "flat": color/depth 디렉토리에 모두 기록 (rs-convert와 같음)
+        # "bucket": {세션 폴더}/{타임스탬프 bucket}/ 하위에 기록, CSV에는 상대 경로 기록
+        self.frame_layout = "flat"
+        self.bucket_ms = 60000.0
+        self.bucket_pattern = "{session}/{bucket}"
+        self._created_dirs = set()
+
+        # 디코딩 checkpoint. checkpoint_frames 프레임마다 CSV를 fsync하고 마지막 프레임
+        # 타임스탬프와 CSV 크기를 기록한다. 재시작 시 그 지점까지 자르고 seek해서 이어감 (0이면 사용 안 함)
+        self.checkpoint_frames = 300
+        self.checkpoint_dir_name = "realsense/checkpoint"
+
+        # CSV/프레임 파일 이름의 타임스탬프 표기 (Timestamp.unit)
+        self.timestamp = Timestamp()
 
     ##
     # Private
     
+    def _time_range_args(self, time_range):
+        """rs-convert 재생 구간 옵션 (bag 시작 기준 초)"""
+        if time_range is None:
+            return []
+        start, end = time_range
+        args = ["-s", f"{start:.3f}"] if start > 0 else []
+        if end is not None:
+            args += ["-e", f"{end:.3f}"]
+        return args
+
+    def _rs_convert_command(self, rs_convert_exe, bag_path, output_prefix, stream_flag, time_range):
+        cmd = [str(rs_convert_exe), "-i", str(bag_path), "-p", str(output_prefix), stream_flag]
+        return cmd + self._time_range_args(time_range)
+
     @measure_time
     def _convert_color(self, args):
-        rs_convert_exe, bag_path, color_dir = args
+        rs_convert_exe, bag_path, color_dir, time_range = args
         print(f"  컬러 프레임 추출 중... ({bag_path.name})")
-        cmd = [str(rs_convert_exe), "-i", str(bag_path), "-p", str(color_dir / self.color_prefix), "-c"]
+        cmd = self._rs_convert_command(rs_convert_exe, bag_path, color_dir / self.color_prefix, "-c", time_range)
         result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode == 0
         print(f"  컬러 프레임 추출 {'완료' if result else '실패'}")
         return result
 
     @measure_time
     def _convert_depth(self, args):
-        rs_convert_exe, bag_path, depth_dir = args
+        rs_convert_exe, bag_path, depth_dir, time_range = args
         print(f"  깊이 프레임 추출 중... ({bag_path.name})")
-        cmd = [str(rs_convert_exe), "-i", str(bag_path), "-p", str(depth_dir / self.depth_prefix), "-d"]
+        cmd = self._rs_convert_command(rs_convert_exe, bag_path, depth_dir / self.depth_prefix, "-d", time_range)
         result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode == 0
         print(f"  깊이 프레임 추출 {'완료' if result else '실패'}")
         return result
 
-    def _generate_csv(self, args):
-        bag_path, csv_dir = args
-        print(f"  프레임 메타데이터 생성 중... ({bag_path.name})")
+    def _check_rs_convert(self):
+        """rs-convert로 이미지를 추출할 때 실행 파일이 없으면 변환 전에 중단"""
+        if not self._writes_frames() and not self.has_rs_convert():
+            raise FileNotFoundError(
+                f"rs-convert 실행 파일을 찾을 수 없습니다: {self.rs_convert_exe} "
+                "(RS_CONVERT_EXE 환경 변수나 --rs_convert로 경로를 지정하거나, --inline_frames로 직접 기록)"
+            )
+
+    def _writes_frames(self):
+        """rs-convert 대신 디코딩 중 직접 프레임 파일을 기록해야 하는지"""
+        return (
+            self.inline_frames
+            or self.valid_ranges is not None or self.align_depth or self._transforms_frames()
+            or self.frame_layout != "flat"
+            # rs-convert는 ms 소수 표기로만 파일 이름을 만든다
+            or self.timestamp.unit != "ms"
+        )
+
+    def _transforms_frames(self):
+        return (
+            self.crop_box is not None or bool(self.session_crop_boxes)
+            or self.color_decimation > 1 or self.depth_decimation > 1
+        )
+
+    def _crop_box_for(self, bag_path):
+        return self.session_crop_boxes.get(bag_path.parent.name, self.crop_box)
+
+    def _scale_box(self, box, source_shape, target_shape):
+        """컬러 좌표 crop box를 다른 해상도 프레임 좌표로 변환
+
+        원본 깊이는 컬러와 정렬되어 있지 않으므로 시야각이 같다고 보고
+        해상도 비율로만 근사한다.
+        """
+        if box is None:
+            return None
+        x, y, width, height = box
+        scale_y = target_shape[0] / source_shape[0]
+        scale_x = target_shape[1] / source_shape[1]
+
+        # 반올림으로 프레임 밖으로 나가거나 크기가 0이 되지 않도록 자름
+        x = min(int(round(x * scale_x)), target_shape[1] - 1)
+        y = min(int(round(y * scale_y)), target_shape[0] - 1)
+        width = max(1, min(int(round(width * scale_x)), target_shape[1] - x))
+        height = max(1, min(int(round(height * scale_y)), target_shape[0] - y))
+        return x, y, width, height
+
+    def _check_crop_box(self, box, shape, session):
+        """crop box가 컬러 프레임 안에 있는지 확인 (numpy slicing은 벗어난 부분을 조용히 잘라냄)"""
+        if box is None:
+            return
+        x, y, width, height = box
+        frame_height, frame_width = shape
+        if x < 0 or y < 0 or width <= 0 or height <= 0 or x + width > frame_width or y + height > frame_height:
+            raise ValueError(
+                f"{session}: crop box {list(box)}가 컬러 프레임({frame_width}x{frame_height}) 밖으로 나갑니다 "
+                f"(x + width <= {frame_width}, y + height <= {frame_height})"
+            )
+
+    def _crop(self, image, box):
+        if box is None:
+            return image
+        x, y, width, height = box
+        return image[y:y + height, x:x + width]
+
+    def _decimate_color(self, image):
+        """factor x factor 블록 평균으로 축소"""
+        factor = self.color_decimation
+        if factor <= 1:
+            return image
+        height = image.shape[0] // factor * factor
+        width = image.shape[1] // factor * factor
+        blocks = image[:height, :width].reshape(height // factor, factor, width // factor, factor, -1)
+        return blocks.mean(axis=(1, 3)).round().astype(np.uint8)
+
+    def _decimate_depth(self, depth):
+        """깊이는 평균 시 경계/무효(0) 값이 섞이므로 샘플링으로 축소"""
+        factor = self.depth_decimation
+        if factor <= 1:
+            return depth
+        height = depth.shape[0] // factor * factor
+        width = depth.shape[1] // factor * factor
+        return depth[:height:factor, :width:factor]
+
+    def _fieldnames(self):
+        if self.align_depth:
+            return self.csv_fieldnames + ['aligned_depth_file_path']
+        return self.csv_fieldnames
+
+    def _is_in_valid_range(self, timestamp):
+        if self.valid_ranges is None:
+            return True
+        for range_info in self.valid_ranges:
+            if range_info['start'] <= timestamp <= range_info['end']:
+                return True
+        return False
+
+    def _write_png(self, path, image):
+        """8bit RGB(A) 이미지를 PNG로 저장"""
+        height, width, channels = image.shape
+        color_type = {3: 2, 4: 6}[channels]
+
+        # 각 행 앞에 필터 타입(0: None) 바이트
+        raw = np.zeros((height, width * channels + 1), dtype=np.uint8)
+        raw[:, 1:] = image.reshape(height, -1)
+
+        def chunk(tag, data):
+            body = tag + data
+            return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body) & 0xffffffff)
+
+        with open(path, 'wb') as f:
+            f.write(b"\x89PNG\r\n\x1a\n")
+            f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)))
+            f.write(chunk(b"IDAT", zlib.compress(raw.tobytes(), 1)))
+            f.write(chunk(b"IEND", b""))
+
+    def _frame_subpath(self, file_name, session, timestamp):
+        """CSV에 기록할 프레임 파일 상대 경로"""
+        if self.frame_layout == "flat":
+            return file_name
+        bucket_dir = self.bucket_pattern.format(session=session, bucket=int(timestamp // self.bucket_ms))
+        return f"{bucket_dir}/{file_name}"
+
+    def _frame_file(self, directory, subpath):
+        """하위 bucket 디렉토리는 처음 쓸 때 한 번만 생성"""
+        path = directory / subpath
+        if path.parent not in self._created_dirs:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(path.parent)
+        return path
+
+    def _write_frames(self, output_path, row, color_frame, depth_frame, aligned_depth_frame=None, crop_box=None):
+        """rs-convert와 같은 이름/형식으로 컬러 PNG와 깊이 bin 기록 (crop/축소 적용)"""
+        color = np.asanyarray(color_frame.get_data())
+        color_shape = color.shape[:2]
+        if color_frame.get_profile().format() in (rs.format.bgr8, rs.format.bgra8):    # type: ignore
+            color = color[:, :, [2, 1, 0, 3][:color.shape[2]]]
+        color = self._decimate_color(self._crop(color, crop_box))
+        self._write_png(self._frame_file(output_path / self.color_dir_name, row['color_file_path']), color)
+
+        if row['depth_file_path']:
+            depth = np.asanyarray(depth_frame.get_data())
+            depth = self._crop(depth, self._scale_box(crop_box, color_shape, depth.shape))
+            np.ascontiguousarray(self._decimate_depth(depth)).tofile(self._frame_file(output_path / self.depth_dir_name, row['depth_file_path']))
+
+        if aligned_depth_frame is not None:
+            aligned_depth = self._crop(np.asanyarray(aligned_depth_frame.get_data()), crop_box)
+            np.ascontiguousarray(self._decimate_depth(aligned_depth)).tofile(self._frame_file(output_path / self.aligned_depth_dir_name, row['aligned_depth_file_path']))
+
+    def _output_shape(self, shape, box, factor):
+        height, width = (box[3], box[2]) if box is not None else shape
+        return [height // factor, width // factor] if factor > 1 else [height, width]
+
+    def _intrinsics_dict(self, intrinsics):
+        return {
+            'width': intrinsics.width,
+            'height': intrinsics.height,
+            'ppx': intrinsics.ppx,
+            'ppy': intrinsics.ppy,
+            'fx': intrinsics.fx,
+            'fy': intrinsics.fy,
+            'model': str(intrinsics.model),
+            'coeffs': list(intrinsics.coeffs),
+        }
+
+    def _session_meta(self, bag_path):
+        """카메라 내부/외부 파라미터와 추출 옵션"""
+        pipeline, playback = self._start_playback(bag_path)
+        try:
+            profile = pipeline.get_active_profile()
+            color_profile = profile.get_stream(rs.stream.color).as_video_stream_profile()    # type: ignore
+            depth_profile = profile.get_stream(rs.stream.depth).as_video_stream_profile()    # type: ignore
+            extrinsics = depth_profile.get_extrinsics_to(color_profile)
+            depth_scale = profile.get_device().first_depth_sensor().get_depth_scale()
+        finally:
+            pipeline.stop()
+
+        color_intrinsics = self._intrinsics_dict(color_profile.get_intrinsics())
+        depth_intrinsics = self._intrinsics_dict(depth_profile.get_intrinsics())
+
+        color_shape = (color_intrinsics['height'], color_intrinsics['width'])
+        depth_shape = (depth_intrinsics['height'], depth_intrinsics['width'])
+        crop_box = self._crop_box_for(bag_path)
+        self._check_crop_box(crop_box, color_shape, bag_path.parent.name)
+        depth_crop_box = self._scale_box(crop_box, color_shape, depth_shape)
+
+        return {
+            'bag_file': bag_path.name,
+            'color_intrinsics': color_intrinsics,
+            'depth_intrinsics': depth_intrinsics,
+            'depth_to_color_extrinsics': {
+                'rotation': list(extrinsics.rotation),
+                'translation': list(extrinsics.translation),
+            },
+            'depth_scale': depth_scale,
+            'aligned_depth': self.align_depth,
+            # 정렬된 깊이는 컬러 카메라 좌표계/해상도를 따른다
+            'aligned_depth_intrinsics': color_intrinsics if self.align_depth else None,
+            'raw_depth': self.keep_raw_depth,
+            # 저장 전 적용한 crop/축소 (crop box는 (x, y, width, height))
+            'crop_box': list(crop_box) if crop_box is not None else None,
+            'depth_crop_box': list(depth_crop_box) if depth_crop_box is not None else None,
+            'color_decimation': self.color_decimation,
+            'depth_decimation': self.depth_decimation,
+            'color_output_shape': self._output_shape(color_shape, crop_box, self.color_decimation),
+            'depth_output_shape': self._output_shape(depth_shape, depth_crop_box, self.depth_decimation),
+            'aligned_depth_output_shape': self._output_shape(color_shape, crop_box, self.depth_decimation) if self.align_depth else None,
+            'frame_layout': self.frame_layout,
+            'bucket_ms': self.bucket_ms if self.frame_layout != "flat" else None,
+            'timestamp_unit': self.timestamp.unit,
+        }
+
+    def _save_session_meta(self, bag_path, output_path, segments=None):
+        meta = self._session_meta(bag_path)
+        if segments is not None:
+            meta['segments'] = [
+                {
+                    'bag_file': segment['bag'].name,
+                    'start_ts': segment['start_ts'],
+                    'end_ts': segment['end_ts'],
+                    'overlap_ms': segment['overlap_ms'],
+                    'gap_ms': segment['gap_ms'],
+                }
+                for segment in segments
+            ]
+
+        meta_file = output_path / self.meta_dir_name / f"{bag_path.parent.name}.json"
+        meta_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(meta_file, 'w') as f:
+            json.dump(meta, f, indent=2)
+
+    def _start_playback(self, bag_path):
         pipeline = rs.pipeline()    # type: ignore
         config = rs.config()        # type: ignore
         config.enable_device_from_file(str(bag_path), repeat_playback=False)
         
         profile = pipeline.start(config)
-        profile.get_device().as_playback().set_real_time(False)
+        playback = profile.get_device().as_playback()
+        playback.set_real_time(False)
+        return pipeline, playback
+
+    def _frame_row(self, frames, color_frame, depth_frame, session=None):
+        timestamp = frames.get_timestamp()
+        color_timestamp = self.timestamp.format(color_frame.get_timestamp())
+        depth_timestamp = self.timestamp.format(depth_frame.get_timestamp())
+        return {
+            'index': 0,
+            'frame_timestamp': self.timestamp.format(timestamp),
+            'color_frame_index': color_frame.get_frame_number(),
+            'color_timestamp': color_timestamp,
+            'color_backend_timestamp': color_frame.get_frame_metadata(rs.frame_metadata_value.backend_timestamp),   # type: ignore
+            'color_hardware_timestamp': color_frame.get_frame_metadata(rs.frame_metadata_value.frame_timestamp),    # type: ignore
+            'color_arrival_time': color_frame.get_frame_metadata(rs.frame_metadata_value.time_of_arrival),          # type: ignore
+            'color_file_path': self._frame_subpath(self.color_file_pattern.format(timestamp=color_timestamp), session, timestamp),
+            'depth_frame_index': depth_frame.get_frame_number(),
+            'depth_timestamp': depth_timestamp,
+            'depth_backend_timestamp': depth_frame.get_frame_metadata(rs.frame_metadata_value.backend_timestamp),   # type: ignore
+            'depth_hardware_timestamp': depth_frame.get_frame_metadata(rs.frame_metadata_value.frame_timestamp),    # type: ignore
+            'depth_arrival_time': depth_frame.get_frame_metadata(rs.frame_metadata_value.time_of_arrival),          # type: ignore
+            'depth_file_path': self._frame_subpath(self.depth_file_pattern.format(timestamp=depth_timestamp), session, timestamp) if self.keep_raw_depth else ''
+        }
+
+    def _decode_frames(self, pipeline, writer, output_path, start_ts=None, end_ts=None, publish=None, crop_box=None, session=None):
+        """frameset을 순서대로 읽어 [start_ts, end_ts) 구간의 행만 기록 (publish 지정 시 함께 전달)"""
+        index = 0
+        align = rs.align(rs.stream.color) if self.align_depth else None    # type: ignore
+        try:
+            while True:
+                frames = pipeline.wait_for_frames()
+                timestamp = frames.get_timestamp()
+
+                # 다른 shard 소유 구간
+                if start_ts is not None and timestamp < start_ts:
+                    continue
+                if end_ts is not None and timestamp >= end_ts:
+                    break
+
+                # 유효 재생 구간 밖 프레임은 인코딩/기록 생략
+                if not self._is_in_valid_range(timestamp):
+                    continue
+
+                color_frame = frames.get_color_frame()
+                depth_frame = frames.get_depth_frame()
+
+                if color_frame and depth_frame:
+                    row = self._frame_row(frames, color_frame, depth_frame, session)
+                    row['index'] = index
+
+                    aligned_depth_frame = None
+                    if align is not None:
+                        aligned_depth_frame = align.process(frames).get_depth_frame()
+                        row['aligned_depth_file_path'] = self._frame_subpath(
+                            self.aligned_depth_file_pattern.format(timestamp=row['depth_timestamp']), session, timestamp
+                        )
+
+                    if self._writes_frames():
+                        self._write_frames(output_path, row, color_frame, depth_frame, aligned_depth_frame, crop_box)
+                    writer.writerow(row)
+                    if publish is not None:
+                        publish(row)
+                    index += 1
+                    
+        except RuntimeError:
+            pass
+        return index
+
+    def _checkpoint_file(self, output_path, name):
+        return output_path / self.checkpoint_dir_name / f"{name}.json"
+
+    def _load_checkpoint(self, checkpoint_file, csv_file):
+        """이어갈 수 있는 checkpoint (CSV가 없거나 기록된 크기보다 작으면 무시)"""
+        if self.checkpoint_frames <= 0 or not checkpoint_file.exists():
+            return None
+        with open(checkpoint_file, 'r') as f:
+            checkpoint = json.load(f)
+        if not csv_file.exists():
+            return None
+        # 완료 후에는 index 재부여로 CSV 크기가 바뀔 수 있어 크기를 비교하지 않는다
+        if not checkpoint['complete'] and csv_file.stat().st_size < checkpoint['csv_offset']:
+            return None
+        return checkpoint
+
+    def _options_hash(self):
+        """출력 형식을 바꾸는 추출 옵션의 hash (checkpoint에 기록해 옵션이 바뀌면 다시 변환)
+
+        shard_count는 출력을 바꾸지 않지만 shard part checkpoint의 구간을 정하므로 포함한다.
+        """
+        options = {
+            'crop_box': self.crop_box,
+            'session_crop_boxes': self.session_crop_boxes,
+            'color_decimation': self.color_decimation,
+            'depth_decimation': self.depth_decimation,
+            'align_depth': self.align_depth,
+            'keep_raw_depth': self.keep_raw_depth,
+            'frame_layout': self.frame_layout,
+            'bucket_ms': self.bucket_ms if self.frame_layout != "flat" else None,
+            'timestamp_unit': self.timestamp.unit,
+            'valid_ranges': self.valid_ranges,
+            'shard_count': self.shard_count,
+        }
+        return hashlib.sha1(json.dumps(options, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _reset_stale_output(self, output_path):
+        """다른 추출 옵션으로 만든 checkpoint가 있으면 RealSense 출력을 지우고 처음부터 다시 변환
+
+        frames.csv에는 세션 행이 이어 붙어 있어 세션 하나만 다시 쓸 수 없으므로,
+        CSV/프레임 파일/checkpoint를 모두 지운다.
+        """
+        options_hash = self._options_hash()
+        stale = []
+        for checkpoint_file in sorted((output_path / self.checkpoint_dir_name).glob("*.json")):
+            with open(checkpoint_file, 'r') as f:
+                if json.load(f).get('options') != options_hash:
+                    stale.append(checkpoint_file.stem)
+        if not stale:
+            return
+
+        print(f"  추출 옵션이 바뀌어 기존 RealSense 출력을 지우고 다시 변환합니다 ({', '.join(stale)})")
+        for dir_name in (self.csv_dir_name, self.color_dir_name, self.depth_dir_name, self.aligned_depth_dir_name, self.checkpoint_dir_name):
+            shutil.rmtree(output_path / dir_name, ignore_errors=True)
+        self._created_dirs.clear()
+        self._make_output_dirs(output_path)
+
+    def _save_checkpoint(self, checkpoint_file, checkpoint):
+        if self.checkpoint_frames <= 0:
+            return
+        checkpoint['options'] = self._options_hash()
+        checkpoint_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = checkpoint_file.with_name(f".{checkpoint_file.name}.tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump(checkpoint, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, checkpoint_file)
+
+    def _clear_checkpoint(self, output_path, name):
+        self._checkpoint_file(output_path, name).unlink(missing_ok=True)
+
+    def _sync(self, f):
+        """CSV를 디스크에 반영하고 현재 크기(다음 기록 위치) 반환"""
+        f.flush()
+        os.fsync(f.fileno())
+        return os.fstat(f.fileno()).st_size
 
-        csv_file = csv_dir / self.csv_filename
-        file_exists = csv_file.exists()
+    def _decode_to_csv(self, bag_path, output_path, csv_file, name, start_ts=None, end_ts=None, seek_seconds=0.0, fresh=False):
+        """bag 구간을 csv_file 끝에 기록하며 주기적으로 checkpoint
+
+        같은 name의 checkpoint가 남아 있으면 기록된 CSV 크기로 자르고 마지막 프레임
+        다음부터 이어간다. 완료된 checkpoint면 다시 디코딩하지 않는다.
+        fresh=True면 checkpoint가 없을 때 csv_file을 비우고 시작 (shard part 파일).
+        """
+        checkpoint_file = self._checkpoint_file(output_path, name)
+        checkpoint = self._load_checkpoint(checkpoint_file, csv_file)
+
+        if checkpoint is not None and checkpoint['complete']:
+            print(f"  이미 완료된 구간입니다: {name} ({checkpoint['frames']} frames)")
+            return checkpoint['frames']
+
+        if checkpoint is not None and checkpoint['last_timestamp'] is not None:
+            last_timestamp = checkpoint['last_timestamp']
+            _, first_timestamp = self._get_bag_timeline(bag_path)
+            # 기록된 값은 표기 단위로 반올림되어 있으므로 그 절반만큼 넘긴 뒤부터
+            resume_ts = last_timestamp + self.timestamp.resolution() / 2
+            start_ts = max(start_ts or float('-inf'), math.nextafter(resume_ts, math.inf))
+            seek_seconds = max(seek_seconds, (last_timestamp - first_timestamp) / 1000 - self.shard_margin)
+            print(f"  checkpoint에서 이어서 디코딩: {name} ({checkpoint['frames']} frames, {last_timestamp:.3f})")
 
         with open(csv_file, 'a', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=[
-                'index', 
-                'frame_timestamp', 
-                'color_frame_index', 
-                'color_timestamp', 
-                'color_backend_timestamp', 
-                'color_hardware_timestamp', 
-                'color_arrival_time', 
-                'color_file_path', 
-                'depth_frame_index', 
-                'depth_timestamp', 
-                'depth_backend_timestamp', 
-                'depth_hardware_timestamp', 
-                'depth_arrival_time', 
-                'depth_file_path'
-            ])
-            
-            if not file_exists or csv_file.stat().st_size == 0:
-                writer.writeheader()
+            writer = csv.DictWriter(f, fieldnames=self._fieldnames())
+
+            if checkpoint is not None:
+                # 마지막 checkpoint 이후 기록된 행 제거
+                f.truncate(checkpoint['csv_offset'])
+            else:
+                if fresh:
+                    f.truncate(0)
+                if os.fstat(f.fileno()).st_size == 0:
+                    writer.writeheader()
+                checkpoint = {'csv_offset': self._sync(f), 'last_timestamp': None, 'frames': 0, 'complete': False}
+                self._save_checkpoint(checkpoint_file, checkpoint)
 
-            index = 0
+            def commit(row):
+                checkpoint['frames'] += 1
+                if self.checkpoint_frames > 0 and checkpoint['frames'] % self.checkpoint_frames == 0:
+                    checkpoint['csv_offset'] = self._sync(f)
+                    checkpoint['last_timestamp'] = self.timestamp.parse(row['frame_timestamp'])
+                    self._save_checkpoint(checkpoint_file, checkpoint)
+
+            pipeline, playback = self._start_playback(bag_path)
+            if seek_seconds > 0:
+                playback.seek(timedelta(seconds=seek_seconds))
             try:
-                while True:
-                    frames = pipeline.wait_for_frames()
-                    color_frame = frames.get_color_frame()
-                    depth_frame = frames.get_depth_frame()
-
-                    if color_frame and depth_frame:
-                        writer.writerow({
-                            'index': index,
-                            'frame_timestamp': f"{frames.get_timestamp():.14f}",
-                            'color_frame_index': color_frame.get_frame_number(),
-                            'color_timestamp': f"{color_frame.get_timestamp():.14f}",
-                            'color_backend_timestamp': color_frame.get_frame_metadata(rs.frame_metadata_value.backend_timestamp),   # type: ignore
-                            'color_hardware_timestamp': color_frame.get_frame_metadata(rs.frame_metadata_value.frame_timestamp),    # type: ignore
-                            'color_arrival_time': color_frame.get_frame_metadata(rs.frame_metadata_value.time_of_arrival),          # type: ignore
-                            'color_file_path': f"color_Color_{color_frame.get_timestamp():.14f}.png",
-                            'depth_frame_index': depth_frame.get_frame_number(),
-                            'depth_timestamp': f"{depth_frame.get_timestamp():.14f}",
-                            'depth_backend_timestamp': depth_frame.get_frame_metadata(rs.frame_metadata_value.backend_timestamp),   # type: ignore
-                            'depth_hardware_timestamp': depth_frame.get_frame_metadata(rs.frame_metadata_value.frame_timestamp),    # type: ignore
-                            'depth_arrival_time': depth_frame.get_frame_metadata(rs.frame_metadata_value.time_of_arrival),          # type: ignore
-                            'depth_file_path': f"depth_Depth_{depth_frame.get_timestamp():.14f}.bin"
-                        })
-                        index += 1
-                        
-            except RuntimeError:
-                pass
+                self._decode_frames(
+                    pipeline, writer, output_path, start_ts, end_ts, publish=commit,
+                    crop_box=self._crop_box_for(bag_path), session=bag_path.parent.name
+                )
             finally:
                 pipeline.stop()
+
+            checkpoint['csv_offset'] = self._sync(f)
+            checkpoint['complete'] = True
+            self._save_checkpoint(checkpoint_file, checkpoint)
+        return checkpoint['frames']
+
+    def _generate_csv(self, args):
+        bag_path, output_path = args
+        csv_dir = output_path / self.csv_dir_name
+        print(f"  프레임 메타데이터 생성 중... ({bag_path.name})")
+
+        self._decode_to_csv(bag_path, output_path, csv_dir / self.csv_filename, bag_path.parent.name)
         print(f"  프레임 메타데이터 생성 완료")
         return True
+
+    def _get_bag_timeline(self, bag_path):
+        """bag 재생 길이(초)와 첫 frameset 타임스탬프(ms)"""
+        pipeline, playback = self._start_playback(bag_path)
+        try:
+            duration = playback.get_duration().total_seconds()
+            first_timestamp = pipeline.wait_for_frames().get_timestamp()
+        finally:
+            pipeline.stop()
+        return duration, first_timestamp
+
+    def _plan_shards(self, bag_path):
+        """bag 재생 구간을 shard_count개로 분할
+
+        seek 위치(start, end)는 bag 시작 기준 초, 소유 구간(start_ts, end_ts)은
+        frameset 타임스탬프 기준이며 shard 사이에 빈틈이나 겹침이 없다.
+        """
+        duration, first_timestamp = self._get_bag_timeline(bag_path)
+        shard_length = duration / self.shard_count
+
+        shards = []
+        for shard in range(self.shard_count):
+            start = shard * shard_length
+            end = (shard + 1) * shard_length if shard < self.shard_count - 1 else None
+            shards.append({
+                'shard': shard,
+                'start': start,
+                'end': end,
+                'start_ts': first_timestamp + start * 1000 if shard > 0 else None,
+                'end_ts': first_timestamp + end * 1000 if end is not None else None,
+            })
+        return shards
+
+    def _shard_time_range(self, shard):
+        """shard 경계 프레임을 놓치지 않도록 여유 구간을 둔 seek 범위"""
+        start = max(0.0, shard['start'] - self.shard_margin)
+        end = shard['end'] + self.shard_margin if shard['end'] is not None else None
+        return start, end
+
+    def _plan_windows(self, bag_path, windows, owned_end_ts=None):
+        """선택 구간 중 bag 재생 구간과 겹치는 것만 shard 형식으로 변환 (소유 구간 끝 포함)
+
+        owned_end_ts가 있으면 그 이후(다음 segment 소유) 프레임은 제외한다.
+        """
+        duration, first_timestamp = self._get_bag_timeline(bag_path)
+        last_timestamp = first_timestamp + duration * 1000
+
+        shards = []
+        for start_ts, end_ts in windows:
+            if end_ts < first_timestamp or start_ts > last_timestamp:
+                continue
+            if owned_end_ts is not None and start_ts >= owned_end_ts:
+                continue
+            shard_end_ts = math.nextafter(end_ts, math.inf)
+            if owned_end_ts is not None:
+                shard_end_ts = min(shard_end_ts, owned_end_ts)
+            shards.append({
+                'shard': len(shards),
+                'start': max(0.0, (start_ts - first_timestamp) / 1000),
+                'end': min(duration, (shard_end_ts - first_timestamp) / 1000),
+                'start_ts': start_ts,
+                'end_ts': shard_end_ts,
+            })
+        return shards
+
+    def _plan_segments(self, session_dir):
+        """세션 폴더의 bag들을 첫 frameset 타임스탬프 순서로 정렬하고 segment별 소유 구간 결정
+
+        segment는 다음 segment의 첫 프레임 직전까지 소유한다 (end_ts, 마지막 segment는 None).
+        overlap_ms/gap_ms는 재생 길이 기준 다음 segment와의 겹침/빈 구간.
+        """
+        bag_files = sorted(Path(session_dir).glob("*.bag"))
+        if len(bag_files) <= 1:
+            return [
+                {'segment': 0, 'bag': bag_path, 'start_ts': None, 'end_ts': None, 'overlap_ms': 0.0, 'gap_ms': 0.0}
+                for bag_path in bag_files
+            ]
+
+        segments = []
+        for bag_path in bag_files:
+            duration, first_timestamp = self._get_bag_timeline(bag_path)
+            segments.append({'bag': bag_path, 'start_ts': first_timestamp, 'last_ts': first_timestamp + duration * 1000})
+        segments.sort(key=lambda segment: segment['start_ts'])
+
+        for i, segment in enumerate(segments):
+            next_segment = segments[i + 1] if i + 1 < len(segments) else None
+            boundary = next_segment['start_ts'] - segment['last_ts'] if next_segment else 0.0
+            segment['segment'] = i
+            segment['end_ts'] = next_segment['start_ts'] if next_segment else None
+            segment['overlap_ms'] = max(0.0, -boundary)
+            segment['gap_ms'] = max(0.0, boundary)
+        return segments
+
+    def _report_segments(self, segments):
+        for segment, next_segment in zip(segments, segments[1:]):
+            if segment['overlap_ms'] > 0:
+                print(
+                    f"  segment 겹침: {segment['bag'].name} -> {next_segment['bag'].name} "
+                    f"{segment['overlap_ms']:.1f}ms (겹친 구간은 {next_segment['bag'].name} 프레임 사용)"
+                )
+            if segment['gap_ms'] > self.segment_gap_ms:
+                print(
+                    f"  Warning: segment 사이 빈 구간 {segment['gap_ms']:.1f}ms "
+                    f"({segment['bag'].name} -> {next_segment['bag'].name})"
+                )
+
+    def _segment_time_range(self, segment):
+        """segment 소유 구간의 rs-convert 재생 범위 (bag 시작 기준 초)"""
+        if segment['end_ts'] is None:
+            return None
+        return 0.0, (segment['end_ts'] - segment['start_ts']) / 1000 + self.shard_margin
+
+    def _segment_shards(self, segment):
+        """segment bag의 shard 계획을 segment 소유 구간으로 자름"""
+        if self.shard_count > 1:
+            shards = self._plan_shards(segment['bag'])
+        else:
+            shards = [{'shard': 0, 'start': 0.0, 'end': None, 'start_ts': None, 'end_ts': None}]
+        if segment['end_ts'] is None:
+            return shards
+
+        end = (segment['end_ts'] - segment['start_ts']) / 1000
+        owned = []
+        for shard in shards:
+            if shard['start_ts'] is not None and shard['start_ts'] >= segment['end_ts']:
+                continue
+            if shard['end_ts'] is None or shard['end_ts'] > segment['end_ts']:
+                shard = dict(shard, end=end, end_ts=segment['end_ts'])
+            owned.append(shard)
+        return owned
+
+    def _generate_csv_shard(self, args):
+        bag_path, output_path, part_file, shard = args
+        print(f"  프레임 메타데이터 생성 중... ({bag_path.name}, shard {shard['shard']})")
+
+        seek_seconds, _ = self._shard_time_range(shard)
+        count = self._decode_to_csv(
+            bag_path, output_path, part_file, self._shard_checkpoint_name(bag_path, part_file),
+            shard['start_ts'], shard['end_ts'], seek_seconds, fresh=True
+        )
+        print(f"  프레임 메타데이터 생성 완료 (shard {shard['shard']}: {count} frames)")
+        return True
+
+    def _shard_checkpoint_name(self, bag_path, part_file):
+        return f"{bag_path.parent.name}.{part_file.stem}"
+
+    def _stitch_shards(self, part_files, csv_file, offset=None):
+        """shard 순서대로 part CSV를 이어붙이고 경계 중복 프레임 제거
+
+        offset이 있으면 먼저 그 크기로 잘라 중단된 이전 병합 결과를 버린다.
+        part 파일은 호출한 쪽에서 병합이 끝난 뒤 지운다.
+        """
+        seen = set()
+        count = 0
+
+        with open(csv_file, 'a', newline='') as out:
+            writer = csv.DictWriter(out, fieldnames=self._fieldnames())
+
+            if offset is not None:
+                out.truncate(offset)
+            if os.fstat(out.fileno()).st_size == 0:
+                writer.writeheader()
+
+            for part_file in part_files:
+                with open(part_file, 'r', newline='') as f:
+                    for row in csv.DictReader(f):
+                        if row['frame_timestamp'] in seen:
+                            continue
+                        seen.add(row['frame_timestamp'])
+                        writer.writerow(row)
+                        count += 1
+            self._sync(out)
+        return count
+
+    def _decode_shards(self, jobs, output_path):
+        """(bag, shard, part CSV) 작업마다 part CSV 디코딩 (이미지 추출은 rs-convert 구간 실행 또는 인라인 기록)
+
+        bag이 다른 작업(분할 녹화 segment)도 하나의 pool에서 함께 실행한다.
+        """
+        with mp.Pool(processes=min(mp.cpu_count(), len(jobs) * 3)) as pool:
+            tasks = []
+            for bag_path, shard, part_file in jobs:
+                if not self._writes_frames():
+                    time_range = self._shard_time_range(shard)
+                    tasks.append(pool.apply_async(
+                        self._convert_color, 
+                        ((self.rs_convert_exe, bag_path, output_path / self.color_dir_name, time_range),)
+                    ))
+                    tasks.append(pool.apply_async(
+                        self._convert_depth, 
+                        ((self.rs_convert_exe, bag_path, output_path / self.depth_dir_name, time_range),)
+                    ))
+                tasks.append(pool.apply_async(
+                    self._generate_csv_shard, 
+                    ((bag_path, output_path, part_file, shard),)
+                ))
+
+            return all([task.get() for task in tasks])
+
+    def _stitch_parts(self, jobs, output_path, name):
+        """디코딩이 끝난 작업들의 part CSV를 순서대로 frames.csv에 병합하고 part 파일 정리"""
+        csv_file = output_path / self.csv_dir_name / self.csv_filename
+
+        # 병합 도중 중단되면 병합 전 크기로 되돌린 뒤 다시 병합
+        checkpoint_file = self._checkpoint_file(output_path, name)
+        checkpoint = self._load_checkpoint(checkpoint_file, csv_file)
+        if checkpoint is None:
+            checkpoint = {
+                'csv_offset': csv_file.stat().st_size if csv_file.exists() else 0,
+                'last_timestamp': None, 'frames': 0, 'complete': False,
+            }
+            self._save_checkpoint(checkpoint_file, checkpoint)
+
+        count = self._stitch_shards([part_file for _, _, part_file in jobs], csv_file, checkpoint['csv_offset'])
+        checkpoint.update(frames=count, complete=True)
+        self._save_checkpoint(checkpoint_file, checkpoint)
+
+        for bag_path, _, part_file in jobs:
+            part_file.unlink()
+            self._clear_checkpoint(output_path, self._shard_checkpoint_name(bag_path, part_file))
+        return count
+
+    def _unit_sharded(self, bag_path: Path, output_path: Path) -> bool:
+        shards = self._plan_shards(bag_path)
+        print(f"  {len(shards)}개 구간으로 분할 디코딩 ({bag_path.name})")
+
+        csv_dir = output_path / self.csv_dir_name
+        jobs = [(bag_path, shard, csv_dir / self.shard_part_pattern.format(shard=shard['shard'])) for shard in shards]
+        success = self._decode_shards(jobs, output_path)
+
+        if success:
+            count = self._stitch_parts(jobs, output_path, bag_path.parent.name)
+            print(f"  shard 병합 완료: {count} frames")
+
+        return success
+
+    def _unit_segments(self, segments, output_path: Path) -> bool:
+        """분할 녹화 segment들을 (segment, shard) 작업으로 나눠 함께 디코딩한 뒤 시간 순서로 병합"""
+        csv_dir = output_path / self.csv_dir_name
+        jobs = [
+            (segment['bag'], shard, csv_dir / self.segment_part_pattern.format(segment=segment['segment'], shard=shard['shard']))
+            for segment in segments
+            for shard in self._segment_shards(segment)
+        ]
+        print(f"  bag {len(segments)}개를 {len(jobs)}개 작업으로 병렬 디코딩")
+        success = self._decode_shards(jobs, output_path)
+
+        if success:
+            count = self._stitch_parts(jobs, output_path, segments[0]['bag'].parent.name)
+            print(f"  segment 병합 완료: {count} frames")
+
+        return success
     
+    def _convert_selected(self, session_dirs, output_path):
+        """선택 구간만 세션별로 seek 디코딩한 뒤 frames.csv에 한 번에 교체"""
+        windows = self.selection.windows
+        print(f"선택 구간 {len(windows)}개만 디코딩합니다.")
+
+        csv_dir = output_path / self.csv_dir_name
+        for dir_name in (csv_dir, output_path / self.color_dir_name, output_path / self.depth_dir_name):
+            dir_name.mkdir(parents=True, exist_ok=True)
+        if self.align_depth:
+            (output_path / self.aligned_depth_dir_name).mkdir(parents=True, exist_ok=True)
+
+        rows = []
+        success = True
+        for session_dir in session_dirs:
+            segments = self._plan_segments(session_dir)
+            jobs = [
+                (segment['bag'], shard, csv_dir / self.segment_part_pattern.format(segment=segment['segment'], shard=shard['shard']))
+                for segment in segments
+                for shard in self._plan_windows(segment['bag'], windows, segment['end_ts'])
+            ]
+            if not jobs:
+                continue
+
+            bag_names = ", ".join(dict.fromkeys(bag_path.name for bag_path, _, _ in jobs))
+            print(f"  {session_dir.name}: {len(jobs)}개 구간 디코딩 ({bag_names})")
+            self._save_session_meta(segments[0]['bag'], output_path, segments if len(segments) > 1 else None)
+
+            if not self._decode_shards(jobs, output_path):
+                print(f"  변환 실패: {session_dir}")
+                success = False
+
+            for bag_path, _, part_file in jobs:
+                if not part_file.exists():
+                    continue
+                with open(part_file, 'r', newline='') as f:
+                    rows.extend(csv.DictReader(f))
+                part_file.unlink()
+                self._clear_checkpoint(output_path, self._shard_checkpoint_name(bag_path, part_file))
+
+        if success:
+            count = self.selection.splice_csv(csv_dir / self.csv_filename, rows, 'frame_timestamp')
+            print(f"  frames.csv에 {count} frames 교체 완료")
+        return success
+
+    def _make_output_dirs(self, output_path):
+        (output_path / self.color_dir_name).mkdir(parents=True, exist_ok=True)
+        (output_path / self.depth_dir_name).mkdir(parents=True, exist_ok=True)
+        (output_path / self.csv_dir_name).mkdir(parents=True, exist_ok=True)
+        if self.align_depth:
+            (output_path / self.aligned_depth_dir_name).mkdir(parents=True, exist_ok=True)
+
+    def _is_converted(self, output_path, name):
+        """checkpoint상 이미 끝난 세션인지 (frames.csv 중복 방지)
+
+        CSV 디코딩(complete)만 끝나고 이미지 추출(exported)이 실패한 세션은 다시 실행한다.
+        이때 CSV 디코딩은 complete checkpoint로 건너뛰어 행이 중복되지 않는다.
+        """
+        checkpoint = self._load_checkpoint(
+            self._checkpoint_file(output_path, name),
+            output_path / self.csv_dir_name / self.csv_filename
+        )
+        if checkpoint is not None and checkpoint['complete'] and checkpoint.get('exported'):
+            print(f"  이미 변환된 세션입니다: {name} ({checkpoint['frames']} frames)")
+            return True
+        return False
+
+    def _mark_exported(self, output_path, name):
+        """컬러/깊이(/정렬) 추출까지 성공한 세션 표시"""
+        checkpoint_file = self._checkpoint_file(output_path, name)
+        checkpoint = self._load_checkpoint(checkpoint_file, output_path / self.csv_dir_name / self.csv_filename)
+        if checkpoint is not None and checkpoint['complete']:
+            checkpoint['exported'] = True
+            self._save_checkpoint(checkpoint_file, checkpoint)
+
     def _update_csv_indices(self, csv_file: Path):
         if not csv_file.exists():
             return
@@ -144,14 +953,21 @@ class Realsense:
         for i, row in enumerate(rows):
             row['index'] = i
         
-        with open(csv_file, 'w', newline='') as f:
+        # 기록 도중 중단되어도 기존 CSV가 남도록 임시 파일에 쓴 뒤 교체
+        tmp_file = csv_file.with_name(f".{csv_file.name}.tmp")
+        with open(tmp_file, 'w', newline='') as f:
             writer = csv.DictWriter(f, fieldnames=fieldnames) # type: ignore
             writer.writeheader()
             writer.writerows(rows)
+            self._sync(f)
+        os.replace(tmp_file, csv_file)
 
     ##
     # Public
 
+    def has_rs_convert(self):
+        return shutil.which(str(self.rs_convert_exe)) is not None
+
     def unit(
         self, 
         bag_file: str, 
@@ -160,37 +976,147 @@ class Realsense:
         bag_path = Path(bag_file)
         output_path = Path(output_dir)
         
-        (output_path / self.color_dir_name).mkdir(parents=True, exist_ok=True)
-        (output_path / self.depth_dir_name).mkdir(parents=True, exist_ok=True)
-        (output_path / self.csv_dir_name).mkdir(parents=True, exist_ok=True)
+        self._make_output_dirs(output_path)
+        self._reset_stale_output(output_path)
+        if self._is_converted(output_path, bag_path.parent.name):
+            return True
+
+        # rs-convert로 추출해도 저장 해상도를 알 수 있도록 항상 기록 (Loader가 깊이 bin 해석에 사용)
+        self._save_session_meta(bag_path, output_path)
 
         # RUN
         
-        with mp.Pool(processes=3) as pool:
-            color_task = pool.apply_async(
-                self._convert_color, 
-                ((self.rs_convert_exe, bag_path, output_path / self.color_dir_name),)
-            )
-            depth_task = pool.apply_async(
-                self._convert_depth, 
-                ((self.rs_convert_exe, bag_path, output_path / self.depth_dir_name),)
-            )
-            time.sleep(2)
-            csv_task = pool.apply_async(
-                self._generate_csv, 
-                ((bag_path, output_path / self.csv_dir_name),)
-            )
-            
-            success = all(
-                [color_task.get(), depth_task.get(), csv_task.get()]
-            )
+        if self.shard_count > 1:
+            success = self._unit_sharded(bag_path, output_path)
+        elif self._writes_frames():
+            success = self._generate_csv((bag_path, output_path))
+        else:
+            with mp.Pool(processes=3) as pool:
+                color_task = pool.apply_async(
+                    self._convert_color, 
+                    ((self.rs_convert_exe, bag_path, output_path / self.color_dir_name, None),)
+                )
+                depth_task = pool.apply_async(
+                    self._convert_depth, 
+                    ((self.rs_convert_exe, bag_path, output_path / self.depth_dir_name, None),)
+                )
+                time.sleep(2)
+                csv_task = pool.apply_async(
+                    self._generate_csv, 
+                    ((bag_path, output_path),)
+                )
+                
+                success = all(
+                    [color_task.get(), depth_task.get(), csv_task.get()]
+                )
         
         if success:
             csv_file = output_path / self.csv_dir_name / self.csv_filename
             self._update_csv_indices(csv_file)
+            self._mark_exported(output_path, bag_path.parent.name)
         
         return success
 
+    def unit_session(self, session_dir: str, output_dir: str) -> bool:
+        """세션 폴더의 bag을 변환. 분할 녹화된 bag 여러 개는 하나의 타임라인으로 병합"""
+        output_path = Path(output_dir)
+        segments = self._plan_segments(session_dir)
+        if len(segments) == 1:
+            return self.unit(str(segments[0]['bag']), output_dir)
+
+        self._make_output_dirs(output_path)
+        self._reset_stale_output(output_path)
+        if self._is_converted(output_path, Path(session_dir).name):
+            return True
+
+        print(f"  분할 녹화 bag {len(segments)}개: {', '.join(segment['bag'].name for segment in segments)}")
+        self._report_segments(segments)
+        self._save_session_meta(segments[0]['bag'], output_path, segments)
+
+        success = self._unit_segments(segments, output_path)
+        if success:
+            self._update_csv_indices(output_path / self.csv_dir_name / self.csv_filename)
+            self._mark_exported(output_path, Path(session_dir).name)
+        return success
+
+    def stream(self, input_dir: str, output_dir: str, publish) -> bool:
+        """세션 bag을 순서대로 디코딩하면서 frames.csv 행을 publish로 전달
+
+        컬러/깊이 이미지 추출(rs-convert)은 별도 프로세스로 동시에 진행한다.
+        frames.csv를 처음부터 다시 쓰므로 기존 checkpoint는 버리고, 끝나면 세션별
+        완료 checkpoint를 남겨 이후 배치 변환이 같은 세션을 다시 붙이지 않게 한다.
+        """
+        input_path = Path(input_dir)
+        output_path = Path(output_dir)
+
+        self._check_rs_convert()
+        self._make_output_dirs(output_path)
+        for checkpoint_file in (output_path / self.checkpoint_dir_name).glob("*.json"):
+            checkpoint_file.unlink()
+        checkpoints = {}
+
+        csv_file = output_path / self.csv_dir_name / self.csv_filename
+        # 동시에 실행하는 rs-convert 수는 배치 pool 크기(CPU 수)로 제한
+        max_processes = max(2, mp.cpu_count())
+        processes = []
+        exit_codes = []
+
+        with open(csv_file, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=self._fieldnames())
+            writer.writeheader()
+
+            for session_dir in find_session_dirs(input_path, "realsense"):
+                segments = self._plan_segments(session_dir)
+                if not segments:
+                    continue
+
+                self._report_segments(segments)
+                self._save_session_meta(segments[0]['bag'], output_path, segments if len(segments) > 1 else None)
+
+                checkpoint = {'csv_offset': 0, 'last_timestamp': None, 'frames': 0, 'complete': False}
+                def commit(row, checkpoint=checkpoint):
+                    checkpoint['frames'] += 1
+                    checkpoint['last_timestamp'] = self.timestamp.parse(row['frame_timestamp'])
+                    publish(row)
+
+                # segment는 시간 순서대로 이어서 디코딩 (다음 segment 소유 구간 전에서 멈춤)
+                for segment in segments:
+                    bag_path = segment['bag']
+                    print(f"  {session_dir.name} 스트리밍 디코딩 중... ({bag_path.name})")
+                    if not self._writes_frames():
+                        time_range = self._segment_time_range(segment)
+                        while len(processes) > max_processes - 2:
+                            exit_codes.append(processes.pop(0).wait())
+                        processes.append(subprocess.Popen(
+                            self._rs_convert_command(self.rs_convert_exe, bag_path, output_path / self.color_dir_name / self.color_prefix, "-c", time_range),
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+                        ))
+                        processes.append(subprocess.Popen(
+                            self._rs_convert_command(self.rs_convert_exe, bag_path, output_path / self.depth_dir_name / self.depth_prefix, "-d", time_range),
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+                        ))
+
+                    pipeline, playback = self._start_playback(bag_path)
+                    try:
+                        self._decode_frames(
+                            pipeline, writer, output_path, end_ts=segment['end_ts'], publish=commit,
+                            crop_box=self._crop_box_for(bag_path), session=bag_path.parent.name
+                        )
+                    finally:
+                        pipeline.stop()
+
+                checkpoint.update(csv_offset=self._sync(f), complete=True)
+                checkpoints[session_dir.name] = checkpoint
+
+        exit_codes += [process.wait() for process in processes]
+        success = all(code == 0 for code in exit_codes)
+        self._update_csv_indices(csv_file)
+
+        for name, checkpoint in checkpoints.items():
+            checkpoint['exported'] = success
+            self._save_checkpoint(self._checkpoint_file(output_path, name), checkpoint)
+        return success
+
     def convert(self, input_dir: str, output_dir: str) -> bool:
         """RealSense session들의 bag 파일을 변환"""
         input_path = Path(input_dir)
@@ -198,12 +1124,16 @@ class Realsense:
         
         print("RealSense 세션 폴더 검색 중...")
         # session_*_realsense 폴더들 찾기
-        session_dirs = sorted(input_path.glob("session_*_realsense"))
+        session_dirs = find_session_dirs(input_path, "realsense")
         if not session_dirs:
             print("RealSense 세션 폴더를 찾을 수 없습니다.")
             return False
         
         print(f"발견된 세션 폴더: {len(session_dirs)}개")
+        self._check_rs_convert()
+
+        if self.selection is not None and self.selection.is_active():
+            return self._convert_selected(session_dirs, output_path)
         
         success = True
         for i, session_dir in enumerate(session_dirs, 1):
@@ -213,9 +1143,8 @@ class Realsense:
                 print(f"  BAG 파일을 찾을 수 없습니다.")
                 continue
                 
-            bag_file = str(bag_files[0])
-            if not self.unit(bag_file, str(output_path)):
-                print(f"  변환 실패: {bag_file}")
+            if not self.unit_session(str(session_dir), str(output_path)):
+                print(f"  변환 실패: {session_dir}")
                 success = False
         
         # 모든 변환 완료 후 CSV 인덱스 업데이트
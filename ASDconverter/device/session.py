@@ -0,0 +1,6 @@
+def find_session_dirs(input_path, device):
+    """session_<번호>_<device> 폴더를 번호 순서로 (session_10이 session_2 뒤). 번호가 없으면 이름 순서로 맨 뒤"""
+    def key(path):
+        number = path.name.split('_')[1]
+        return (0, int(number), path.name) if number.isdigit() else (1, 0, path.name)
+    return sorted(input_path.glob(f"session_*_{device}"), key=key)
@@ -1,12 +1,25 @@
 import csv
 from pathlib import Path
 
+from ASDconverter.device.session import find_session_dirs
+from ASDconverter.timestamp.timestamp import Timestamp
+
 
 class Tobii:
     def __init__(self):
         self.csv_dir_name = "tobii/csv"
         self.csv_filename = "frames.csv"
 
+        # frame_timestamp 표기. 원본과 다른 형식이면 변환해서 기록
+        self.timestamp = Timestamp()
+        self.timestamp_column = "frame_timestamp"
+
+    def _clean_row(self, row):
+        clean_row = {k: v for k, v in row.items() if k is not None}
+        if self.timestamp_column in clean_row:
+            clean_row[self.timestamp_column] = self.timestamp.normalize(clean_row[self.timestamp_column])
+        return clean_row
+
     def _merge_csv_files(self, session_dirs, output_csv_path):
         all_rows = []
         fieldnames = None
@@ -22,8 +35,7 @@ class Tobii:
                     fieldnames = [field for field in reader.fieldnames if field is not None] # type: ignore
                 
                 for row in reader:
-                    clean_row = {k: v for k, v in row.items() if k is not None}
-                    all_rows.append(clean_row)
+                    all_rows.append(self._clean_row(row))
         
         # write merged csv
         if all_rows and fieldnames:
@@ -50,6 +62,39 @@ class Tobii:
             writer.writeheader()
             writer.writerows(rows)
 
+    def stream(self, input_dir, output_dir, publish):
+        """세션 CSV를 순서대로 읽어 병합 CSV에 기록하면서 행을 publish로 전달"""
+        input_path = Path(input_dir)
+        output_path = Path(output_dir)
+        (output_path / self.csv_dir_name).mkdir(parents=True, exist_ok=True)
+
+        session_dirs = find_session_dirs(input_path, "tobii")
+        output_csv_path = output_path / self.csv_dir_name / self.csv_filename
+
+        index = 0
+        writer = None
+        with open(output_csv_path, 'w', newline='') as out:
+            for session_dir in session_dirs:
+                csv_files = list(session_dir.glob("*.csv"))
+                if not csv_files:
+                    continue
+
+                with open(csv_files[0], 'r', newline='') as f:
+                    reader = csv.DictReader(f)
+                    if writer is None:
+                        fieldnames = [field for field in reader.fieldnames if field is not None] # type: ignore
+                        writer = csv.DictWriter(out, fieldnames=fieldnames)
+                        writer.writeheader()
+
+                    for row in reader:
+                        clean_row = self._clean_row(row)
+                        clean_row['index'] = index
+                        writer.writerow(clean_row)
+                        publish(clean_row)
+                        index += 1
+
+        return index > 0
+
     def convert(self, input_dir, output_dir):
         input_path = Path(input_dir)
         output_path = Path(output_dir)
@@ -57,7 +102,7 @@ class Tobii:
         print("Tobii 세션 폴더 검색 중...")
         (output_path / self.csv_dir_name).mkdir(parents=True, exist_ok=True)
         
-        session_dirs = sorted(input_path.glob("session_*_tobii"))
+        session_dirs = find_session_dirs(input_path, "tobii")
         if not session_dirs:
             print("Tobii 세션 폴더를 찾을 수 없습니다.")
             return False
@@ -1,6 +1,8 @@
 import csv
 from pathlib import Path
 
+from ASDconverter.timestamp.timestamp import Timestamp
+
 
 class Filter:
     def __init__(self):
@@ -15,6 +17,13 @@ class Filter:
         
         # 컬럼명
         self.timestamp_column = "frame_timestamp"
+        self.timestamp = Timestamp()
+
+        # 지정 시 선택 구간의 행만 다시 필터링해 기존 결과에 교체해 넣음
+        self.selection = None
+
+    def _is_selecting(self):
+        return self.selection is not None and self.selection.is_active()
 
     def _extract_valid_ranges(self, played_csv_file):
         """played CSV에서 유효한 재생 범위들 추출"""
@@ -30,12 +39,12 @@ class Filter:
         i = 0
         while i < len(rows):
             if rows[i]['type'] == 'play':
-                play_time = float(rows[i]['timestamp'])
+                play_time = self.timestamp.parse(rows[i]['timestamp'])
                 video_id = rows[i]['video_id']
                 
                 # 다음 행이 stop인지 확인
                 if i + 1 < len(rows) and rows[i + 1]['type'] == 'end':
-                    stop_time = float(rows[i + 1]['timestamp'])
+                    stop_time = self.timestamp.parse(rows[i + 1]['timestamp'])
                     valid_ranges.append({
                         'video_id': video_id,
                         'start': play_time,
@@ -54,7 +63,7 @@ class Filter:
     def _is_timestamp_valid(self, timestamp, valid_ranges):
         """타임스탬프가 유효한 범위 내에 있는지 확인"""
         try:
-            timestamp_float = float(timestamp)
+            timestamp_float = self.timestamp.parse(timestamp)
             for range_info in valid_ranges:
                 if range_info['start'] <= timestamp_float <= range_info['end']:
                     return True, range_info['video_id']
@@ -84,6 +93,9 @@ class Filter:
             
             for row in reader:
                 total_rows += 1
+                if self._is_selecting() and not self.selection.contains(row[self.timestamp_column]):
+                    continue
+
                 is_valid, video_id = self._is_timestamp_valid(row[self.timestamp_column], valid_ranges)
                 
                 if is_valid:
@@ -94,6 +106,12 @@ class Filter:
         print(f"  Valid rows: {len(filtered_rows)}")
         print(f"  Frames per video: {video_counts}")
         
+        # 선택 구간만 기존 결과에 교체
+        if self._is_selecting():
+            self.selection.splice_csv(output_file_path, filtered_rows, self.timestamp_column)
+            print(f"  Spliced into: {output_file_path}")
+            return len(filtered_rows)
+
         # 필터링된 결과 저장
         if filtered_rows:
             for i, row in enumerate(filtered_rows):
@@ -108,6 +126,36 @@ class Filter:
         
         return len(filtered_rows)
 
+    def filter_stream(self, source, publish, valid_ranges, output_file_path):
+        """큐에서 행을 받아 유효 범위 행만 기록하고 publish로 전달 (None을 받으면 종료)"""
+        total_rows = 0
+        count = 0
+        writer = None
+
+        output_file_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_file_path, 'w', newline='') as f:
+            while True:
+                row = source.get()
+                if row is None:
+                    break
+
+                total_rows += 1
+                is_valid, _ = self._is_timestamp_valid(row[self.timestamp_column], valid_ranges)
+                if not is_valid:
+                    continue
+
+                if writer is None:
+                    writer = csv.DictWriter(f, fieldnames=list(row.keys()))
+                    writer.writeheader()
+
+                row['index'] = count
+                writer.writerow(row)
+                publish(row)
+                count += 1
+
+        print(f"  {output_file_path.name}: {count} / {total_rows} rows")
+        return count
+
     def filter_frames(self, output_dir):
         """모든 프레임 데이터를 played 기준으로 필터링"""
         print("프레임 필터링 시작...")
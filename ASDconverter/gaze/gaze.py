@@ -0,0 +1,222 @@
+import csv
+from pathlib import Path
+
+import numpy as np
+
+from ASDconverter.timestamp.timestamp import Timestamp
+
+
+class Gaze:
+    def __init__(self):
+        self.tobii_csv_path = "tobii/csv/frames.csv"
+        self.timestamp_column = "frame_timestamp"
+        self.timestamp = Timestamp()
+
+        # 양안 융합 그룹: (출력 이름, 값 컬럼 접미사, validity 컬럼 접미사)
+        self.groups = [
+            ('gaze', ['gaze_display_x', 'gaze_display_y', 'gaze_3d_x', 'gaze_3d_y', 'gaze_3d_z'], 'gaze_validity'),
+            ('gaze_origin', ['gaze_origin_x', 'gaze_origin_y', 'gaze_origin_z'], 'gaze_origin_validity'),
+            ('pupil', ['pupil_diameter'], 'pupil_validity'),
+        ]
+        self.output_prefix = "fused_"
+
+        # 이 시간(ms) 이하의 결측 구간만 보간 (짧은 깜빡임 등)
+        self.max_gap_ms = 75.0
+
+        # CSV를 읽고 다시 쓸 때 한 번에 다루는 행 수
+        self.chunk_rows = 100_000
+
+        self.valid_values = ['1', '1.0', 'true', 'valid']
+
+    ##
+    # Private
+
+    def _needed_columns(self):
+        """계산에 필요한 입력 컬럼 -> 변환 함수 (숫자형으로 바로 변환해 보관)"""
+        converters = {self.timestamp_column: self.timestamp.parse_array}
+        for _, suffixes, validity_suffix in self.groups:
+            for side in ('left', 'right'):
+                converters[f"{side}_{validity_suffix}"] = self._to_valid
+                for suffix in suffixes:
+                    converters[f"{side}_{suffix}"] = self._to_float
+        return converters
+
+    def _chunks(self, reader):
+        chunk = []
+        for row in reader:
+            chunk.append(row)
+            if len(chunk) >= self.chunk_rows:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _load_columns(self, csv_file):
+        """필요한 컬럼만 chunk 단위로 읽어 float/bool 배열로 (전체 문자열 표를 만들지 않음)"""
+        converters = self._needed_columns()
+        with open(csv_file, 'r', newline='') as f:
+            reader = csv.reader(f)
+            fieldnames = next(reader)
+            column = {name: i for i, name in enumerate(fieldnames)}
+            missing = [name for name in converters if name not in column]
+            if missing:
+                raise KeyError(f"Tobii CSV에 필요한 컬럼이 없습니다: {', '.join(missing)}")
+
+            parts = {name: [] for name in converters}
+            for chunk in self._chunks(reader):
+                for name, convert in converters.items():
+                    index = column[name]
+                    parts[name].append(convert(np.array([row[index] for row in chunk], dtype=str)))
+
+        columns = {
+            name: np.concatenate(chunks) if chunks else np.array([], dtype=bool if converters[name] == self._to_valid else np.float64)
+            for name, chunks in parts.items()
+        }
+        return fieldnames, columns
+
+    def _to_float(self, values):
+        """문자열 배열을 float 배열로 (빈 값/변환 불가 값은 NaN)"""
+        values = np.char.strip(values)
+        values = np.where(values == '', 'nan', values)
+        try:
+            return values.astype(np.float64)
+        except ValueError:
+            # 일부 값이 숫자가 아닌 경우에만 값 단위로 변환
+            result = np.full(values.shape, np.nan)
+            for i, value in enumerate(values):
+                try:
+                    result[i] = float(value)
+                except ValueError:
+                    pass
+            return result
+
+    def _to_valid(self, values):
+        return np.isin(np.char.lower(np.char.strip(values)), self.valid_values)
+
+    def _fuse(self, left, right, left_valid, right_valid):
+        """양안 평균, 한쪽만 유효하면 그 값, 둘 다 무효면 NaN"""
+        left_valid = left_valid & ~np.isnan(left)
+        right_valid = right_valid & ~np.isnan(right)
+        both = left_valid & right_valid
+        fused = np.where(left_valid, left, np.where(right_valid, right, np.nan))
+        fused[both] = (left[both] + right[both]) / 2
+        return fused
+
+    def _gap_fill_mask(self, timestamps, valid):
+        """앞뒤 유효 샘플 간격이 max_gap_ms 이하인 결측 샘플 마스크"""
+        n = len(valid)
+        index = np.arange(n)
+        prev_valid = np.maximum.accumulate(np.where(valid, index, -1))
+        next_valid = np.minimum.accumulate(np.where(valid, index, n)[::-1])[::-1]
+
+        bounded = ~valid & (prev_valid >= 0) & (next_valid < n)
+        gap = np.full(n, np.inf)
+        gap[bounded] = timestamps[next_valid[bounded]] - timestamps[prev_valid[bounded]]
+        return bounded & (gap <= self.max_gap_ms)
+
+    def _format(self, values):
+        formatted = np.char.mod('%.10g', np.nan_to_num(values))
+        formatted[np.isnan(values)] = ''
+        return formatted
+
+    def _process_columns(self, columns):
+        """숫자형 입력 컬럼으로 융합/보간 결과 계산 (값은 float, validity/interpolated는 bool)"""
+        timestamps = columns[self.timestamp_column]
+
+        # 보간은 시간 순서 기준
+        order = np.argsort(timestamps, kind='stable')
+        timestamps = timestamps[order]
+
+        outputs = {}
+        for group, suffixes, validity_suffix in self.groups:
+            left_valid = columns[f"left_{validity_suffix}"][order]
+            right_valid = columns[f"right_{validity_suffix}"][order]
+
+            fused = {}
+            group_valid = left_valid | right_valid
+            for suffix in suffixes:
+                left = columns[f"left_{suffix}"][order]
+                right = columns[f"right_{suffix}"][order]
+                fused[suffix] = self._fuse(left, right, left_valid, right_valid)
+                group_valid &= ~np.isnan(fused[suffix])
+
+            fill = self._gap_fill_mask(timestamps, group_valid)
+            if group_valid.any():
+                for suffix in suffixes:
+                    fused[suffix][fill] = np.interp(timestamps[fill], timestamps[group_valid], fused[suffix][group_valid])
+
+            for suffix in suffixes:
+                outputs[f"{self.output_prefix}{suffix}"] = fused[suffix]
+            outputs[f"{self.output_prefix}{group}_validity"] = group_valid | fill
+            outputs[f"{self.output_prefix}{group}_interpolated"] = fill
+
+            print(f"  {group}: valid {group_valid.sum():,} / {len(group_valid):,}, interpolated {fill.sum():,}")
+
+        # 원래 행 순서로 되돌림
+        inverse = np.empty_like(order)
+        inverse[order] = np.arange(len(order))
+        return {name: values[inverse] for name, values in outputs.items()}
+
+    def _format_chunk(self, outputs, start, end):
+        formatted = []
+        for name in self.output_columns():
+            values = outputs[name][start:end]
+            if values.dtype == bool:
+                formatted.append(values.astype(int).astype(str))
+            else:
+                formatted.append(self._format(values))
+        return formatted
+
+    def _rewrite(self, csv_file, fieldnames, outputs):
+        """원본 CSV를 chunk 단위로 다시 읽으며 결과 컬럼을 붙여 임시 파일에 쓴 뒤 교체"""
+        # 재실행 시 이전 결과 컬럼은 교체
+        columns = self.output_columns()
+        keep = [i for i, name in enumerate(fieldnames) if name not in columns]
+
+        tmp_file = csv_file.with_name(f".{csv_file.name}.tmp")
+        with open(csv_file, 'r', newline='') as src, open(tmp_file, 'w', newline='') as dst:
+            reader = csv.reader(src)
+            next(reader)
+            writer = csv.writer(dst)
+            writer.writerow([fieldnames[i] for i in keep] + columns)
+
+            start = 0
+            for chunk in self._chunks(reader):
+                end = start + len(chunk)
+                formatted = self._format_chunk(outputs, start, end)
+                writer.writerows(
+                    [row[i] for i in keep] + [values[j] for values in formatted]
+                    for j, row in enumerate(chunk)
+                )
+                start = end
+        tmp_file.replace(csv_file)
+
+    ##
+    # Public
+
+    def output_columns(self):
+        columns = []
+        for group, suffixes, _ in self.groups:
+            columns += [f"{self.output_prefix}{suffix}" for suffix in suffixes]
+            columns += [f"{self.output_prefix}{group}_validity", f"{self.output_prefix}{group}_interpolated"]
+        return columns
+
+    def process(self, output_dir):
+        """병합된 Tobii CSV에 양안 융합/결측 보간 컬럼 추가"""
+        print("Tobii 시선 전처리 시작...")
+        csv_file = Path(output_dir) / self.tobii_csv_path
+        if not csv_file.exists():
+            print(f"Tobii CSV 파일을 찾을 수 없습니다: {csv_file}")
+            return False
+
+        fieldnames, columns = self._load_columns(csv_file)
+        count = len(columns[self.timestamp_column])
+        print(f"  Tobii rows: {count:,}")
+
+        outputs = self._process_columns(columns) if count else {}
+        del columns
+
+        self._rewrite(csv_file, fieldnames, outputs)
+
+        print("Tobii 시선 전처리 완료")
+        return True
@@ -0,0 +1,239 @@
+import io
+import csv
+import json
+from pathlib import Path
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from ASDconverter.pack.reader import PackReader
+from ASDconverter.timestamp.timestamp import Timestamp
+
+
+# #
+# helper
+
+_pack_readers = {}
+
+def _pack_reader(output_dir):
+    """프로세스마다 출력 디렉토리별 PackReader를 한 번만 연다"""
+    if output_dir not in _pack_readers:
+        _pack_readers[output_dir] = PackReader().open(output_dir)
+    return _pack_readers[output_dir]
+
+def _load_sample(args):
+    """컬러 PNG와 깊이 bin 한 쌍을 디코딩 (프로세스 풀에서도 호출 가능)
+
+    파일 대신 (출력 디렉토리, pack 항목) 튜플이면 pack에서 읽는다.
+    """
+    rgb_file, depth_file, depth_shape = args
+
+    if isinstance(rgb_file, tuple):
+        rgb_file = io.BytesIO(_pack_reader(rgb_file[0]).read(rgb_file[1]))
+    with Image.open(rgb_file) as image:
+        rgb = np.asarray(image.convert("RGB"))
+
+    if isinstance(depth_file, tuple):
+        depth = np.frombuffer(_pack_reader(depth_file[0]).read(depth_file[1]), dtype=np.uint16)
+    else:
+        depth = np.fromfile(depth_file, dtype=np.uint16)
+    if depth.size != depth_shape[0] * depth_shape[1]:
+        raise ValueError(f"깊이 프레임 크기 불일치: {depth_file} ({depth.size} != {depth_shape[0]}x{depth_shape[1]})")
+
+    return rgb, depth.reshape(depth_shape)
+
+# #
+# class
+
+class Loader:
+    def __init__(self):
+        self.matched_csv_path = "frames.csv"
+        self.color_dir_name = "realsense/color"
+        self.depth_dir_name = "realsense/depth"
+        self.aligned_depth_dir_name = "realsense/depth_aligned"
+        self.meta_dir_name = "realsense/meta"
+
+        # True면 컬러 좌표계로 정렬된 깊이(aligned_depth_path) 사용
+        self.aligned_depth = False
+
+        self.gaze_columns = [
+            'left_gaze_display_x', 'left_gaze_display_y',
+            'left_gaze_3d_x', 'left_gaze_3d_y', 'left_gaze_3d_z',
+            'left_gaze_validity',
+            'left_gaze_origin_x', 'left_gaze_origin_y', 'left_gaze_origin_z',
+            'left_gaze_origin_validity',
+            'left_pupil_diameter', 'left_pupil_validity',
+            'right_gaze_display_x', 'right_gaze_display_y',
+            'right_gaze_3d_x', 'right_gaze_3d_y', 'right_gaze_3d_z',
+            'right_gaze_validity',
+            'right_gaze_origin_x', 'right_gaze_origin_y', 'right_gaze_origin_z',
+            'right_gaze_origin_validity',
+            'right_pupil_diameter', 'right_pupil_validity',
+        ]
+
+        self.batch_size = 32
+        self.shuffle = False
+        self.seed = None
+        self.video_ids = None       # 지정 시 해당 video_id 행만
+        self.matched_only = True    # Tobii 매칭이 없는 행(NO_MATCH) 제외
+        self.drop_last = False
+
+        self.executor = "thread"    # "thread" | "process"
+        self.workers = 8
+        self.prefetch = 2           # 미리 디코딩해 둘 batch 수
+
+        # (height, width). None이면 세션 메타데이터에서 읽는다. 깊이 bin에는 해상도 정보가 없어
+        # 메타데이터가 없거나 세션마다 다르면 추측하지 않고 오류
+        self.depth_shape = None
+
+        # pack 출력 읽기. None이면 pack 디렉토리가 있을 때 자동 사용
+        self.use_pack = None
+        self.pack_dir_name = "pack"
+
+        # realsense_timestamp 읽기 (ms 소수 / µs 정수 모두)
+        self.timestamp = Timestamp()
+
+    ##
+    # Private
+
+    def _to_float(self, value):
+        try:
+            return float(value)
+        except (ValueError, TypeError):
+            return np.nan
+
+    def _uses_pack(self, output_path):
+        if self.use_pack is None:
+            return any((output_path / self.pack_dir_name).glob("*.pack"))
+        return self.use_pack
+
+    def _open_text(self, output_path, relative_path):
+        """출력 파일이 디스크에 없으면 pack 항목에서 연다"""
+        path = output_path / relative_path
+        if path.exists() or not self._uses_pack(output_path):
+            return open(path, 'r', newline='')
+        data = _pack_reader(str(output_path)).read(Path(relative_path).as_posix())
+        return io.StringIO(data.decode('utf-8'), newline='')
+
+    def _load_rows(self, output_path):
+        """매칭 결과 CSV에서 조건에 맞는 행만 로드"""
+        video_ids = None if self.video_ids is None else {str(video_id) for video_id in self.video_ids}
+
+        rows = []
+        with self._open_text(output_path, self.matched_csv_path) as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                if self.matched_only and row['time_diff_ms'] == 'NO_MATCH':
+                    continue
+                if video_ids is not None and row['video_id'] not in video_ids:
+                    continue
+                rows.append(row)
+        return rows
+
+    def _order(self, count):
+        if not self.shuffle:
+            return np.arange(count)
+        return np.random.default_rng(self.seed).permutation(count)
+
+    def _meta_depth_shape(self, output_path):
+        """세션 메타데이터에 기록된 저장 깊이 해상도 (모든 세션이 같아야 함)"""
+        key = 'aligned_depth_output_shape' if self.aligned_depth else 'depth_output_shape'
+        shapes = set()
+        meta_files = [meta_file.relative_to(output_path) for meta_file in (output_path / self.meta_dir_name).glob("*.json")]
+        if not meta_files and self._uses_pack(output_path):
+            meta_files = _pack_reader(str(output_path)).keys(f"{self.meta_dir_name}/")
+
+        for meta_file in meta_files:
+            with self._open_text(output_path, meta_file) as f:
+                shape = json.load(f).get(key)
+            if shape:
+                shapes.add(tuple(shape))
+
+        if not shapes:
+            raise ValueError(
+                f"깊이 해상도를 알 수 없습니다: {output_path / self.meta_dir_name}에 {key}가 없습니다. "
+                "Loader.depth_shape를 지정하거나 RealSense 단계를 다시 실행하세요."
+            )
+        if len(shapes) > 1:
+            raise ValueError(f"세션마다 깊이 해상도가 다릅니다: {sorted(shapes)}. Loader.depth_shape를 지정하세요.")
+        return shapes.pop()
+
+    def _submit_batch(self, pool, output_path, rows, depth_shape):
+        color_dir = output_path / self.color_dir_name
+        if self.aligned_depth:
+            depth_dir, depth_column = output_path / self.aligned_depth_dir_name, 'aligned_depth_path'
+        else:
+            depth_dir, depth_column = output_path / self.depth_dir_name, 'depth_path'
+        if self._uses_pack(output_path):
+            # 항목 key는 출력 디렉토리 기준 상대 경로
+            futures = [
+                pool.submit(_load_sample, (
+                    (str(output_path), f"{color_dir.relative_to(output_path).as_posix()}/{row['rgb_path']}"),
+                    (str(output_path), f"{depth_dir.relative_to(output_path).as_posix()}/{row[depth_column]}"),
+                    depth_shape,
+                ))
+                for row in rows
+            ]
+        else:
+            futures = [
+                pool.submit(_load_sample, (color_dir / row['rgb_path'], depth_dir / row[depth_column], depth_shape))
+                for row in rows
+            ]
+        return rows, futures
+
+    def _collect_batch(self, rows, futures):
+        samples = [future.result() for future in futures]
+
+        gaze = np.array(
+            [[self._to_float(row.get(column)) for column in self.gaze_columns] for row in rows],
+            dtype=np.float32
+        )
+
+        return {
+            'index': np.array([int(row['index']) for row in rows], dtype=np.int64),
+            'video_id': [row['video_id'] for row in rows],
+            'realsense_timestamp': np.array([self.timestamp.parse(row['realsense_timestamp']) for row in rows], dtype=np.float64),
+            'time_diff_ms': np.array([self._to_float(row['time_diff_ms']) for row in rows], dtype=np.float32),
+            'rgb': np.stack([rgb for rgb, _ in samples]),
+            'depth': np.stack([depth for _, depth in samples]),
+            'gaze': gaze,
+        }
+
+    ##
+    # Public
+
+    def iter_batches(self, output_dir):
+        """변환 결과를 batch 단위로 반환
+
+        각 batch는 rgb (B, H, W, 3) uint8, depth (B, H, W) uint16,
+        gaze (B, len(gaze_columns)) float32 배열과 행 메타데이터를 담은 dict.
+        디코딩은 풀에서 수행되며 prefetch개 batch를 미리 요청해 둔다.
+        """
+        output_path = Path(output_dir)
+        rows = self._load_rows(output_path)
+        order = self._order(len(rows))
+
+        batches = [
+            [rows[i] for i in order[start:start + self.batch_size]]
+            for start in range(0, len(order), self.batch_size)
+        ]
+        if self.drop_last and batches and len(batches[-1]) < self.batch_size:
+            batches.pop()
+
+        depth_shape = self.depth_shape or self._meta_depth_shape(output_path)
+
+        pool_class = ProcessPoolExecutor if self.executor == "process" else ThreadPoolExecutor
+        with pool_class(max_workers=self.workers) as pool:
+            pending = deque()
+            next_batch = 0
+
+            while next_batch < len(batches) or pending:
+                # read-ahead: 소비 중인 batch 외에 prefetch개를 미리 디코딩
+                while next_batch < len(batches) and len(pending) <= self.prefetch:
+                    pending.append(self._submit_batch(pool, output_path, batches[next_batch], depth_shape))
+                    next_batch += 1
+
+                batch_rows, futures = pending.popleft()
+                yield self._collect_batch(batch_rows, futures)
@@ -1,6 +1,8 @@
 import csv
 from pathlib import Path
-import numpy as np
+
+from ASDconverter.matcher.stream import StreamMatcher
+from ASDconverter.timestamp.timestamp import Timestamp
 
 
 class Matcher:
@@ -10,8 +12,31 @@ class Matcher:
         
         self.matched_output_path = "frames.csv"
 
+        # "csv": 매칭된 두 행의 컬럼을 모두 기록
+        # "index": (rs_index, tb_index, time_diff, video_id) 배열만 기록. 컬럼은 MatchView로 조회
+        self.output_format = "csv"
+        self.index_output_path = "frames.npy"
+        self.index_dtype = [('rs_index', '<i4'), ('tb_index', '<i4'), ('time_diff', '<f4'), ('video_id', '<i4')]
+
         self.max_time_diff = 100.0
 
+        # "nearest": 가장 가까운 Tobii 샘플 1:1 매칭
+        # "interpolate": 모든 RealSense 타임스탬프에서 Tobii 값을 선형 보간
+        self.match_mode = "nearest"
+
+        # 시간축 빈 구간으로 나눈 구간별 병렬 매칭 프로세스 수 (1이면 순차)
+        self.workers = 1
+
+        # Gaze 전처리 단계 결과 컬럼. tobii CSV에 있으면 매칭 결과에 함께 기록
+        self.fused_column_prefix = "fused_"
+        self.tobii_extra_columns = []
+
+        # 지정 시 선택 구간과 겹치는 유효 재생 구간만 다시 매칭해 기존 결과에 교체해 넣음
+        self.selection = None
+
+        # 매칭 결과 타임스탬프 표기 (Timestamp.unit). 입력은 두 형식 모두 읽음
+        self.timestamp = Timestamp()
+
     def _load_csv_data(self, csv_file):
         """CSV 파일을 로드하고 타임스탬프 기준으로 정렬"""
         data = []
@@ -23,7 +48,7 @@ class Matcher:
                     # timestamp가 비어있으면 건너뜀
                     continue
                 try:
-                    row['frame_timestamp'] = float(ts)
+                    row['frame_timestamp'] = self.timestamp.parse(ts)
                 except ValueError:
                     # 변환 불가능한 값도 건너뜀
                     continue
@@ -86,6 +111,8 @@ class Matcher:
     def _match_frames(self, realsense_data, tobii_data, valid_ranges):
         """2-pass 매칭: 먼저 최적 매칭을 찾고, 충돌을 해결"""
         
+        self.tobii_extra_columns = self._tobii_extra_columns(tobii_data)
+
         # 1st Pass: 각 RS frame에 대해 최적 TB frame 찾기 (중복 허용)
         preliminary_matches = []
         
@@ -170,6 +197,218 @@ class Matcher:
         
         return matched_rows, match_count, unmatched_rs_count, unmatched_tb_count, total_time_diff
 
+    def _interpolate_frames(self, realsense_data, tobii_data, valid_ranges):
+        """RealSense 타임스탬프마다 앞뒤 Tobii 샘플을 선형 보간 (충돌 해결 없음)
+
+        앞뒤 샘플이 모두 max_time_diff 이내에 있을 때만 값을 만들고,
+        validity는 두 샘플 중 낮은 값(둘 다 유효해야 유효)을 따른다.
+        """
+        import numpy as np
+
+        self.tobii_extra_columns = self._tobii_extra_columns(tobii_data)
+
+        rs_ts = np.array([row['frame_timestamp'] for row in realsense_data], dtype=np.float64)
+        tb_ts = np.array([row['frame_timestamp'] for row in tobii_data], dtype=np.float64)
+
+        # 이전 샘플: rs 이하 중 마지막, 다음 샘플: 그 다음
+        prev_idx = np.searchsorted(tb_ts, rs_ts, side='right') - 1
+        next_idx = prev_idx + 1
+        has_prev = prev_idx >= 0
+        exact = has_prev & (tb_ts[np.maximum(prev_idx, 0)] == rs_ts)
+        next_idx = np.where(exact, prev_idx, next_idx)
+        has_next = next_idx < len(tb_ts)
+
+        prev_safe = np.clip(prev_idx, 0, max(len(tb_ts) - 1, 0))
+        next_safe = np.clip(next_idx, 0, max(len(tb_ts) - 1, 0))
+
+        matched = has_prev & has_next
+        if len(tb_ts):
+            matched &= (rs_ts - tb_ts[prev_safe] <= self.max_time_diff)
+            matched &= (tb_ts[next_safe] - rs_ts <= self.max_time_diff)
+
+            span = tb_ts[next_safe] - tb_ts[prev_safe]
+            weight = np.divide(rs_ts - tb_ts[prev_safe], span, out=np.zeros_like(rs_ts), where=span > 0)
+            time_diff = np.minimum(np.abs(rs_ts - tb_ts[prev_safe]), np.abs(tb_ts[next_safe] - rs_ts))
+
+        # 컬럼별 보간 값
+        columns = [column for column in (tobii_data[0] if tobii_data else {}) if column not in ('index', 'frame_timestamp')]
+        interpolated = {}
+        for column in columns:
+            raw = [row[column] for row in tobii_data]
+            values = np.array([self._parse_float(value) for value in raw], dtype=np.float64)
+            prev_values = values[prev_safe]
+            next_values = values[next_safe]
+
+            if column.endswith('_validity'):
+                result = np.minimum(prev_values, next_values)
+            elif column.endswith('_interpolated'):
+                result = np.maximum(prev_values, next_values)
+            else:
+                result = prev_values + weight * (next_values - prev_values)
+            interpolated[column] = result
+
+        matched_rows = []
+        total_time_diff = 0
+        used_tobii = set()
+
+        for rs_idx, rs_row in enumerate(realsense_data):
+            video_id = self._determine_video_id(rs_row['frame_timestamp'], valid_ranges)
+
+            if matched[rs_idx]:
+                tb_row = {'frame_timestamp': rs_ts[rs_idx]}
+                for column in columns:
+                    tb_row[column] = self._format_value(interpolated[column][rs_idx], column)
+                matched_row = self._create_matched_row(rs_row, tb_row, float(time_diff[rs_idx]), video_id)
+                total_time_diff += float(time_diff[rs_idx])
+                used_tobii.add(int(prev_idx[rs_idx]))
+                used_tobii.add(int(next_idx[rs_idx]))
+            else:
+                matched_row = self._create_matched_row(rs_row, None, float('inf'), video_id)
+
+            matched_rows.append(matched_row)
+
+        match_count = int(matched.sum())
+        unmatched_rs_count = len(realsense_data) - match_count
+        unmatched_tb_count = len(tobii_data) - len(used_tobii)
+
+        return matched_rows, match_count, unmatched_rs_count, unmatched_tb_count, total_time_diff
+
+    def _parse_float(self, value):
+        try:
+            return float(value)
+        except (ValueError, TypeError):
+            return float('nan')
+
+    def _format_value(self, value, column):
+        if value != value:  # NaN
+            return ''
+        if column.endswith('_validity') or column.endswith('_interpolated'):
+            return str(int(value))
+        return repr(float(value))
+
+    def _tobii_extra_columns(self, tobii_data):
+        return [
+            column for column in (tobii_data[0] if tobii_data else {})
+            if column.startswith(self.fused_column_prefix)
+        ]
+
+    def _split_by_gap(self, realsense_data, tobii_data):
+        """두 스트림을 합친 시간축을 max_time_diff보다 긴 빈 구간에서 나눔
+
+        빈 구간을 사이에 둔 두 프레임은 시간차가 max_time_diff를 넘어 서로 매칭될 수 없으므로
+        (nearest, interpolate 모두) 나뉜 구간은 독립적으로 매칭해도 순차 매칭과 결과가 같다.
+        유효 재생 구간 밖의 행도 시간 위치 그대로 이웃 구간과 함께 나뉜다.
+        """
+        parts = []
+        rs_start = tb_start = 0
+        i = j = 0
+        last_ts = None
+        while i < len(realsense_data) or j < len(tobii_data):
+            if j >= len(tobii_data) or (i < len(realsense_data) and realsense_data[i]['frame_timestamp'] <= tobii_data[j]['frame_timestamp']):
+                ts = realsense_data[i]['frame_timestamp']
+                advance_rs = True
+            else:
+                ts = tobii_data[j]['frame_timestamp']
+                advance_rs = False
+
+            if last_ts is not None and ts - last_ts > self.max_time_diff:
+                parts.append((realsense_data[rs_start:i], tobii_data[tb_start:j]))
+                rs_start, tb_start = i, j
+
+            if advance_rs:
+                i += 1
+            else:
+                j += 1
+            last_ts = ts
+
+        if last_ts is not None:
+            parts.append((realsense_data[rs_start:], tobii_data[tb_start:]))
+        return parts
+
+    def _pack_parts(self, parts):
+        """이웃한 독립 구간을 비슷한 크기의 작업으로 묶음 (worker당 약 4개)"""
+        total = sum(len(rs_part) + len(tb_part) for rs_part, tb_part in parts)
+        target = max(1, total // (self.workers * 4))
+
+        tasks = []
+        rs_task, tb_task = [], []
+        for rs_part, tb_part in parts:
+            rs_task += rs_part
+            tb_task += tb_part
+            if len(rs_task) + len(tb_task) >= target:
+                tasks.append((rs_task, tb_task))
+                rs_task, tb_task = [], []
+        if rs_task or tb_task:
+            tasks.append((rs_task, tb_task))
+        return tasks
+
+    def _match_range(self, args):
+        realsense_part, tobii_part, valid_ranges = args
+        return self._run_matching(realsense_part, tobii_part, valid_ranges)
+
+    def _match_frames_parallel(self, realsense_data, tobii_data, valid_ranges):
+        """시간축의 빈 구간에서 두 스트림을 나누어 구간별로 병렬 매칭
+
+        나뉜 구간 사이에는 매칭이 생기지 않으므로 구간별 결과를
+        시간 순서대로 이어붙이면 순차 매칭과 같다.
+        """
+        import multiprocessing as mp
+
+        self.tobii_extra_columns = self._tobii_extra_columns(tobii_data)
+        tasks = [
+            (rs_part, tb_part, valid_ranges)
+            for rs_part, tb_part in self._pack_parts(self._split_by_gap(realsense_data, tobii_data))
+        ]
+
+        print(f"Parallel matching: {len(tasks)} chunks, {self.workers} workers")
+        with mp.Pool(processes=self.workers) as pool:
+            results = iter(pool.map(self._match_range, [task for task in tasks if task[0] and task[1]]))
+
+        matched_rows = []
+        match_count = 0
+        unmatched_rs_count = 0
+        unmatched_tb_count = 0
+        total_time_diff = 0
+        for rs_part, tb_part, _ in tasks:
+            if rs_part and tb_part:
+                rows, matches, unmatched_rs, unmatched_tb, time_diff = next(results)
+            else:
+                # 한쪽 스트림만 있는 구간은 모두 매칭 없음 (Tobii 추가 컬럼은 전체 기준으로 유지)
+                rows = [
+                    self._create_matched_row(rs_row, None, float('inf'), self._determine_video_id(rs_row['frame_timestamp'], valid_ranges))
+                    for rs_row in rs_part
+                ]
+                matches, unmatched_rs, unmatched_tb, time_diff = 0, len(rs_part), len(tb_part), 0
+            matched_rows.extend(rows)
+            match_count += matches
+            unmatched_rs_count += unmatched_rs
+            unmatched_tb_count += unmatched_tb
+            total_time_diff += time_diff
+
+        return matched_rows, match_count, unmatched_rs_count, unmatched_tb_count, total_time_diff
+
+    def _print_range_statistics(self, matched_rows):
+        """video_id 구간별 매칭률과 시간차 통계"""
+        stats = {}
+        for row in matched_rows:
+            info = stats.setdefault(row['video_id'], {'frames': 0, 'time_diffs': []})
+            info['frames'] += 1
+            if row['time_diff_ms'] != 'NO_MATCH':
+                info['time_diffs'].append(float(row['time_diff_ms']))
+
+        print(f"\n{'video_id':>10} {'frames':>8} {'matched':>8} {'rate':>8} {'mean_ms':>9} {'max_ms':>9}")
+        for video_id, info in stats.items():
+            time_diffs = info['time_diffs']
+            mean_diff = sum(time_diffs) / len(time_diffs) if time_diffs else 0.0
+            max_diff = max(time_diffs) if time_diffs else 0.0
+            rate = len(time_diffs) / info['frames'] * 100
+            print(f"{str(video_id):>10} {info['frames']:>8,} {len(time_diffs):>8,} {rate:>7.2f}% {mean_diff:>9.3f} {max_diff:>9.3f}")
+
+    def _run_matching(self, realsense_data, tobii_data, valid_ranges):
+        if self.match_mode == "interpolate":
+            return self._interpolate_frames(realsense_data, tobii_data, valid_ranges)
+        return self._match_frames(realsense_data, tobii_data, valid_ranges)
+
     def match_frames_simple(self, realsense_csv: str, tobii_csv: str, output_csv: str | None = None, max_time_diff: float | None = None) -> bool:
         """
         played.csv의 valid range를 완전히 배제하고, 두 CSV 간 matching만 수행.
@@ -191,6 +430,10 @@ class Matcher:
                 print(f"Required file not found: {file}")
                 return False
 
+        if self.output_format == "index" and self.match_mode == "interpolate":
+            print("index 출력은 nearest 매칭에서만 지원합니다.")
+            return False
+
         print("=" * 60)
         print("LOADING DATA (NO VALID RANGES)")
         print("=" * 60)
@@ -209,7 +452,7 @@ class Matcher:
         print("=" * 60)
 
         matched_rows, match_count, unmatched_rs_count, unmatched_tb_count, total_time_diff = \
-            self._match_frames(realsense_data, tobii_data, valid_ranges)
+            self._run_matching(realsense_data, tobii_data, valid_ranges)
 
         print(f"\nMatching complete!")
         print(f"Successfully matched: {match_count:,}")
@@ -237,6 +480,14 @@ class Matcher:
 
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
+        if self.output_format == "index":
+            for row in matched_rows:
+                row['video_id'] = None
+            output_path = output_path.with_suffix(".npy")
+            nbytes = self._save_index(matched_rows, output_path)
+            print(f"\nMatch index saved to: {output_path} ({nbytes:,} bytes)")
+            return True
+
         # index 재정렬 후 저장
         for i, row in enumerate(matched_rows):
             row['index'] = i
@@ -262,11 +513,40 @@ class Matcher:
                 return range_info['video_id']
         return None
 
+    def _create_index_row(self, realsense_row, tobii_row, time_diff, video_id):
+        """filtered CSV 행 index만 담은 매칭 결과 (통계/정렬에 필요한 값만 함께 유지)"""
+        return {
+            'rs_index': int(realsense_row['index']),
+            'tb_index': int(tobii_row['index']) if tobii_row else -1,
+            'realsense_timestamp': realsense_row['frame_timestamp'],
+            'video_id': video_id,
+            'time_diff_ms': time_diff if time_diff != float('inf') else 'NO_MATCH',
+        }
+
+    def _save_index(self, matched_rows, output_file):
+        """매칭 결과를 구조화 배열(.npy)로 저장. 매칭 없음은 tb_index -1, video_id 없음은 -1"""
+        import numpy as np
+
+        index = np.empty(len(matched_rows), dtype=self.index_dtype)
+        index['rs_index'] = [row['rs_index'] for row in matched_rows]
+        index['tb_index'] = [row['tb_index'] for row in matched_rows]
+        index['time_diff'] = [
+            float('nan') if row['time_diff_ms'] == 'NO_MATCH' else row['time_diff_ms'] for row in matched_rows
+        ]
+        index['video_id'] = [-1 if row['video_id'] is None else int(row['video_id']) for row in matched_rows]
+
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        np.save(output_file, index)
+        return index.nbytes
+
     def _create_matched_row(self, realsense_row, tobii_row, time_diff, video_id):
         """매칭된 두 프레임을 하나의 row로 합치기"""
+        if self.output_format == "index":
+            return self._create_index_row(realsense_row, tobii_row, time_diff, video_id)
+
         matched_row = {
             'index': 0,
-            'tobii_timestamp': f"{float(tobii_row['frame_timestamp']):.14f}" if tobii_row else None,
+            'tobii_timestamp': self.timestamp.format(self.timestamp.parse(tobii_row['frame_timestamp'])) if tobii_row else None,
             'frame_hardware_timestamp': tobii_row['frame_hardware_timestamp'] if tobii_row else None,
             'left_gaze_display_x': tobii_row['left_gaze_display_x'] if tobii_row else None,
             'left_gaze_display_y': tobii_row['left_gaze_display_y'] if tobii_row else None,
@@ -292,12 +572,18 @@ class Matcher:
             'right_gaze_origin_validity': tobii_row['right_gaze_origin_validity'] if tobii_row else None,
             'right_pupil_diameter': tobii_row['right_pupil_diameter'] if tobii_row else None,
             'right_pupil_validity': tobii_row['right_pupil_validity'] if tobii_row else None,
-            'realsense_timestamp': f"{float(realsense_row['frame_timestamp']):.14f}",
+            'realsense_timestamp': self.timestamp.format(self.timestamp.parse(realsense_row['frame_timestamp'])),
             'rgb_path': realsense_row['color_file_path'],
             'depth_path': realsense_row['depth_file_path'],
             'video_id': video_id,
             'time_diff_ms': f"{time_diff:.3f}" if time_diff != float('inf') else 'NO_MATCH',
         }
+
+        if 'aligned_depth_file_path' in realsense_row:
+            matched_row['aligned_depth_path'] = realsense_row['aligned_depth_file_path']
+
+        for column in self.tobii_extra_columns:
+            matched_row[column] = tobii_row[column] if tobii_row else None
         
         return matched_row
 
@@ -312,11 +598,11 @@ class Matcher:
         i = 0
         while i < len(rows):
             if rows[i]['type'] == 'play' and rows[i].get('valid', 'True') == 'True':
-                play_time = float(rows[i]['timestamp'])
+                play_time = self.timestamp.parse(rows[i]['timestamp'])
                 video_id = rows[i]['video_id']
                 
                 if i + 1 < len(rows) and rows[i + 1]['type'] in ['end', 'pause']:
-                    stop_time = float(rows[i + 1]['timestamp'])
+                    stop_time = self.timestamp.parse(rows[i + 1]['timestamp'])
                     valid_ranges.append({
                         'video_id': video_id,
                         'start': play_time,
@@ -349,6 +635,10 @@ class Matcher:
         print("LOADING DATA")
         print("=" * 60)
         
+        if self.output_format == "index" and self.match_mode == "interpolate":
+            print("index 출력은 nearest 매칭에서만 지원합니다.")
+            return False
+
         # 유효 범위 및 데이터 로드
         valid_ranges = self._extract_valid_ranges(played_file)
         realsense_data = self._load_csv_data(realsense_file)
@@ -357,20 +647,38 @@ class Matcher:
         print(f"Realsense frames: {len(realsense_data):,}")
         print(f"Tobii frames: {len(tobii_data):,}")
         print(f"Valid video ranges: {len(valid_ranges)}")
+
+        selection = None
+        if self.output_format == "index" and self.selection is not None and self.selection.is_active():
+            # filtered CSV 교체로 행 index가 바뀌므로 index 출력은 전체를 다시 매칭
+            print("index 출력은 선택 구간 교체를 지원하지 않아 전체를 다시 매칭합니다.")
+        elif self.selection is not None and self.selection.is_active():
+            # 매칭은 유효 재생 구간 단위로 독립적이므로 겹치는 구간 전체를 다시 매칭
+            selection = self.selection.cover(valid_ranges)
+            realsense_data = [row for row in realsense_data if selection.contains(row['frame_timestamp'])]
+            tobii_data = [row for row in tobii_data if selection.contains(row['frame_timestamp'])]
+            print(f"Selected windows: {len(selection.windows)}")
+            print(f"Selected realsense frames: {len(realsense_data):,}")
+            print(f"Selected tobii frames: {len(tobii_data):,}")
         
         print("\n" + "=" * 60)
         print("GLOBAL OPTIMAL MATCHING")
         print("=" * 60)
         
         # 전역 최적 매칭 수행
-        matched_rows, match_count, unmatched_rs_count,unmatched_tb_count, total_time_diff = self._match_frames(realsense_data, tobii_data, valid_ranges)
+        matched_rows, match_count, unmatched_rs_count,unmatched_tb_count, total_time_diff = (
+            self._match_frames_parallel(realsense_data, tobii_data, valid_ranges)
+            if self.workers > 1 else
+            self._run_matching(realsense_data, tobii_data, valid_ranges)
+        )
         
         # 결과 통계
         print(f"\nMatching complete!")
         print(f"Successfully matched: {match_count:,}")
         print(f"Unmatched realsense frames: {unmatched_rs_count:,}")
         print(f"Unmatched tobii frames: {unmatched_tb_count:,}")
-        print(f"Match rate: {match_count/len(realsense_data)*100:.2f}%")
+        if realsense_data:
+            print(f"Match rate: {match_count/len(realsense_data)*100:.2f}%")
         
         if match_count > 0:
             avg_time_diff = total_time_diff / match_count
@@ -381,7 +689,25 @@ class Matcher:
             if time_diffs:
                 print(f"Min time difference: {min(time_diffs):.3f}ms")
                 print(f"Max time difference: {max(time_diffs):.3f}ms")
+
+        self._print_range_statistics(matched_rows)
         
+        if self.output_format == "index":
+            output_index_path = output_path / self.index_output_path
+            nbytes = self._save_index(matched_rows, output_index_path)
+            print(f"\nMatch index saved to: {output_index_path}")
+            print(f"Total rows: {len(matched_rows):,} ({nbytes:,} bytes)")
+            print("\n프레임 매칭 완료!")
+            return True
+
+        # 선택 구간만 기존 결과에 교체
+        if selection is not None:
+            output_csv_path = output_path / self.matched_output_path
+            selection.splice_csv(output_csv_path, matched_rows, 'realsense_timestamp')
+            print(f"\nSpliced {len(matched_rows):,} rows into: {output_csv_path}")
+            print("\n프레임 매칭 완료!")
+            return True
+
         # 결과 저장
         if matched_rows:
             output_csv_path = output_path / self.matched_output_path
@@ -405,21 +731,69 @@ class Matcher:
         print("\n프레임 매칭 완료!")
         return True
     
+    def _stream_rows(self, realsense_source, tobii_source, stream_matcher):
+        """두 큐 입력을 StreamMatcher에 넣고 확정된 매칭 행을 순서대로 반환
+
+        Tobii는 StreamMatcher가 받을 수 있을 때(RealSense watermark + max_time_diff 이내)만
+        읽는다. 나머지는 크기 제한 큐에 남아 Tobii 생산자를 멈추게 하므로 버퍼가 스트림
+        전체로 커지지 않는다. 각 스트림의 끝은 None으로 알린다.
+        """
+        realsense_open = tobii_open = True
+        while realsense_open or tobii_open:
+            if tobii_open and (not realsense_open or stream_matcher.accepts_tobii()):
+                row = tobii_source.get()
+                if row is None:
+                    tobii_open = False
+                    rows = stream_matcher.close_tobii()
+                else:
+                    rows = stream_matcher.push_tobii(row)
+            else:
+                row = realsense_source.get()
+                if row is None:
+                    realsense_open = False
+                    rows = stream_matcher.close_realsense()
+                else:
+                    rows = stream_matcher.push_realsense(row)
+
+            yield from rows
+
+    def match_stream(self, realsense_source, tobii_source, output_dir, valid_ranges):
+        """RealSense/Tobii 큐에서 행을 받아 확정되는 대로 매칭 결과 기록
+
+        각 스트림의 끝은 None으로 알린다.
+        """
+        print("스트리밍 프레임 매칭 시작...")
+        stream_matcher = StreamMatcher(self, valid_ranges)
+
+        if self.output_format == "index":
+            output_csv_path = Path(output_dir) / self.index_output_path
+            self._save_index(list(self._stream_rows(realsense_source, tobii_source, stream_matcher)), output_csv_path)
+        else:
+            output_csv_path = Path(output_dir) / self.matched_output_path
+            output_csv_path.parent.mkdir(parents=True, exist_ok=True)
+
+            writer = None
+            with open(output_csv_path, 'w', newline='') as f:
+                for index, matched_row in enumerate(self._stream_rows(realsense_source, tobii_source, stream_matcher)):
+                    if writer is None:
+                        writer = csv.DictWriter(f, fieldnames=list(matched_row.keys()))
+                        writer.writeheader()
+                    matched_row['index'] = index
+                    writer.writerow(matched_row)
+
+        print(f"\nMatching complete!")
+        print(f"Successfully matched: {stream_matcher.match_count:,}")
+        print(f"Unmatched realsense frames: {stream_matcher.realsense_count - stream_matcher.match_count:,}")
+        if stream_matcher.realsense_count:
+            print(f"Match rate: {stream_matcher.match_count/stream_matcher.realsense_count*100:.2f}%")
+        if stream_matcher.match_count:
+            print(f"Average time difference: {stream_matcher.total_time_diff/stream_matcher.match_count:.3f}ms")
+        print(f"Matched data saved to: {output_csv_path}")
+        return True
+    
 if __name__ == "__main__":
-    import argparse
-
-    parser = argparse.ArgumentParser(description="Realsense–Tobii frame matching (valid ranges disabled).")
-    parser.add_argument("--realsense", required=True, help="Realsense filtered CSV path")
-    parser.add_argument("--tobii", required=True, help="Tobii filtered CSV path")
-    parser.add_argument("--out", default=None, help="Output CSV file path (or directory). Default: frames.csv")
-    parser.add_argument("--max-diff", type=float, default=None, help="Max time diff in ms (override).")
-
-    args = parser.parse_args()
-
-    matcher = Matcher()
-    matcher.match_frames_simple(
-        realsense_csv=args.realsense,
-        tobii_csv=args.tobii,
-        output_csv=args.out,
-        max_time_diff=args.__dict__.get("max_diff")
-    )
+    # CLI는 ASDconverter.converter의 match 하위 명령으로 통합
+    import sys
+    from ASDconverter.converter import main
+
+    main(["match", *sys.argv[1:]])
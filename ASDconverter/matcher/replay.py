@@ -0,0 +1,152 @@
+import csv
+import time
+import heapq
+from pathlib import Path
+
+from ASDconverter.matcher.matcher import Matcher
+from ASDconverter.matcher.stream import StreamMatcher
+
+
+class Replay:
+    """녹화 중 실시간 매칭 모니터링의 대용 실행기
+
+    RealSense(CSV 또는 bag)와 Tobii CSV를 타임스탬프 순서로 섞어 도착하는 것처럼
+    StreamMatcher에 넣고, 확정된 행과 누적 통계를 바로 내보낸다.
+    """
+
+    def __init__(self):
+        self.matcher = Matcher()
+
+        # 1.0이면 기록 시각 간격대로 재생, 0이면 최대 속도
+        self.speed = 0.0
+
+        # 스트림 시각 기준 통계 출력 주기 (ms)
+        self.report_interval = 5000.0
+
+    ##
+    # Private
+
+    def _csv_rows(self, csv_file):
+        with open(csv_file, 'r', newline='') as f:
+            for row in csv.DictReader(f):
+                if row.get('frame_timestamp', '').strip():
+                    yield row
+
+    def _bag_rows(self, bag_path):
+        """bag을 재생하며 frames.csv와 같은 행을 만든다 (프레임 파일은 기록하지 않음)"""
+        from ASDconverter.device.realsense import Realsense
+
+        realsense = Realsense()
+        realsense.timestamp = self.matcher.timestamp
+        pipeline, playback = realsense._start_playback(bag_path)
+        index = 0
+        try:
+            while True:
+                try:
+                    frames = pipeline.wait_for_frames()
+                except RuntimeError:
+                    break
+                color_frame = frames.get_color_frame()
+                depth_frame = frames.get_depth_frame()
+                if color_frame and depth_frame:
+                    row = realsense._frame_row(frames, color_frame, depth_frame, Path(bag_path).parent.name)
+                    row['index'] = index
+                    index += 1
+                    yield row
+        finally:
+            pipeline.stop()
+
+    def _events(self, realsense_rows, tobii_rows):
+        return heapq.merge(
+            (('realsense', row) for row in realsense_rows),
+            (('tobii', row) for row in tobii_rows),
+            key=lambda event: self.matcher.timestamp.parse(event[1]['frame_timestamp'])
+        )
+
+    def _pace(self, timestamp, started):
+        """speed > 0이면 첫 이벤트 기준 기록 시각에 맞춰 대기"""
+        if self.speed <= 0:
+            return started
+        if started is None:
+            return (time.monotonic(), timestamp)
+        wall_start, stream_start = started
+        delay = (timestamp - stream_start) / 1000 / self.speed - (time.monotonic() - wall_start)
+        if delay > 0:
+            time.sleep(delay)
+        return started
+
+    def _report(self, stream_matcher):
+        stats = stream_matcher.statistics()
+        print(
+            f"  frames {stats['realsense']:,} | matched {stats['matched']:,} ({stats['match_rate']:.2f}%)"
+            f" | diff {stats['mean_time_diff_ms']:.3f}ms"
+            f" | latency mean {stats['mean_latency_ms']:.1f}ms max {stats['max_latency_ms']:.1f}ms"
+            f" | state rs {stats['pending_realsense']} tb {stats['buffered_tobii']}"
+        )
+
+    def _run(self, realsense_rows, tobii_rows, valid_ranges, output_csv):
+        stream_matcher = StreamMatcher(self.matcher, valid_ranges)
+        writer = None
+        index = 0
+        started = None
+        next_report = None
+
+        f = open(output_csv, 'w', newline='') if output_csv else None
+        try:
+            def emit(rows):
+                nonlocal writer, index
+                for matched_row in rows:
+                    if f is not None:
+                        if writer is None:
+                            writer = csv.DictWriter(f, fieldnames=list(matched_row.keys()))
+                            writer.writeheader()
+                        matched_row['index'] = index
+                        writer.writerow(matched_row)
+                    index += 1
+
+            for name, row in self._events(realsense_rows, tobii_rows):
+                timestamp = self.matcher.timestamp.parse(row['frame_timestamp'])
+                started = self._pace(timestamp, started)
+
+                # 섞인 순서상 두 스트림 모두 이 시각 이전 프레임은 더 오지 않는다
+                emit(stream_matcher.advance_to(timestamp))
+                emit(stream_matcher.push(name, row))
+
+                if next_report is None:
+                    next_report = timestamp + self.report_interval
+                elif timestamp >= next_report:
+                    self._report(stream_matcher)
+                    next_report = timestamp + self.report_interval
+
+            emit(stream_matcher.close())
+        finally:
+            if f is not None:
+                f.close()
+
+        print("Replay complete!")
+        self._report(stream_matcher)
+        for video_id, (frames, matched) in stream_matcher.statistics()['videos'].items():
+            print(f"  video {video_id}: {matched:,} / {frames:,}")
+        return stream_matcher.statistics()
+
+    def _valid_ranges(self, played_csv):
+        return self.matcher._extract_valid_ranges(played_csv) if played_csv else []
+
+    ##
+    # Public
+
+    def replay_csv(self, realsense_csv, tobii_csv, played_csv=None, output_csv=None):
+        """frames/filtered CSV를 녹화 순서대로 재생"""
+        print(f"CSV 재생: {realsense_csv} + {tobii_csv}")
+        return self._run(
+            self._csv_rows(realsense_csv), self._csv_rows(tobii_csv),
+            self._valid_ranges(played_csv), output_csv
+        )
+
+    def replay_bag(self, bag_path, tobii_csv, played_csv=None, output_csv=None):
+        """bag을 재생하며 Tobii CSV와 매칭"""
+        print(f"bag 재생: {bag_path} + {tobii_csv}")
+        return self._run(
+            self._bag_rows(bag_path), self._csv_rows(tobii_csv),
+            self._valid_ranges(played_csv), output_csv
+        )
@@ -0,0 +1,238 @@
+from bisect import bisect_left
+
+
+class StreamMatcher:
+    """타임스탬프 순서로 도착하는 RealSense/Tobii 행을 점진적으로 매칭
+
+    Matcher._match_frames와 같은 규칙(이진 탐색 중심 ±5 후보 중 최근접,
+    같은 Tobii 프레임을 원하는 RealSense 중 가장 가까운 것 선택)을 따르되,
+    결과가 더 이상 바뀔 수 없게 된 행부터 RealSense 순서대로 내보낸다.
+
+    - RealSense 프레임의 후보 결정: Tobii watermark가 ts + max_time_diff를 넘으면
+    - Tobii 프레임의 소유자 확정: 아직 후보가 정해지지 않은 RealSense 중 가장
+      이른 것이 ts + max_time_diff를 넘으면
+    두 스트림 모두 타임스탬프 오름차순이어야 한다.
+
+    유지하는 상태는 두 스트림 사이의 max_time_diff 구간뿐이며, 행이 확정될 때까지의
+    지연(스트림 시각 기준)과 매칭률 등은 statistics()로 언제든 조회할 수 있다.
+    """
+
+    def __init__(self, matcher, valid_ranges):
+        self.matcher = matcher
+        self.valid_ranges = valid_ranges
+        self.max_time_diff = matcher.max_time_diff
+        self.search_range = 5
+
+        # Tobii 버퍼 (후보가 될 수 있는 구간만 유지)
+        self._tobii = []
+        self._tobii_ts = []
+        self._tobii_count = 0
+        self._last_tobii_ts = None
+        self._last_dropped_tobii = None
+        self._tobii_closed = False
+
+        # 출력 대기 중인 RealSense (순서 유지), 그 중 후보 미결정 구간의 시작 위치
+        self._pending = []
+        self._undecided = 0
+        self._last_realsense_ts = None
+        self._realsense_closed = False
+
+        # advance_to()로 알려진 시각. 두 스트림 모두 이보다 이른 프레임은 더 오지 않는다
+        self._clock = float('-inf')
+
+        self.realsense_count = 0
+        self.match_count = 0
+        self.total_time_diff = 0.0
+
+        # 확정 지연: 행을 내보낸 시점의 스트림 시각 - RealSense 타임스탬프 (ms)
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.video_counts = {}      # video_id -> [frames, matched]
+
+    ##
+    # Private
+
+    def _check_order(self, timestamp, last_timestamp, name):
+        if last_timestamp is not None and timestamp < last_timestamp:
+            raise ValueError(f"{name} 스트림이 타임스탬프 오름차순이 아닙니다: {timestamp} < {last_timestamp}")
+        if timestamp < self._clock:
+            raise ValueError(f"{name} 프레임이 advance_to 시각보다 이릅니다: {timestamp} < {self._clock}")
+
+    def _tobii_watermark(self):
+        if self._tobii_closed:
+            return float('inf')
+        return max(self._tobii_ts[-1] if self._tobii_ts else float('-inf'), self._clock)
+
+    def _realsense_frontier(self):
+        """앞으로 후보를 정할 RealSense 타임스탬프의 하한"""
+        if self._undecided < len(self._pending):
+            return self._pending[self._undecided]['ts']
+        if self._realsense_closed:
+            return float('inf')
+        return max(self._last_realsense_ts if self._last_realsense_ts is not None else float('-inf'), self._clock)
+
+    def _decide(self, rs):
+        """1st pass: 후보 Tobii 선택 후 2nd pass 충돌 해결 상태 갱신"""
+        pos = bisect_left(self._tobii_ts, rs['ts']) - 1
+        if pos >= 0:
+            center_idx = self._tobii[pos]['idx']
+        elif self._last_dropped_tobii is not None:
+            center_idx = self._last_dropped_tobii
+        else:
+            center_idx = 0
+
+        first_idx = self._tobii[0]['idx'] if self._tobii else self._tobii_count
+        start_idx = max(first_idx, center_idx - self.search_range)
+        end_idx = min(self._tobii_count, center_idx + self.search_range + 1)
+
+        best_tb = None
+        best_diff = float('inf')
+        for tb_idx in range(start_idx, end_idx):
+            tb = self._tobii[tb_idx - first_idx]
+            time_diff = abs(tb['ts'] - rs['ts'])
+            if time_diff < best_diff and time_diff <= self.max_time_diff:
+                best_diff = time_diff
+                best_tb = tb
+
+        rs['tb'] = best_tb
+        rs['diff'] = best_diff
+
+        if best_tb is not None and (best_tb['owner'] is None or best_diff < best_tb['owner_diff']):
+            best_tb['owner'] = rs
+            best_tb['owner_diff'] = best_diff
+
+    def _is_final(self, rs):
+        if rs['tb'] is None:
+            return True
+        return rs['tb']['ts'] + self.max_time_diff < self._realsense_frontier()
+
+    def _stream_time(self):
+        """지금까지 도착한 가장 늦은 타임스탬프"""
+        times = [ts for ts in (self._last_realsense_ts, self._last_tobii_ts) if ts is not None]
+        return max(times) if times else None
+
+    def _finalize(self, rs):
+        video_id = self.matcher._determine_video_id(rs['ts'], self.valid_ranges)
+        tb = rs['tb']
+        matched = tb is not None and tb['owner'] is rs
+
+        self.realsense_count += 1
+        latency = max(0.0, self._stream_time() - rs['ts'])
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        counts = self.video_counts.setdefault(video_id, [0, 0])
+        counts[0] += 1
+
+        if matched:
+            self.match_count += 1
+            self.total_time_diff += rs['diff']
+            counts[1] += 1
+            return self.matcher._create_matched_row(rs['row'], tb['row'], rs['diff'], video_id)
+        return self.matcher._create_matched_row(rs['row'], None, float('inf'), video_id)
+
+    def _prune(self):
+        """앞으로 어떤 RealSense의 후보도 될 수 없는 Tobii 제거"""
+        bound = self._realsense_frontier() - self.max_time_diff
+        drop = bisect_left(self._tobii_ts, bound)
+        if drop > 0:
+            self._last_dropped_tobii = self._tobii[drop - 1]['idx']
+            del self._tobii[:drop]
+            del self._tobii_ts[:drop]
+
+    def _advance(self):
+        watermark = self._tobii_watermark()
+        while self._undecided < len(self._pending) and self._pending[self._undecided]['ts'] + self.max_time_diff < watermark:
+            self._decide(self._pending[self._undecided])
+            self._undecided += 1
+
+        emitted = 0
+        while emitted < self._undecided and self._is_final(self._pending[emitted]):
+            emitted += 1
+
+        rows = [self._finalize(rs) for rs in self._pending[:emitted]]
+        del self._pending[:emitted]
+        self._undecided -= emitted
+
+        self._prune()
+        return rows
+
+    ##
+    # Public
+
+    def push_realsense(self, row):
+        """RealSense 행 추가. 확정된 매칭 행 목록 반환"""
+        timestamp = self.matcher.timestamp.parse(row['frame_timestamp'])
+        self._check_order(timestamp, self._last_realsense_ts, "RealSense")
+        self._last_realsense_ts = timestamp
+
+        row = dict(row, frame_timestamp=timestamp)
+        self._pending.append({'row': row, 'ts': timestamp, 'tb': None, 'diff': float('inf')})
+        return self._advance()
+
+    def push_tobii(self, row):
+        """Tobii 행 추가. 확정된 매칭 행 목록 반환"""
+        timestamp = self.matcher.timestamp.parse(row['frame_timestamp'])
+        self._check_order(timestamp, self._last_tobii_ts, "Tobii")
+        self._last_tobii_ts = timestamp
+
+        if self._tobii_count == 0:
+            self.matcher.tobii_extra_columns = [
+                column for column in row if column.startswith(self.matcher.fused_column_prefix)
+            ]
+
+        row = dict(row, frame_timestamp=timestamp)
+        self._tobii.append({'idx': self._tobii_count, 'row': row, 'ts': timestamp, 'owner': None, 'owner_diff': float('inf')})
+        self._tobii_ts.append(timestamp)
+        self._tobii_count += 1
+        return self._advance()
+
+    def accepts_tobii(self):
+        """Tobii 행을 더 받아도 되는지 (마지막 Tobii가 RealSense watermark + max_time_diff 이내)
+
+        그보다 앞선 Tobii는 아직 어떤 RealSense의 후보인지 알 수 없어 버퍼에 쌓이기만 하므로,
+        호출한 쪽은 RealSense를 먼저 넣는다. 두 스트림이 끝날 때까지 Tobii 버퍼는
+        RealSense 주변 2 * max_time_diff 구간으로 유지된다.
+        """
+        if self._last_tobii_ts is None or self._realsense_closed:
+            return True
+        watermark = max(self._last_realsense_ts if self._last_realsense_ts is not None else float('-inf'), self._clock)
+        return self._last_tobii_ts <= watermark + self.max_time_diff
+
+    def push(self, name, row):
+        """('realsense' | 'tobii', row) 입력. 확정된 매칭 행 목록 반환"""
+        return self.push_realsense(row) if name == 'realsense' else self.push_tobii(row)
+
+    def advance_to(self, timestamp):
+        """두 스트림 모두 timestamp 이전 프레임이 더 오지 않음을 알림
+
+        실시간 시계나 재생 순서로 이를 보장할 수 있으면, 한쪽 스트림이 멈춘 구간에서도
+        행이 max_time_diff 이내 지연으로 확정된다.
+        """
+        self._clock = max(self._clock, timestamp)
+        return self._advance()
+
+    def close_realsense(self):
+        self._realsense_closed = True
+        return self._advance()
+
+    def close_tobii(self):
+        self._tobii_closed = True
+        return self._advance()
+
+    def close(self):
+        """두 스트림을 모두 닫고 남은 행을 확정"""
+        return self.close_realsense() + self.close_tobii()
+
+    def statistics(self):
+        """지금까지 확정된 행 기준 누적 통계와 현재 유지 중인 상태 크기"""
+        return {
+            'realsense': self.realsense_count,
+            'matched': self.match_count,
+            'match_rate': self.match_count / self.realsense_count * 100 if self.realsense_count else 0.0,
+            'mean_time_diff_ms': self.total_time_diff / self.match_count if self.match_count else 0.0,
+            'mean_latency_ms': self.total_latency / self.realsense_count if self.realsense_count else 0.0,
+            'max_latency_ms': self.max_latency,
+            'pending_realsense': len(self._pending),
+            'buffered_tobii': len(self._tobii),
+            'videos': {video_id: tuple(counts) for video_id, counts in self.video_counts.items()},
+        }
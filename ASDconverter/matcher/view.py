@@ -0,0 +1,154 @@
+import csv
+from pathlib import Path
+
+import numpy as np
+
+from ASDconverter.timestamp.timestamp import Timestamp
+
+
+class MatchView:
+    """index 출력(frames.npy)과 filtered CSV를 join해 필요한 컬럼만 만드는 view
+
+    컬럼은 처음 요청될 때 원본 CSV에서 그 컬럼만 읽어 매칭 순서로 정렬해 두고,
+    이후 요청은 캐시를 사용한다. 매칭 없는 행의 Tobii 컬럼은 빈 문자열(float이면 NaN).
+    """
+
+    def __init__(self):
+        self.index_path = "frames.npy"
+        self.realsense_csv_path = "realsense/csv/filtered.csv"
+        self.tobii_csv_path = "tobii/csv/filtered.csv"
+
+        # 기존 frames.csv 컬럼 이름 -> (원본, 원본 컬럼)
+        self.aliases = {
+            'realsense_timestamp': ('realsense', 'frame_timestamp'),
+            'rgb_path': ('realsense', 'color_file_path'),
+            'depth_path': ('realsense', 'depth_file_path'),
+            'aligned_depth_path': ('realsense', 'aligned_depth_file_path'),
+            'tobii_timestamp': ('tobii', 'frame_timestamp'),
+        }
+
+        # float로 조회하면 ms로 변환하는 원본 컬럼 (µs 정수 표기도 읽음)
+        self.timestamp_columns = {'frame_timestamp', 'color_timestamp', 'depth_timestamp'}
+        self.timestamp = Timestamp()
+
+        self.output_path = None
+        self.index = None
+        self._headers = {}
+        self._columns = {}
+
+    ##
+    # Private
+
+    def _source_file(self, source):
+        return self.output_path / (self.realsense_csv_path if source == 'realsense' else self.tobii_csv_path)
+
+    def _header(self, source):
+        if source not in self._headers:
+            with open(self._source_file(source), 'r', newline='') as f:
+                self._headers[source] = next(csv.reader(f))
+        return self._headers[source]
+
+    def _resolve(self, name):
+        """컬럼 이름 -> (원본, 원본 컬럼). 'realsense.x' / 'tobii.x' 로 원본을 지정할 수 있다"""
+        if name in self.aliases:
+            return self.aliases[name]
+        if '.' in name:
+            source, column = name.split('.', 1)
+            if source in ('realsense', 'tobii') and column in self._header(source):
+                return source, column
+        for source in ('realsense', 'tobii'):
+            if name in self._header(source):
+                return source, name
+        raise KeyError(f"알 수 없는 컬럼입니다: {name}")
+
+    def _load(self, source, columns):
+        """원본 CSV를 한 번 읽어 요청된 컬럼들을 행 index 순서 배열로 캐시"""
+        header = self._header(source)
+        positions = [header.index(column) for column in columns]
+        index_position = header.index('index')
+
+        with open(self._source_file(source), 'r', newline='') as f:
+            reader = csv.reader(f)
+            next(reader)
+            rows = [(int(row[index_position]), [row[p] for p in positions]) for row in reader]
+
+        size = max((row_index for row_index, _ in rows), default=-1) + 1
+        for i, column in enumerate(columns):
+            values = np.full(size, '', dtype=object)
+            for row_index, row_values in rows:
+                values[row_index] = row_values[i]
+            self._columns[(source, column)] = values
+
+    def _source_values(self, source, column):
+        key = (source, column)
+        if key not in self._columns:
+            self._load(source, [column])
+        return self._columns[key]
+
+    def _join(self, source, column):
+        values = self._source_values(source, column)
+        if source == 'realsense':
+            return values[self.index['rs_index']]
+
+        tb_index = self.index['tb_index']
+        joined = np.full(len(tb_index), '', dtype=object)
+        matched = tb_index >= 0
+        joined[matched] = values[tb_index[matched]]
+        return joined
+
+    ##
+    # Public
+
+    def open(self, output_dir):
+        output_path = Path(output_dir)
+        self.output_path = output_path
+        self.index = np.load(output_path / self.index_path, mmap_mode='r')
+        self._headers = {}
+        self._columns = {}
+        return self
+
+    def __len__(self):
+        return 0 if self.index is None else len(self.index)
+
+    def column(self, name, dtype=None):
+        """매칭 순서의 컬럼 배열. dtype=float이면 빈 값은 NaN"""
+        if name in self.index.dtype.names:
+            return np.asarray(self.index[name])
+        if name == 'time_diff_ms':
+            return np.asarray(self.index['time_diff'])
+
+        source, column = self._resolve(name)
+        values = self._join(source, column)
+        if dtype is None:
+            return values
+        if np.issubdtype(np.dtype(dtype), np.floating) and column in self.timestamp_columns:
+            return self.timestamp.parse_array(values).astype(dtype)
+        if np.issubdtype(np.dtype(dtype), np.floating):
+            values = np.where(values == '', 'nan', values)
+        return values.astype(dtype)
+
+    def materialize(self, columns, dtypes=None):
+        """여러 컬럼을 한 번에 조회. 같은 원본 CSV의 미적재 컬럼은 한 번의 읽기로 적재"""
+        dtypes = dtypes or {}
+        pending = {}
+        for name in columns:
+            if name in self.index.dtype.names or name == 'time_diff_ms':
+                continue
+            source, column = self._resolve(name)
+            if (source, column) not in self._columns:
+                pending.setdefault(source, []).append(column)
+
+        for source, source_columns in pending.items():
+            self._load(source, list(dict.fromkeys(source_columns)))
+
+        return {name: self.column(name, dtypes.get(name)) for name in columns}
+
+    def write_csv(self, output_csv, columns):
+        """선택한 컬럼만으로 기존 형식의 매칭 CSV 작성"""
+        values = self.materialize(columns)
+        with open(output_csv, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['index'] + list(columns))
+            for i in range(len(self)):
+                writer.writerow([i] + [values[name][i] for name in columns])
+        return len(self)
@@ -0,0 +1,162 @@
+import os
+import json
+from pathlib import Path
+
+from ASDconverter.pack.reader import PackReader
+
+
+class Packer:
+    """변환 결과(프레임 파일, CSV, 메타데이터)를 큰 append-only pack 파일 몇 개로 묶음
+
+    항목을 순서대로 이어 쓰고 마지막에 footer index를 붙인다. pack 하나가
+    max_pack_bytes를 넘으면 다음 pack 파일을 시작한다. 다시 실행하면 기존 pack은
+    그대로 두고 새로 생기거나 내용이 바뀐 파일만 다음 번호의 pack에 추가한다
+    (같은 항목은 번호가 큰 pack이 우선, PackReader).
+    """
+
+    def __init__(self):
+        self.pack_dir_name = "pack"
+        self.pack_file_pattern = "{pack:03d}.pack"
+        self.max_pack_bytes = 4 * 1024 ** 3
+
+        # pack에 넣을 디렉토리/파일 (출력 디렉토리 기준, 없는 것은 건너뜀)
+        self.sources = [
+            "frames.csv",
+            "frames.npy",
+            "played.csv",
+            "realsense/csv",
+            "realsense/meta",
+            "realsense/color",
+            "realsense/depth",
+            "realsense/depth_aligned",
+            "tobii/csv",
+        ]
+
+        # footer 기록 후 원본 파일 삭제
+        self.remove_source = False
+
+        self.copy_buffer_size = 1024 * 1024
+
+    ##
+    # Private
+
+    def _walk(self, output_path, source):
+        """source 아래 파일들의 (상대 경로, 절대 경로). 상대 경로는 '/' 구분"""
+        path = output_path / source
+        if path.is_file():
+            yield source, path
+            return
+        if not path.is_dir():
+            return
+
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                file_path = Path(root) / name
+                yield file_path.relative_to(output_path).as_posix(), file_path
+
+    def _finish(self, f, index):
+        """footer index와 trailer를 붙이고 디스크에 반영"""
+        body = json.dumps({'files': index}, separators=(',', ':')).encode('utf-8')
+        f.write(body)
+        f.write(PackReader.TRAILER.pack(PackReader.MAGIC, len(body)))
+        f.flush()
+        os.fsync(f.fileno())
+
+    def _next_pack_number(self, pack_dir):
+        numbers = [int(pack_file.stem) for pack_file in pack_dir.glob("*.pack") if pack_file.stem.isdigit()]
+        return max(numbers) + 1 if numbers else 0
+
+    def _is_packed(self, reader, key, file_path):
+        """디스크 파일이 기존 pack 항목과 같은지 (크기가 다르면 내용은 읽지 않음)"""
+        if key not in reader or reader.index[key][2] != file_path.stat().st_size:
+            return False
+        offset = 0
+        with reader.view(key) as packed, open(file_path, 'rb') as src:
+            while True:
+                chunk = src.read(self.copy_buffer_size)
+                if not chunk:
+                    return True
+                if packed[offset:offset + len(chunk)] != chunk:
+                    return False
+                offset += len(chunk)
+
+    def _copy(self, source_file, f):
+        with open(source_file, 'rb') as src:
+            while True:
+                chunk = src.read(self.copy_buffer_size)
+                if not chunk:
+                    break
+                f.write(chunk)
+
+    ##
+    # Public
+
+    def pack(self, output_dir):
+        """출력 디렉토리에서 새로 생기거나 바뀐 파일을 새 pack 파일로 묶고 (새 pack 수, 새 항목 수) 반환
+
+        기존 pack 파일은 다시 쓰지 않는다. 새 pack은 임시 파일에 모두 기록한 뒤 이름을
+        붙이므로, 중간에 중단되어도 기존 pack과 그 항목은 그대로 남는다.
+        """
+        print("출력 pack 생성 시작...")
+        output_path = Path(output_dir)
+        pack_dir = output_path / self.pack_dir_name
+        pack_dir.mkdir(parents=True, exist_ok=True)
+
+        # 이전 실행이 이름을 붙이기 전에 중단되며 남긴 임시 파일
+        for tmp_file in pack_dir.glob("*.pack.tmp"):
+            tmp_file.unlink()
+
+        files = [entry for source in self.sources for entry in self._walk(output_path, source)]
+        if not files:
+            print("  pack할 파일이 없습니다. 기존 pack을 유지합니다.")
+            return 0, 0
+
+        reader = PackReader().open(output_dir)
+        try:
+            changed = [(key, file_path) for key, file_path in files if not self._is_packed(reader, key, file_path)]
+        finally:
+            reader.close()
+
+        first_pack = self._next_pack_number(pack_dir)
+        pack_files = []
+
+        f = None
+        index = {}
+        try:
+            for key, file_path in changed:
+                length = file_path.stat().st_size
+                if f is None or (index and f.tell() + length > self.max_pack_bytes):
+                    if f is not None:
+                        self._finish(f, index)
+                        f.close()
+                    pack_files.append(pack_dir / self.pack_file_pattern.format(pack=first_pack + len(pack_files)))
+                    f = open(pack_files[-1].with_name(f"{pack_files[-1].name}.tmp"), 'wb')
+                    index = {}
+
+                offset = f.tell()
+                self._copy(file_path, f)
+                index[key] = [offset, f.tell() - offset]
+
+            if f is not None:
+                self._finish(f, index)
+        finally:
+            if f is not None:
+                f.close()
+
+        for pack_file in pack_files:
+            os.replace(pack_file.with_name(f"{pack_file.name}.tmp"), pack_file)
+
+        print(
+            f"  새 pack 파일: {len(pack_files)}개, 새 항목: {len(changed):,}개 "
+            f"(기존 pack과 같아 건너뜀: {len(files) - len(changed):,}개) -> {pack_dir}"
+        )
+
+        # 기존 pack과 같은 파일도 이미 pack에 있으므로 함께 삭제
+        if self.remove_source:
+            for _, file_path in files:
+                file_path.unlink()
+            print(f"  원본 파일 {len(files):,}개 삭제")
+
+        print("출력 pack 생성 완료")
+        return len(pack_files), len(changed)
@@ -0,0 +1,91 @@
+import json
+import mmap
+import struct
+from pathlib import Path
+
+
+class PackReader:
+    """pack 파일들을 풀지 않고 mmap으로 항목을 읽는 reader
+
+    pack 파일 구조: [항목 데이터 ...][JSON index][magic 8바이트][index 길이 8바이트]
+    index는 {상대 경로: [offset, length]} 이며 조회는 dict 한 번이다.
+    """
+
+    MAGIC = b"ASDPACK1"
+    TRAILER = struct.Struct("<8sQ")
+
+    def __init__(self):
+        self.pack_dir_name = "pack"
+        self.pack_pattern = "*.pack"
+
+        self.index = {}     # 상대 경로 -> (pack 번호, offset, length)
+        self._files = []
+        self._maps = []
+
+    ##
+    # Private
+
+    def _read_footer(self, f, size):
+        if size < self.TRAILER.size:
+            raise ValueError(f"pack 파일이 너무 작습니다: {f.name}")
+        f.seek(size - self.TRAILER.size)
+        magic, index_length = self.TRAILER.unpack(f.read(self.TRAILER.size))
+        if magic != self.MAGIC:
+            raise ValueError(f"pack footer가 없습니다 (기록이 끝나지 않았거나 손상됨): {f.name}")
+
+        f.seek(size - self.TRAILER.size - index_length)
+        return json.loads(f.read(index_length).decode('utf-8'))
+
+    ##
+    # Public
+
+    def open(self, output_dir):
+        """출력 디렉토리의 pack/*.pack을 모두 열어 index 병합"""
+        self.close()
+        # 같은 항목은 나중(번호가 큰) pack이 우선. 번호 자릿수가 늘어도 순서가 유지되도록 길이 먼저 비교
+        pack_files = sorted((Path(output_dir) / self.pack_dir_name).glob(self.pack_pattern), key=lambda path: (len(path.name), path.name))
+        for pack_file in pack_files:
+            f = open(pack_file, 'rb')
+            size = pack_file.stat().st_size
+            footer = self._read_footer(f, size)
+
+            pack_no = len(self._files)
+            self._files.append(f)
+            self._maps.append(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            for key, (offset, length) in footer['files'].items():
+                self.index[key] = (pack_no, offset, length)
+        return self
+
+    def close(self):
+        for mapped in self._maps:
+            mapped.close()
+        for f in self._files:
+            f.close()
+        self._maps = []
+        self._files = []
+        self.index = {}
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def keys(self, prefix=""):
+        return sorted(key for key in self.index if key.startswith(prefix))
+
+    def read(self, key):
+        """항목 bytes (mmap에서 복사)"""
+        pack_no, offset, length = self.index[key]
+        return self._maps[pack_no][offset:offset + length]
+
+    def view(self, key):
+        """항목 memoryview (복사 없음. reader를 닫기 전까지만 유효)"""
+        pack_no, offset, length = self.index[key]
+        return memoryview(self._maps[pack_no])[offset:offset + length]
+
+    def extract(self, key, output_file):
+        output_file = Path(output_file)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_file, 'wb') as f:
+            f.write(self.view(key))
@@ -0,0 +1,161 @@
+import os
+import csv
+import json
+from pathlib import Path
+
+from ASDconverter.timestamp.timestamp import Timestamp
+
+
+class Selection:
+    """선택 재처리 대상 (video_id / 시간 구간)
+
+    play 로그 일부만 수정된 경우 전체를 다시 변환하지 않고, 영향 받는 구간(windows)의
+    행만 다시 만들어 기존 출력 CSV에 끼워 넣는다. 구간 밖 행은 그대로 둔다.
+    """
+
+    def __init__(self):
+        self.video_ids = None       # 재처리할 video_id 목록
+        self.time_range = None      # (start_ms, end_ms), epoch ms
+
+        # 실제 재처리 구간 [(start_ms, end_ms)]. resolve()로 결정
+        self.windows = []
+
+        self.timestamp = Timestamp()
+
+    ##
+    # Private
+
+    def _read_pairs(self, played_csv_file):
+        """played CSV의 (video_id, start, end) 쌍"""
+        if not Path(played_csv_file).exists():
+            return []
+        with open(played_csv_file, 'r', newline='') as f:
+            rows = list(csv.DictReader(f))
+        return [
+            (rows[i]['video_id'], self.timestamp.parse(rows[i]['timestamp']), self.timestamp.parse(rows[i + 1]['timestamp']))
+            for i in range(0, len(rows) - 1, 2)
+            if rows[i]['type'] == 'play'
+        ]
+
+    def _merge(self, windows):
+        merged = []
+        for start, end in sorted(windows):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+
+    ##
+    # Public
+
+    def is_active(self):
+        return self.video_ids is not None or self.time_range is not None
+
+    def selects_pair(self, video_id, start, end):
+        """play-stop 쌍이 선택 대상인지"""
+        if self.video_ids is not None and str(video_id) not in {str(v) for v in self.video_ids}:
+            return False
+        if self.time_range is not None and (end < self.time_range[0] or start > self.time_range[1]):
+            return False
+        return True
+
+    def resolve(self, *played_csv_files):
+        """선택된 재생 쌍 구간 (수정 전/후 played CSV 모두) 으로 windows 결정"""
+        if self.video_ids is None:
+            self.windows = [tuple(self.time_range)] if self.time_range is not None else []
+            return self.windows
+
+        windows = []
+        for played_csv_file in played_csv_files:
+            for video_id, start, end in self._read_pairs(played_csv_file):
+                if not self.selects_pair(video_id, start, end):
+                    continue
+                if self.time_range is not None:
+                    start, end = max(start, self.time_range[0]), min(end, self.time_range[1])
+                windows.append((start, end))
+
+        self.windows = self._merge(windows)
+        return self.windows
+
+    def cover(self, valid_ranges):
+        """windows와 겹치는 유효 재생 구간 전체로 넓힌 Selection (구간 단위 매칭용)"""
+        windows = list(self.windows)
+        for range_info in valid_ranges:
+            if any(range_info['start'] <= end and start <= range_info['end'] for start, end in self.windows):
+                windows.append((range_info['start'], range_info['end']))
+
+        selection = Selection()
+        selection.video_ids = self.video_ids
+        selection.time_range = self.time_range
+        selection.windows = self._merge(windows)
+        return selection
+
+    def save(self, path):
+        """단계별로 따로 실행할 때 다음 단계가 같은 windows를 쓰도록 기록"""
+        with open(path, 'w') as f:
+            json.dump({
+                'video_ids': None if self.video_ids is None else [str(v) for v in self.video_ids],
+                'time_range': None if self.time_range is None else list(self.time_range),
+                'windows': self.windows,
+            }, f)
+
+    def load(self, path):
+        """같은 선택으로 기록된 windows가 있으면 불러옴"""
+        if not Path(path).exists():
+            return False
+        with open(path, 'r') as f:
+            saved = json.load(f)
+
+        video_ids = None if self.video_ids is None else [str(v) for v in self.video_ids]
+        time_range = None if self.time_range is None else list(self.time_range)
+        if saved['video_ids'] != video_ids or saved['time_range'] != time_range:
+            return False
+
+        self.windows = [tuple(window) for window in saved['windows']]
+        return True
+
+    def contains(self, timestamp):
+        try:
+            timestamp = self.timestamp.parse(timestamp)
+        except (ValueError, TypeError):
+            return False
+        return any(start <= timestamp <= end for start, end in self.windows)
+
+    def splice_csv(self, csv_file, rows, timestamp_column):
+        """windows 안의 기존 행을 rows로 교체하고 타임스탬프 순서로 index 재부여
+
+        windows 밖 행은 읽은 그대로 다시 기록된다.
+        """
+        csv_file = Path(csv_file)
+        kept = []
+        fieldnames = list(rows[0].keys()) if rows else None
+
+        if csv_file.exists():
+            with open(csv_file, 'r', newline='') as f:
+                reader = csv.DictReader(f)
+                fieldnames = reader.fieldnames or fieldnames
+                kept = [row for row in reader if not self.contains(row[timestamp_column])]
+
+        if fieldnames is None:
+            return 0
+
+        for row in rows:
+            extra = set(row.keys()) - set(fieldnames)
+            if extra:
+                raise ValueError(f"기존 {csv_file.name}에 없는 컬럼입니다: {sorted(extra)} (전체 재변환 필요)")
+
+        merged = kept + list(rows)
+        merged.sort(key=lambda row: self.timestamp.parse(row[timestamp_column]))
+        for i, row in enumerate(merged):
+            row['index'] = i
+
+        csv_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = csv_file.with_name(f".{csv_file.name}.tmp")
+        with open(tmp_file, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(merged)
+        os.replace(tmp_file, csv_file)
+
+        return len(rows)
@@ -0,0 +1,262 @@
+import csv
+import json
+import random
+from pathlib import Path
+from datetime import datetime, timezone, timedelta
+
+import numpy as np
+
+
+class Synthetic:
+    """카메라 없이 변환 전체를 시험/측정하기 위한 합성 입력 생성기
+
+    pyrealsense2 software_device와 recorder로 컬러/깊이 .bag을 기록하고, 같은 시간대의
+    session_*_tobii CSV, play.csv, user.txt를 함께 만든다. 실제 녹화(환자 데이터) 없이
+    Converter.convert를 처음부터 끝까지 실행할 수 있다.
+    """
+
+    def __init__(self):
+        # RealSense 스트림
+        self.width = 640
+        self.height = 480
+        self.fps = 30
+        self.depth_units = 0.001
+
+        # 세션 구성
+        self.sessions = 1
+        self.duration = 10.0        # 세션 길이 (초)
+        self.segments = 1           # 세션당 bag 수 (분할 녹화)
+        self.session_gap = 5.0      # 세션 사이 간격 (초)
+        self.start_time = datetime(2024, 8, 12, 10, 0, 0, tzinfo=timezone.utc)
+
+        # 기록하지 않을 프레임 (세션 기준 프레임 번호 / 무작위 비율)
+        self.dropped_frames = []
+        self.drop_rate = 0.0
+
+        # Tobii
+        self.tobii_hz = 120
+        self.tobii_margin = 0.5         # 세션 앞뒤로 더 기록하는 시간 (초)
+        self.tobii_invalid_rate = 0.01  # validity 0 샘플 비율
+
+        # 세션마다 재생할 video 수 (play/end 쌍)
+        self.videos = 3
+
+        self.seed = 0
+        self.bag_file_pattern = "recording_{segment:02d}.bag"
+        self.info_file_name = "synthetic.json"
+
+    ##
+    # Private
+
+    def _session_start(self, session):
+        """세션 시작 시각 (epoch ms)"""
+        offset = session * (self.duration + self.session_gap)
+        return self.start_time.timestamp() * 1000 + offset * 1000
+
+    def _frame_plan(self, rng):
+        """기록할 (프레임 번호, 세션 시작 기준 ms) 목록. 빠진 번호는 drop"""
+        frame_count = int(round(self.duration * self.fps))
+        dropped = set(self.dropped_frames)
+        return [
+            (frame_number, frame_number * 1000 / self.fps)
+            for frame_number in range(frame_count)
+            if frame_number not in dropped and rng.random() >= self.drop_rate
+        ], frame_count
+
+    def _images(self):
+        """프레임마다 가로로 밀어 쓸 컬러/깊이 기본 영상 (PNG 압축률이 실제와 비슷하도록 완만한 패턴)"""
+        y, x = np.mgrid[0:self.height, 0:self.width]
+        color = np.stack([
+            (x * 255 // max(1, self.width - 1)),
+            (y * 255 // max(1, self.height - 1)),
+            ((x + y) * 255 // max(1, self.width + self.height - 2)),
+        ], axis=-1).astype(np.uint8)
+
+        radius = np.hypot(x - self.width / 2, y - self.height / 2)
+        depth = (500 + radius * 2500 / max(1.0, radius.max())).astype(np.uint16)
+        return color, depth
+
+    def _intrinsics(self, rs):
+        intrinsics = rs.intrinsics()
+        intrinsics.width = self.width
+        intrinsics.height = self.height
+        intrinsics.ppx = self.width / 2
+        intrinsics.ppy = self.height / 2
+        intrinsics.fx = self.width * 0.9
+        intrinsics.fy = self.width * 0.9
+        intrinsics.model = rs.distortion.brown_conrady
+        intrinsics.coeffs = [0.0] * 5
+        return intrinsics
+
+    def _video_stream(self, rs, stream, uid, fmt, bpp):
+        video_stream = rs.video_stream()
+        video_stream.type = stream
+        video_stream.index = 0
+        video_stream.uid = uid
+        video_stream.width = self.width
+        video_stream.height = self.height
+        video_stream.fps = self.fps
+        video_stream.bpp = bpp
+        video_stream.fmt = fmt
+        video_stream.intrinsics = self._intrinsics(rs)
+        return video_stream
+
+    def _video_frame(self, rs, profile, pixels, bpp, timestamp, frame_number):
+        frame = rs.software_video_frame()
+        frame.pixels = pixels
+        frame.bpp = bpp
+        frame.stride = self.width * bpp
+        frame.timestamp = timestamp
+        frame.domain = rs.timestamp_domain.system_time
+        frame.frame_number = frame_number
+        frame.profile = profile.as_video_stream_profile()
+        return frame
+
+    def _set_metadata(self, rs, sensor, timestamp):
+        """frames.csv의 backend/hardware/arrival 컬럼에 쓰이는 메타데이터"""
+        sensor.set_metadata(rs.frame_metadata_value.frame_timestamp, int(timestamp * 1000) % 2 ** 32)
+        sensor.set_metadata(rs.frame_metadata_value.backend_timestamp, int(timestamp))
+        sensor.set_metadata(rs.frame_metadata_value.time_of_arrival, int(timestamp))
+
+    def _write_bag(self, bag_path, frames, session_start, color, depth):
+        """software_device 프레임을 recorder로 bag에 기록"""
+        import pyrealsense2 as rs
+
+        device = rs.software_device()
+        depth_sensor = device.add_sensor("Stereo Module")
+        color_sensor = device.add_sensor("RGB Camera")
+        depth_sensor.add_read_only_option(rs.option.depth_units, self.depth_units)
+
+        depth_profile = depth_sensor.add_video_stream(self._video_stream(rs, rs.stream.depth, 0, rs.format.z16, 2))
+        color_profile = color_sensor.add_video_stream(self._video_stream(rs, rs.stream.color, 1, rs.format.rgb8, 3))
+
+        extrinsics = rs.extrinsics()
+        extrinsics.rotation = [1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0]
+        extrinsics.translation = [0.015, 0.0, 0.0]
+        depth_profile.register_extrinsics_to(color_profile, extrinsics)
+        device.create_matcher(rs.matchers.default)
+
+        bag_path.parent.mkdir(parents=True, exist_ok=True)
+        recorder = rs.recorder(str(bag_path), device)
+        depth_sensor.open(depth_profile)
+        color_sensor.open(color_profile)
+        depth_sensor.start(lambda frame: None)
+        color_sensor.start(lambda frame: None)
+        try:
+            for frame_number, offset in frames:
+                timestamp = session_start + offset
+                shift = frame_number * 4 % self.width
+                for sensor, profile, image, bpp in (
+                    (depth_sensor, depth_profile, depth, 2),
+                    (color_sensor, color_profile, color, 3),
+                ):
+                    self._set_metadata(rs, sensor, timestamp)
+                    pixels = np.ascontiguousarray(np.roll(image, shift, axis=1))
+                    sensor.on_video_frame(self._video_frame(rs, profile, pixels, bpp, timestamp, frame_number))
+        finally:
+            for sensor in (depth_sensor, color_sensor):
+                sensor.stop()
+                sensor.close()
+            # recorder가 해제될 때 bag 기록이 끝난다
+            del recorder
+
+    def _tobii_fieldnames(self):
+        fieldnames = ['index', 'frame_timestamp', 'frame_hardware_timestamp']
+        for eye in ('left', 'right'):
+            fieldnames += [
+                f'{eye}_gaze_display_x', f'{eye}_gaze_display_y',
+                f'{eye}_gaze_3d_x', f'{eye}_gaze_3d_y', f'{eye}_gaze_3d_z', f'{eye}_gaze_validity',
+                f'{eye}_gaze_origin_x', f'{eye}_gaze_origin_y', f'{eye}_gaze_origin_z', f'{eye}_gaze_origin_validity',
+                f'{eye}_pupil_diameter', f'{eye}_pupil_validity',
+            ]
+        return fieldnames
+
+    def _write_tobii(self, csv_file, session_start, rng):
+        """Tobii 기록 프로그램과 같은 형식의 세션 CSV (ms 소수 / 하드웨어 µs 정수)"""
+        start = session_start - self.tobii_margin * 1000
+        count = int((self.duration + 2 * self.tobii_margin) * self.tobii_hz)
+
+        csv_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(csv_file, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(self._tobii_fieldnames())
+            for i in range(count):
+                timestamp = start + i * 1000 / self.tobii_hz + rng.uniform(-0.5, 0.5)
+                row = [i, f"{timestamp:.14f}", int(timestamp * 1000)]
+                for _ in ('left', 'right'):
+                    row += [f"{rng.random():.6f}" for _ in range(5)] + [int(rng.random() >= self.tobii_invalid_rate)]
+                    row += [f"{rng.random():.6f}" for _ in range(3)] + [int(rng.random() >= self.tobii_invalid_rate)]
+                    row += [f"{rng.uniform(2.0, 6.0):.6f}", int(rng.random() >= self.tobii_invalid_rate)]
+                writer.writerow(row)
+        return count
+
+    def _play_events(self, session, video_id):
+        """세션 길이를 video 수로 나눈 구간마다 play/end 한 쌍 (앞뒤 여유 포함)"""
+        events = []
+        slot = self.duration / self.videos
+        margin = min(0.5, slot / 4)
+        for i in range(self.videos):
+            start = self._session_start(session) + (i * slot + margin) * 1000
+            end = self._session_start(session) + ((i + 1) * slot - margin) * 1000
+            events.append((start, 'play', video_id + i))
+            events.append((end, 'end', video_id + i))
+        return events
+
+    def _iso(self, timestamp):
+        time = datetime.fromtimestamp(timestamp / 1000, tz=timezone.utc)
+        time = time.replace(microsecond=0) + timedelta(milliseconds=round(timestamp % 1000))
+        return time.strftime('%Y-%m-%dT%H:%M:%S.') + f"{time.microsecond // 1000:03d}Z"
+
+    ##
+    # Public
+
+    def generate(self, input_dir):
+        """input_dir에 변환 입력 구조 전체를 만들고 요약 반환"""
+        input_path = Path(input_dir)
+        input_path.mkdir(parents=True, exist_ok=True)
+        rng = random.Random(self.seed)
+        color, depth = self._images()
+
+        print("합성 입력 생성 시작...")
+        info = {
+            'width': self.width, 'height': self.height, 'fps': self.fps,
+            'duration': self.duration, 'sessions': self.sessions, 'segments': self.segments,
+            'drop_rate': self.drop_rate, 'dropped_frames': list(self.dropped_frames),
+            'tobii_hz': self.tobii_hz, 'videos': self.videos, 'seed': self.seed,
+            'frames': 0, 'dropped': 0, 'tobii_samples': 0, 'bag_bytes': 0,
+        }
+
+        play_events = []
+        for session in range(self.sessions):
+            session_start = self._session_start(session)
+            frames, frame_count = self._frame_plan(rng)
+            info['frames'] += len(frames)
+            info['dropped'] += frame_count - len(frames)
+
+            session_dir = input_path / f"session_{session + 1}_realsense"
+            for segment in range(self.segments):
+                segment_frames = frames[segment * len(frames) // self.segments:(segment + 1) * len(frames) // self.segments]
+                bag_path = session_dir / self.bag_file_pattern.format(segment=segment)
+                print(f"  {session_dir.name}/{bag_path.name}: {len(segment_frames)} frames ({self.width}x{self.height} @ {self.fps}fps)")
+                self._write_bag(bag_path, segment_frames, session_start, color, depth)
+                info['bag_bytes'] += bag_path.stat().st_size
+
+            tobii_csv = input_path / f"session_{session + 1}_tobii" / "tobii.csv"
+            info['tobii_samples'] += self._write_tobii(tobii_csv, session_start, rng)
+            play_events += self._play_events(session, session * self.videos + 1)
+
+        with open(input_path / "play.csv", 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['time', 'type', 'video_id'])
+            for timestamp, event_type, video_id in sorted(play_events):
+                writer.writerow([self._iso(timestamp), event_type, video_id])
+
+        with open(input_path / "user.txt", 'w') as f:
+            f.write("synthetic\n")
+
+        with open(input_path / self.info_file_name, 'w') as f:
+            json.dump(info, f, indent=2)
+
+        print(f"  frames: {info['frames']:,} (dropped {info['dropped']:,}), tobii: {info['tobii_samples']:,}, bag: {info['bag_bytes'] / 1024 ** 2:.1f}MB")
+        print("합성 입력 생성 완료")
+        return info
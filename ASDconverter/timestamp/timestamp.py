@@ -0,0 +1,88 @@
+import math
+
+
+class Timestamp:
+    """CSV 타임스탬프 표기 (epoch ms 소수 / epoch µs 정수)
+
+    단계 내부 계산은 모두 ms float로 한다. 기록 형식은 unit으로 정하고,
+    읽을 때는 두 형식을 모두 받는다. 단위는 표기(정수/소수)가 아니라 크기로 구분한다:
+    절댓값이 us_threshold 이상이면 µs, 미만이면 ms (정수 ms 표기도 ms로 읽음).
+    epoch ms는 1e12~1e13, epoch µs는 1e15 자릿수라 두 범위가 겹치지 않는다.
+    """
+
+    def __init__(self):
+        # "ms": 1723456789012.12345678901234 (기존 형식, rs-convert 파일 이름과 같음)
+        # "us": 1723456789012123 (int64 µs, 컬러/깊이 파일 이름에도 사용)
+        self.unit = "ms"
+
+        # 이 값 이상이면 µs (epoch ms로는 서기 5138년, epoch µs로는 1973년)
+        self.us_threshold = 1e14
+
+    ##
+    # Private
+
+    def _is_integer(self, value):
+        return isinstance(value, str) and value.strip().lstrip('-').isdigit()
+
+    def _is_us(self, value):
+        """기록된 값이 µs 크기인지 (변환 불가 값은 False)"""
+        try:
+            return abs(float(value)) >= self.us_threshold
+        except ValueError:
+            return False
+
+    ##
+    # Public
+
+    def format(self, ms):
+        """ms 값을 기록 형식 문자열로"""
+        if self.unit == "us":
+            # epoch ms * 1000은 float 정밀도를 넘으므로 정수 ms 부분과 소수 부분을 나누어 반올림
+            whole = math.floor(ms)
+            return str(whole * 1000 + round((ms - whole) * 1000))
+        return f"{ms:.14f}"
+
+    def parse(self, value):
+        """기록된 값(두 형식 모두)을 ms float로. 변환 불가 값은 ValueError"""
+        if not self._is_us(value):
+            return float(value)
+        if self._is_integer(value):
+            return int(value) / 1000
+        return float(value) / 1000
+
+    def normalize(self, value):
+        """다른 형식으로 기록된 값만 기록 형식으로 변환 (같은 형식이면 원래 표기 유지)"""
+        if value is None or str(value).strip() == '':
+            return value
+        if self.unit == "us":
+            if self._is_integer(value) and self._is_us(value):
+                return value
+        elif not self._is_us(value):
+            return value
+        return self.format(self.parse(value))
+
+    def resolution(self):
+        """기록 형식으로 구분할 수 있는 최소 간격 (ms)"""
+        return 0.001 if self.unit == "us" else 0.0
+
+    def parse_array(self, values):
+        """문자열 배열을 ms float 배열로 (빈 값/변환 불가 값은 NaN)"""
+        import numpy as np
+
+        values = np.char.strip(np.asarray(values, dtype=str))
+        result = np.full(values.shape, np.nan)
+
+        # epoch µs(1e15 자릿수)는 2**53보다 작아 float64로도 정확하다
+        present = values != ''
+        try:
+            result[present] = values[present].astype(np.float64)
+        except ValueError:
+            for i in np.flatnonzero(present):
+                try:
+                    result[i] = float(values[i])
+                except ValueError:
+                    pass
+
+        us = np.abs(result) >= self.us_threshold
+        result[us] /= 1000
+        return result
@@ -0,0 +1,78 @@
+import os
+import csv
+import sys
+import json
+import stat
+import random
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# 저장소 루트(ASDconverter 패키지)와 pyrealsense2 대역을 import 경로 맨 앞에 둔다.
+# multiprocessing spawn 자식 프로세스도 부모의 sys.path를 이어받는다.
+sys.path.insert(0, str(Path(__file__).resolve().parent / "fake_sdk"))
+sys.path.insert(0, str(ROOT))
+
+T0 = 1723456800000.0
+
+# 매칭 결과에 옮겨 적는 Tobii 컬럼 (Gaze 전처리 결과 컬럼 하나 포함)
+TOBII_COLUMNS = [
+    'frame_hardware_timestamp',
+    *[f"{side}_{name}" for side in ('left', 'right') for name in (
+        'gaze_display_x', 'gaze_display_y', 'gaze_3d_x', 'gaze_3d_y', 'gaze_3d_z', 'gaze_validity',
+        'gaze_origin_x', 'gaze_origin_y', 'gaze_origin_z', 'gaze_origin_validity',
+        'pupil_diameter', 'pupil_validity',
+    )],
+    'fused_pupil_diameter',
+]
+
+
+def write_bag(path, n, t0=T0, **options):
+    """fake_sdk가 재생할 bag 설명 파일 기록"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(dict(t0=t0, n=n, **options), f)
+    return path
+
+
+def write_inputs(input_path, frames=60):
+    """fake bag + Tobii CSV + play.csv + user.txt (video 두 개가 frame 구간 안에 재생)"""
+    from ASDconverter.synthetic.synthetic import Synthetic
+    synthetic = Synthetic()
+    synthetic.duration = frames * 33.3 / 1000
+    synthetic.tobii_margin = 0.2
+
+    write_bag(input_path / "session_1_realsense" / "recording.bag", frames)
+    synthetic._write_tobii(input_path / "session_1_tobii" / "tobii.csv", T0, random.Random(0))
+
+    events = [(T0 + 100, 'play', 1), (T0 + 800, 'end', 1), (T0 + 1000, 'play', 2), (T0 + 1800, 'end', 2)]
+    with open(input_path / "play.csv", 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['time', 'type', 'video_id'])
+        for timestamp, event_type, video_id in events:
+            writer.writerow([synthetic._iso(timestamp), event_type, video_id])
+    (input_path / "user.txt").write_text("test\n")
+
+
+def write_rs_convert(path, exit_code):
+    """rs-convert 대신 실행할 스크립트 (이미지 추출 성공/실패 흉내)"""
+    path = Path(path)
+    path.write_text(f"#!{sys.executable}\nimport sys\nsys.exit({exit_code})\n")
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return str(path)
+
+
+def tree_bytes(directory):
+    """디렉토리 아래 파일들의 상대 경로 -> 내용 (checkpoint 등 실행 상태 파일 제외)"""
+    directory = Path(directory)
+    return {
+        path.relative_to(directory).as_posix(): path.read_bytes()
+        for path in sorted(directory.rglob("*"))
+        if path.is_file() and "checkpoint" not in path.parts
+    }
+
+
+posix_only = pytest.mark.skipif(os.name == "nt", reason="rs-convert 대역 스크립트는 POSIX 실행 파일")
@@ -0,0 +1,211 @@
+"""테스트용 pyrealsense2 대역
+
+.bag 파일 대신 JSON 설명 파일을 재생한다:
+    {"t0": 첫 frameset 타임스탬프(ms), "n": frameset 수, "interval": 간격(ms),
+     "width": 컬러 폭, "height": 컬러 높이, "depth_width": ..., "depth_height": ...,
+     "crash_at": 이 번호의 frameset을 읽을 때 FakeCrash (선택)}
+설정이 파일에 있으므로 multiprocessing 자식 프로세스(fork/spawn)에서도 같은 bag을 재생한다.
+"""
+import json
+import datetime
+
+import numpy as np
+
+
+class FakeCrash(Exception):
+    """디코딩 도중 프로세스가 죽은 것처럼 중단"""
+
+
+class stream:
+    color = 1
+    depth = 2
+
+
+class format:
+    bgr8 = 1
+    bgra8 = 2
+    rgb8 = 3
+    z16 = 4
+
+
+class frame_metadata_value:
+    backend_timestamp = 1
+    frame_timestamp = 2
+    time_of_arrival = 3
+
+
+def _read_bag(path):
+    with open(path, 'r') as f:
+        bag = json.load(f)
+    bag.setdefault('interval', 33.3)
+    bag.setdefault('width', 8)
+    bag.setdefault('height', 6)
+    bag.setdefault('depth_width', 4)
+    bag.setdefault('depth_height', 3)
+    return bag
+
+
+class _Intrinsics:
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.ppx = width / 2
+        self.ppy = height / 2
+        self.fx = float(width)
+        self.fy = float(width)
+        self.model = "distortion.brown_conrady"
+        self.coeffs = [0.0] * 5
+
+
+class _Extrinsics:
+    rotation = [1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0]
+    translation = [0.015, 0.0, 0.0]
+
+
+class _StreamProfile:
+    def __init__(self, fmt, width, height):
+        self._format = fmt
+        self._intrinsics = _Intrinsics(width, height)
+
+    def format(self):
+        return self._format
+
+    def as_video_stream_profile(self):
+        return self
+
+    def get_intrinsics(self):
+        return self._intrinsics
+
+    def get_extrinsics_to(self, other):
+        return _Extrinsics()
+
+
+class _Frame:
+    def __init__(self, bag, index, kind):
+        self.bag = bag
+        self.index = index
+        self.kind = kind
+
+    def __bool__(self):
+        return True
+
+    def get_timestamp(self):
+        return self.bag['t0'] + self.index * self.bag['interval']
+
+    def get_frame_number(self):
+        return self.index
+
+    def get_frame_metadata(self, key):
+        return self.index * 10 + key
+
+    def get_profile(self):
+        if self.kind == 'color':
+            return _StreamProfile(format.rgb8, self.bag['width'], self.bag['height'])
+        return _StreamProfile(format.z16, *self._depth_size())
+
+    def _depth_size(self):
+        if self.kind == 'aligned':
+            return self.bag['width'], self.bag['height']
+        return self.bag['depth_width'], self.bag['depth_height']
+
+    def get_data(self):
+        """frameset 번호로 정해지는 결정적 픽셀 값"""
+        if self.kind == 'color':
+            shape = (self.bag['height'], self.bag['width'], 3)
+            return (np.arange(np.prod(shape)).reshape(shape) + self.index).astype(np.uint8)
+        width, height = self._depth_size()
+        return (np.arange(width * height).reshape(height, width) + self.index * 7).astype(np.uint16)
+
+
+class _Frameset(_Frame):
+    def __init__(self, bag, index, aligned=False):
+        super().__init__(bag, index, 'frameset')
+        self.aligned = aligned
+
+    def get_color_frame(self):
+        return _Frame(self.bag, self.index, 'color')
+
+    def get_depth_frame(self):
+        return _Frame(self.bag, self.index, 'aligned' if self.aligned else 'depth')
+
+
+class _Playback:
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+
+    def set_real_time(self, value):
+        pass
+
+    def seek(self, offset):
+        # 실제 SDK처럼 요청 위치보다 약간 앞의 frameset부터 재생
+        position = int(offset.total_seconds() * 1000 / self.pipeline.bag['interval']) - 1
+        self.pipeline.position = min(max(0, position), self.pipeline.bag['n'])
+
+    def get_duration(self):
+        return datetime.timedelta(milliseconds=(self.pipeline.bag['n'] - 1) * self.pipeline.bag['interval'])
+
+
+class _DepthSensor:
+    def get_depth_scale(self):
+        return 0.001
+
+
+class _Device:
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+
+    def as_playback(self):
+        return _Playback(self.pipeline)
+
+    def first_depth_sensor(self):
+        return _DepthSensor()
+
+
+class _PipelineProfile:
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+
+    def get_device(self):
+        return _Device(self.pipeline)
+
+    def get_stream(self, kind):
+        bag = self.pipeline.bag
+        if kind == stream.color:
+            return _StreamProfile(format.rgb8, bag['width'], bag['height'])
+        return _StreamProfile(format.z16, bag['depth_width'], bag['depth_height'])
+
+
+class config:
+    def enable_device_from_file(self, path, repeat_playback=True):
+        self.path = path
+
+
+class pipeline:
+    def start(self, config):
+        self.bag = _read_bag(config.path)
+        self.position = 0
+        self.profile = _PipelineProfile(self)
+        return self.profile
+
+    def get_active_profile(self):
+        return self.profile
+
+    def stop(self):
+        pass
+
+    def wait_for_frames(self):
+        if self.position >= self.bag['n']:
+            raise RuntimeError("Frame didn't arrive")
+        if self.bag.get('crash_at') == self.position:
+            raise FakeCrash(f"crash at frameset {self.position}")
+        frames = _Frameset(self.bag, self.position)
+        self.position += 1
+        return frames
+
+
+class align:
+    def __init__(self, target):
+        self.target = target
+
+    def process(self, frames):
+        return _Frameset(frames.bag, frames.index, aligned=True)
@@ -0,0 +1,35 @@
+import csv
+
+from ASDconverter.audit.audit import Audit
+from ASDconverter.converter import argparser
+
+
+def write_output(output_path):
+    color_dir = output_path / "realsense" / "color"
+    color_dir.mkdir(parents=True)
+    (color_dir / "a.png").write_bytes(b"png")
+    (color_dir / "b.png").write_bytes(b"")
+    for csv_path, column in (("frames.csv", "rgb_path"), ("realsense/csv/frames.csv", "color_file_path")):
+        (output_path / csv_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path / csv_path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow([column])
+            writer.writerows([["a.png"], ["b.png"], ["c.png"]])
+
+
+def test_zero_byte_check_is_opt_in(tmp_path):
+    write_output(tmp_path)
+
+    report = Audit().audit(tmp_path)['rgb_path']
+    assert report['missing'] == ["c.png"]
+    assert report['empty'] == []
+
+    audit = Audit()
+    audit.check_empty = True
+    assert audit.audit(tmp_path)['rgb_path']['empty'] == ["b.png"]
+
+
+def test_check_empty_flag():
+    assert not argparser(["audit", "--output_path", "out"]).check_empty
+    assert argparser(["audit", "--output_path", "out", "--check_empty"]).check_empty
+    assert argparser(["all", "--input_path", "in", "--output_path", "out", "--audit", "--check_empty"]).check_empty
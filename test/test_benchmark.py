@@ -0,0 +1,30 @@
+import json
+
+import pytest
+
+from conftest import write_bag, write_inputs
+from ASDconverter.converter import main
+from ASDconverter.device.realsense import Realsense
+
+
+def test_missing_rs_convert_is_reported_before_converting(tmp_path, monkeypatch):
+    monkeypatch.setenv("RS_CONVERT_EXE", str(tmp_path / "missing" / "rs-convert"))
+    write_bag(tmp_path / "input" / "session_1_realsense" / "recording.bag", 3)
+
+    with pytest.raises(FileNotFoundError, match="RS_CONVERT_EXE"):
+        Realsense().convert(str(tmp_path / "input"), str(tmp_path / "output"))
+    assert not (tmp_path / "output" / "realsense" / "csv" / "frames.csv").exists()
+
+
+def test_benchmark_runs_without_rs_convert(tmp_path, monkeypatch):
+    """기본 옵션(flat 배치)으로도 rs-convert 없이 끝까지 측정"""
+    monkeypatch.setenv("RS_CONVERT_EXE", str(tmp_path / "missing" / "rs-convert"))
+    write_inputs(tmp_path / "input")
+
+    main(["benchmark", "--input_path", str(tmp_path / "input"), "--output_path", str(tmp_path / "bench")])
+
+    with open(next((tmp_path / "bench").glob("bench_*.json"))) as f:
+        summary = json.load(f)
+    assert summary['params']['inline_frames'] is True
+    assert summary['stages']['realsense']['items'] == 60
+    assert summary['stages']['matcher']['items'] > 0
@@ -0,0 +1,142 @@
+import json
+import time
+import threading
+
+import pytest
+
+from ASDconverter.cluster.cluster import JobQueue
+
+
+def make_queue(worker_id, **options):
+    queue = JobQueue()
+    queue.worker_id = worker_id
+    queue.poll_interval = 0.0
+    for name, value in options.items():
+        setattr(queue, name, value)
+    return queue
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    input_path = tmp_path / "input"
+    for name in ("p1", "p2", "p3"):
+        (input_path / name).mkdir(parents=True)
+    return tmp_path / "queue", input_path, tmp_path / "output"
+
+
+def test_failed_participant_is_retried_until_convert_succeeds(dirs):
+    queue_path, input_path, output_path = dirs
+    calls = []
+
+    def convert(input_dir, output_dir):
+        name = input_dir.rsplit("/", 1)[-1]
+        calls.append(name)
+        if calls.count(name) == 1 and name == "p2":
+            return False
+        if calls.count(name) == 1 and name == "p3":
+            raise RuntimeError("decode error")
+        return True
+
+    make_queue("w1").run(queue_path, input_path, output_path, convert)
+
+    assert sorted(calls) == ["p1", "p2", "p2", "p3", "p3"]
+    for name in ("p1", "p2", "p3"):
+        with open(queue_path / "ledger" / f"{name}.json") as f:
+            assert json.load(f)['success'] is True
+    assert not list((queue_path / "failed").iterdir())
+
+
+def test_participant_is_given_up_after_max_attempts(dirs):
+    queue_path, input_path, output_path = dirs
+    calls = []
+
+    def convert(input_dir, output_dir):
+        calls.append(input_dir.rsplit("/", 1)[-1])
+        return not input_dir.endswith("p2")
+
+    make_queue("w1", max_attempts=2).run(queue_path, input_path, output_path, convert)
+
+    assert calls.count("p2") == 2
+    assert not (queue_path / "ledger" / "p2.json").exists()
+    with open(queue_path / "failed" / "p2.json") as f:
+        record = json.load(f)
+    assert record['attempts'] == 2 and record['success'] is False
+
+    # 다음 실행에서도 포기한 참가자는 다시 잡지 않는다
+    make_queue("w2", max_attempts=2).run(queue_path, input_path, output_path, convert)
+    assert calls.count("p2") == 2
+
+
+def test_only_one_worker_holds_a_live_lease(dirs):
+    queue_path, _, _ = dirs
+    w1, w2 = make_queue("w1"), make_queue("w2")
+
+    assert w1._claim(queue_path, "p1") == 0
+    assert w2._claim(queue_path, "p1") is None
+    assert w1._renew(queue_path, "p1", 0)
+
+
+def test_expired_lease_is_taken_over_and_old_owner_is_fenced(dirs):
+    queue_path, input_path, output_path = dirs
+    w1, w2 = make_queue("w1", lease_seconds=-1.0), make_queue("w2")
+
+    def convert(input_dir, output_dir):
+        # w1이 변환하는 사이 lease가 만료되어 w2가 넘겨받는다
+        assert w2._claim(queue_path, "p1") == 1
+        return True
+
+    assert w1.process(queue_path, "p1", input_path, output_path, convert)
+    assert not (queue_path / "ledger" / "p1.json").exists()
+    assert not (queue_path / "failed" / "p1.json").exists()
+    assert not w1._renew(queue_path, "p1", 0)
+    assert w2._holds(queue_path, "p1", 1)
+
+    # 새 소유자가 끝내고 나면 ledger에는 w2가 기록된다
+    (queue_path / "ledger").mkdir()
+    w2._record(queue_path, "p1", 0.0, True)
+    w2._release(queue_path, "p1", 1)
+    with open(queue_path / "ledger" / "p1.json") as f:
+        assert json.load(f)['worker'] == "w2"
+
+
+def test_takeover_backs_off_when_the_owner_renews_in_between(dirs):
+    queue_path, _, _ = dirs
+    w1, w2 = make_queue("w1", lease_seconds=-1.0), make_queue("w2")
+    assert w1._claim(queue_path, "p1") == 0
+
+    create_lease = w2._create_lease
+    def create_then_owner_renews(lease_file):
+        created = create_lease(lease_file)
+        w1.lease_seconds = 120.0
+        w1._write_atomic(w1._lease_file(queue_path, "p1", 0), w1._lease_body(time.time() + 120.0))
+        return created
+    w2._create_lease = create_then_owner_renews
+
+    assert w2._claim(queue_path, "p1") is None
+    assert w1._generations(queue_path, "p1") == [0]
+    assert w1._renew(queue_path, "p1", 0)
+
+
+def test_concurrent_workers_convert_each_participant_once(tmp_path):
+    queue_path, input_path, output_path = tmp_path / "queue", tmp_path / "input", tmp_path / "output"
+    names = [f"p{i}" for i in range(12)]
+    for name in names:
+        (input_path / name).mkdir(parents=True)
+
+    calls = []
+    lock = threading.Lock()
+    def convert(input_dir, output_dir):
+        time.sleep(0.01)
+        with lock:
+            calls.append(input_dir.rsplit("/", 1)[-1])
+        return True
+
+    workers = [make_queue(f"w{i}", poll_interval=0.05) for i in range(4)]
+    threads = [threading.Thread(target=w.run, args=(queue_path, input_path, output_path, convert)) for w in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(calls) == sorted(names)
+    assert sorted(path.stem for path in (queue_path / "ledger").glob("*.json")) == sorted(names)
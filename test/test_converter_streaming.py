@@ -0,0 +1,94 @@
+import csv
+
+import pytest
+
+from conftest import write_inputs, write_rs_convert, posix_only
+from ASDconverter.converter import Converter, main
+from ASDconverter.pack.reader import PackReader
+
+
+def make_converter(rs_convert_exe=None):
+    converter = Converter()
+    converter.streaming = True
+    if rs_convert_exe is None:
+        converter.realsense.frame_layout = "bucket"
+    else:
+        converter.realsense.rs_convert_exe = rs_convert_exe
+    return converter
+
+
+def read_rows(csv_file):
+    with open(csv_file, newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def test_streaming_matches_frames(tmp_path):
+    write_inputs(tmp_path / "input")
+
+    assert make_converter().convert(str(tmp_path / "input"), str(tmp_path / "output"))
+
+    rows = read_rows(tmp_path / "output" / "frames.csv")
+    assert rows and {row['video_id'] for row in rows} == {'1', '2'}
+
+
+@posix_only
+def test_streaming_reports_failed_image_export(tmp_path):
+    write_inputs(tmp_path / "input")
+
+    converter = make_converter(write_rs_convert(tmp_path / "rs-convert", 1))
+    assert not converter.convert(str(tmp_path / "input"), str(tmp_path / "output"))
+
+
+def test_streaming_reraises_producer_errors(tmp_path):
+    write_inputs(tmp_path / "input")
+    converter = make_converter()
+
+    def broken_stream(input_dir, output_dir, publish):
+        raise OSError("tobii stream failed")
+    converter.tobii.stream = broken_stream
+
+    with pytest.raises(OSError, match="tobii stream failed"):
+        converter.convert(str(tmp_path / "input"), str(tmp_path / "output"))
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_audit_runs_and_decides_result(tmp_path, streaming):
+    write_inputs(tmp_path / "input")
+    converter = make_converter()
+    converter.streaming = streaming
+    converter.run_audit = True
+
+    reports = []
+    audit = converter.audit.audit
+    converter.audit.audit = lambda output_dir: reports.append(audit(output_dir)) or reports[-1]
+    assert converter.convert(str(tmp_path / "input"), str(tmp_path / "output"))
+    assert len(reports) == 1 and converter.audit.passed(reports[0])
+
+    # 참조된 프레임 파일이 없으면 audit 실패가 변환 결과에 반영된다
+    converter.audit.audit = lambda output_dir: {'rgb_path': dict(reports[0]['rgb_path'], missing=['x.png'])}
+    assert not converter.convert(str(tmp_path / "input"), str(tmp_path / "output2"))
+
+
+def test_streaming_packs_output(tmp_path):
+    write_inputs(tmp_path / "input")
+    converter = make_converter()
+    converter.run_pack = True
+
+    assert converter.convert(str(tmp_path / "input"), str(tmp_path / "output"))
+
+    reader = PackReader().open(tmp_path / "output")
+    try:
+        assert "frames.csv" in reader and reader.keys("realsense/color/")
+    finally:
+        reader.close()
+
+
+def test_remove_source_needs_pack(tmp_path, monkeypatch):
+    converters = []
+    monkeypatch.setattr(Converter, "convert", lambda self, input_dir, output_dir: converters.append(self))
+
+    main(["all", "--input_path", str(tmp_path), "--output_path", str(tmp_path), "--remove_source"])
+    assert 'packer' not in vars(converters[-1])
+
+    main(["all", "--input_path", str(tmp_path), "--output_path", str(tmp_path), "--pack", "--remove_source"])
+    assert converters[-1].packer.remove_source
@@ -0,0 +1,99 @@
+import csv
+import json
+
+import pytest
+
+from conftest import write_bag, write_rs_convert, posix_only
+from ASDconverter.device.realsense import Realsense
+from ASDconverter.loader.loader import Loader
+
+
+def write_matched_csv(output_path):
+    """RealSense frames.csv 행을 모두 매칭된 것으로 보는 최소 매칭 결과"""
+    with open(output_path / "realsense" / "csv" / "frames.csv", newline='') as f:
+        frames = list(csv.DictReader(f))
+    with open(output_path / "frames.csv", 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['index', 'realsense_timestamp', 'rgb_path', 'depth_path', 'video_id', 'time_diff_ms'])
+        writer.writeheader()
+        for i, row in enumerate(frames):
+            writer.writerow({
+                'index': i, 'realsense_timestamp': row['frame_timestamp'],
+                'rgb_path': row['color_file_path'], 'depth_path': row['depth_file_path'],
+                'video_id': '1', 'time_diff_ms': '1.000',
+            })
+
+
+@pytest.fixture
+def output_path(tmp_path):
+    input_path = tmp_path / "input"
+    write_bag(input_path / "session_1_realsense" / "recording.bag", 10, width=8, height=6, depth_width=4, depth_height=3)
+
+    realsense = Realsense()
+    realsense.frame_layout = "bucket"
+    assert realsense.convert(str(input_path), str(tmp_path / "output"))
+    write_matched_csv(tmp_path / "output")
+    return tmp_path / "output"
+
+
+def test_depth_shape_comes_from_session_meta(output_path):
+    loader = Loader()
+    loader.batch_size = 4
+    batches = list(loader.iter_batches(output_path))
+
+    assert [len(batch['index']) for batch in batches] == [4, 4, 2]
+    assert batches[0]['rgb'].shape == (4, 6, 8, 3)
+    assert batches[0]['depth'].shape == (4, 3, 4)
+
+
+def test_missing_session_meta_is_an_error_not_a_guess(output_path):
+    for meta_file in (output_path / "realsense" / "meta").glob("*.json"):
+        meta_file.unlink()
+
+    with pytest.raises(ValueError, match="깊이 해상도"):
+        next(Loader().iter_batches(output_path))
+
+    loader = Loader()
+    loader.depth_shape = (3, 4)
+    assert next(loader.iter_batches(output_path))['depth'].shape[1:] == (3, 4)
+
+
+@posix_only
+def test_rs_convert_path_writes_session_meta(tmp_path):
+    input_path = tmp_path / "input"
+    write_bag(input_path / "session_1_realsense" / "recording.bag", 5, depth_width=4, depth_height=3)
+
+    realsense = Realsense()
+    realsense.rs_convert_exe = write_rs_convert(tmp_path / "rs-convert", 0)
+    assert realsense.convert(str(input_path), str(tmp_path / "output"))
+
+    with open(tmp_path / "output" / "realsense" / "meta" / "session_1_realsense.json") as f:
+        assert json.load(f)['depth_output_shape'] == [3, 4]
+
+
+def test_out_of_bounds_crop_is_rejected(tmp_path):
+    input_path = tmp_path / "input"
+    write_bag(input_path / "session_1_realsense" / "recording.bag", 3, width=8, height=6, depth_width=4, depth_height=3)
+
+    realsense = Realsense()
+    realsense.crop_box = (6, 4, 10, 10)
+    with pytest.raises(ValueError, match="crop box"):
+        realsense.convert(str(input_path), str(tmp_path / "output"))
+
+
+@pytest.mark.parametrize("crop_box", [(7, 5, 1, 1), (1, 1, 7, 5), (3, 1, 5, 5)])
+def test_cropped_frames_match_session_meta(tmp_path, crop_box):
+    """깊이 crop box를 반올림해도 기록한 파일 크기와 meta의 출력 해상도가 같다"""
+    input_path = tmp_path / "input"
+    write_bag(input_path / "session_1_realsense" / "recording.bag", 3, width=8, height=6, depth_width=4, depth_height=3)
+
+    realsense = Realsense()
+    realsense.crop_box = crop_box
+    realsense.frame_layout = "bucket"
+    assert realsense.convert(str(input_path), str(tmp_path / "output"))
+    write_matched_csv(tmp_path / "output")
+
+    with open(tmp_path / "output" / "realsense" / "meta" / "session_1_realsense.json") as f:
+        meta = json.load(f)
+    batch = next(Loader().iter_batches(tmp_path / "output"))
+    assert list(batch['rgb'].shape[1:3]) == meta['color_output_shape'] == [crop_box[3], crop_box[2]]
+    assert list(batch['depth'].shape[1:]) == meta['depth_output_shape'] and all(meta['depth_output_shape'])
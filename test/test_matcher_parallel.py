@@ -0,0 +1,90 @@
+import csv
+import random
+
+import pytest
+
+from conftest import T0, TOBII_COLUMNS
+from ASDconverter.matcher.matcher import Matcher
+
+
+def timeline(rng, interval, bursts):
+    """burst마다 일정 간격의 타임스탬프 (burst 사이 간격은 max_time_diff 안팎)"""
+    timestamps = []
+    for start, end in bursts:
+        t = start + rng.uniform(0, interval)
+        while t < end:
+            timestamps.append(t)
+            t += interval * rng.uniform(0.7, 1.3)
+    return timestamps
+
+
+def make_data(seed):
+    rng = random.Random(seed)
+    # 재생 구간 경계 바로 안팎, 구간 밖, max_time_diff(100ms)보다 짧은/긴 빈 구간이 섞이도록
+    bursts = [(T0, T0 + 900), (T0 + 960, T0 + 2000), (T0 + 2150, T0 + 3000), (T0 + 3101, T0 + 4200), (T0 + 4500, T0 + 5000)]
+    valid_ranges = [
+        {'video_id': '1', 'start': T0 + 100, 'end': T0 + 1500},
+        {'video_id': '2', 'start': T0 + 1500.5, 'end': T0 + 2600},
+        {'video_id': '3', 'start': T0 + 3900, 'end': T0 + 4700},
+    ]
+
+    realsense = [
+        {'index': str(i), 'frame_timestamp': t, 'color_file_path': f"c{i}.png", 'depth_file_path': f"d{i}.bin"}
+        for i, t in enumerate(timeline(rng, 33.3, bursts))
+    ]
+    tobii = []
+    for i, t in enumerate(timeline(rng, 8.3, [(s + rng.uniform(-60, 60), e + rng.uniform(-60, 60)) for s, e in bursts])):
+        row = {column: f"{rng.uniform(-1, 1):.6f}" for column in TOBII_COLUMNS}
+        row.update({column: rng.choice(['0', '1']) for column in TOBII_COLUMNS if column.endswith('_validity')})
+        row.update(index=str(i), frame_timestamp=t)
+        tobii.append(row)
+    return realsense, tobii, valid_ranges
+
+
+@pytest.mark.parametrize("match_mode", ["nearest", "interpolate"])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_parallel_matching_equals_serial(match_mode, seed):
+    realsense, tobii, valid_ranges = make_data(seed)
+
+    serial = Matcher()
+    serial.match_mode = match_mode
+    expected = serial._run_matching(realsense, tobii, valid_ranges)
+
+    parallel = Matcher()
+    parallel.match_mode = match_mode
+    parallel.workers = 3
+    actual = parallel._match_frames_parallel(realsense, tobii, valid_ranges)
+
+    assert len(parallel._split_by_gap(realsense, tobii)) >= 2
+    assert actual[0] == expected[0]
+    assert actual[1:] == pytest.approx(expected[1:])
+    assert any(row['video_id'] is None and row['time_diff_ms'] != 'NO_MATCH' for row in actual[0])
+
+
+def test_split_by_gap_cuts_only_gaps_longer_than_max_time_diff():
+    matcher = Matcher()
+    realsense = [{'frame_timestamp': t} for t in (0.0, 50.0, 300.0)]
+    tobii = [{'frame_timestamp': t} for t in (120.0, 150.0, 400.0, 500.0, 600.1)]
+
+    parts = matcher._split_by_gap(realsense, tobii)
+
+    assert [([r['frame_timestamp'] for r in rs], [t['frame_timestamp'] for t in tb]) for rs, tb in parts] == [
+        ([0.0, 50.0], [120.0, 150.0]),
+        ([300.0], [400.0, 500.0]),
+        ([], [600.1]),
+    ]
+
+
+def test_index_output_rejects_interpolation(tmp_path):
+    realsense, tobii, _ = make_data(0)
+    for name, rows in (("realsense.csv", realsense), ("tobii.csv", tobii)):
+        with open(tmp_path / name, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+
+    matcher = Matcher()
+    matcher.match_mode = "interpolate"
+    matcher.output_format = "index"
+    assert not matcher.match_frames_simple(tmp_path / "realsense.csv", tmp_path / "tobii.csv", tmp_path / "out")
+    assert not (tmp_path / "out").exists()
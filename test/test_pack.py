@@ -0,0 +1,91 @@
+import pytest
+
+from ASDconverter.pack.pack import Packer
+from ASDconverter.pack.reader import PackReader
+
+
+def write_files(output_path, files):
+    for key, data in files.items():
+        (output_path / key).parent.mkdir(parents=True, exist_ok=True)
+        (output_path / key).write_bytes(data)
+
+
+def read_all(output_path):
+    reader = PackReader().open(output_path)
+    try:
+        return {key: reader.read(key) for key in reader.keys()}
+    finally:
+        reader.close()
+
+
+def test_repack_after_remove_source_keeps_earlier_entries(tmp_path):
+    first = {
+        "frames.csv": b"index\n0\n",
+        "realsense/color/a.png": b"a" * 300,
+        "realsense/depth/a.bin": b"\x01\x02" * 100,
+    }
+    write_files(tmp_path, first)
+
+    packer = Packer()
+    packer.max_pack_bytes = 256
+    packer.remove_source = True
+    assert packer.pack(tmp_path) == (3, 3)
+    assert not (tmp_path / "realsense" / "color" / "a.png").exists()
+    assert read_all(tmp_path) == first
+
+    old_packs = {path.name: path.read_bytes() for path in (tmp_path / "pack").glob("*.pack")}
+
+    # 새 세션 프레임과 바뀐 frames.csv만 디스크에 있는 상태에서 다시 pack
+    second = {
+        "frames.csv": b"index\n0\n1\n",
+        "realsense/color/b.png": b"b" * 200,
+    }
+    write_files(tmp_path, second)
+    assert packer.pack(tmp_path) == (1, 2)
+
+    # 기존 pack은 다시 쓰지 않고 새 pack이 뒤에 추가된다
+    assert {name: (tmp_path / "pack" / name).read_bytes() for name in old_packs} == old_packs
+    assert read_all(tmp_path) == {**first, **second}
+    assert not list((tmp_path / "pack").glob("*.tmp"))
+
+
+def test_repack_skips_files_already_packed(tmp_path):
+    files = {"frames.csv": b"index\n0\n", "realsense/color/a.png": b"a" * 300}
+    write_files(tmp_path, files)
+    packer = Packer()
+    assert packer.pack(tmp_path) == (1, 2)
+
+    (tmp_path / "frames.csv").write_bytes(b"index\n9\n")
+    assert packer.pack(tmp_path) == (1, 1)
+    assert packer.pack(tmp_path) == (0, 0)
+    assert sorted(path.name for path in (tmp_path / "pack").glob("*.pack")) == ["000.pack", "001.pack"]
+    assert read_all(tmp_path) == {**files, "frames.csv": b"index\n9\n"}
+
+
+def test_interrupted_pack_keeps_existing_packs(tmp_path, monkeypatch):
+    write_files(tmp_path, {"frames.csv": b"index\n0\n"})
+    packer = Packer()
+    packer.pack(tmp_path)
+
+    write_files(tmp_path, {"frames.csv": b"index\n0\n1\n", "realsense/color/a.png": b"a" * 10})
+    def crash(source_file, f):
+        raise OSError("disk full")
+    monkeypatch.setattr(packer, "_copy", crash)
+    with pytest.raises(OSError):
+        packer.pack(tmp_path)
+
+    assert read_all(tmp_path) == {"frames.csv": b"index\n0\n"}
+    monkeypatch.undo()
+    assert packer.pack(tmp_path) == (1, 2)
+    assert not list((tmp_path / "pack").glob("*.tmp"))
+
+
+def test_pack_without_new_files_keeps_existing_packs(tmp_path):
+    write_files(tmp_path, {"played.csv": b"type\nplay\n"})
+    packer = Packer()
+    packer.remove_source = True
+    packer.pack(tmp_path)
+    before = (tmp_path / "pack" / "000.pack").read_bytes()
+
+    assert packer.pack(tmp_path) == (0, 0)
+    assert (tmp_path / "pack" / "000.pack").read_bytes() == before
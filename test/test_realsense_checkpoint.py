@@ -0,0 +1,124 @@
+import csv
+import json
+import stat
+import sys
+
+import pytest
+
+from conftest import T0, write_bag, tree_bytes, posix_only
+from pyrealsense2 import FakeCrash
+from ASDconverter.device.realsense import Realsense
+
+
+def make_realsense(**options):
+    realsense = Realsense()
+    realsense.frame_layout = "bucket"
+    for name, value in options.items():
+        setattr(realsense, name, value)
+    return realsense
+
+
+def write_sessions(input_path, crash_at=None):
+    options = {} if crash_at is None else {'crash_at': crash_at}
+    write_bag(input_path / "session_1_realsense" / "recording.bag", 120, **options)
+    write_bag(input_path / "session_2_realsense" / "recording.bag", 40, t0=T0 + 60000)
+
+
+def read_checkpoint(output_path, name):
+    with open(output_path / "realsense" / "checkpoint" / f"{name}.json") as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize("shard_count", [1, 3])
+@pytest.mark.parametrize("checkpoint_frames", [1, 7, 50])
+@pytest.mark.parametrize("crash_at", [5, 49, 101])
+def test_resume_after_crash_is_byte_identical(tmp_path, shard_count, checkpoint_frames, crash_at):
+    """checkpoint 주기와 중단 위치에 관계없이 이어서 변환한 결과가 한 번에 변환한 결과와 같다"""
+    write_sessions(tmp_path / "clean")
+    assert make_realsense(shard_count=shard_count).convert(str(tmp_path / "clean"), str(tmp_path / "expected"))
+
+    input_path = tmp_path / "input"
+    write_sessions(input_path, crash_at=crash_at)
+    realsense = make_realsense(shard_count=shard_count, checkpoint_frames=checkpoint_frames)
+    with pytest.raises(FakeCrash):
+        realsense.convert(str(input_path), str(tmp_path / "output"))
+
+    write_sessions(input_path)
+    assert realsense.convert(str(input_path), str(tmp_path / "output"))
+    assert tree_bytes(tmp_path / "output") == tree_bytes(tmp_path / "expected")
+
+
+def write_counting_rs_convert(path, log_file, exit_code):
+    """호출될 때마다 log_file에 한 줄을 남기는 rs-convert 대역"""
+    path.write_text(
+        f"#!{sys.executable}\nimport sys\n"
+        f"open({str(log_file)!r}, 'a').write(' '.join(sys.argv[1:]) + '\\n')\n"
+        f"sys.exit({exit_code})\n"
+    )
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return str(path)
+
+
+@posix_only
+@pytest.mark.parametrize("shard_count", [1, 2])
+def test_failed_image_export_is_retried_without_duplicating_rows(tmp_path, shard_count):
+    input_path = tmp_path / "input"
+    write_bag(input_path / "session_1_realsense" / "recording.bag", 20)
+    log_file = tmp_path / "rs-convert.log"
+
+    realsense = Realsense()
+    realsense.shard_count = shard_count
+    realsense.rs_convert_exe = write_counting_rs_convert(tmp_path / "rs-convert-fail", log_file, 1)
+    assert not realsense.convert(str(input_path), str(tmp_path / "output"))
+    failed_calls = len(log_file.read_text().splitlines())
+
+    # 재실행하면 이미지 추출을 다시 시도하고 CSV 행은 한 번만 남는다
+    realsense.rs_convert_exe = write_counting_rs_convert(tmp_path / "rs-convert-ok", log_file, 0)
+    assert realsense.convert(str(input_path), str(tmp_path / "output"))
+    calls = len(log_file.read_text().splitlines())
+    assert calls == 2 * failed_calls
+    assert read_checkpoint(tmp_path / "output", "session_1_realsense")['exported'] is True
+
+    with open(tmp_path / "output" / "realsense" / "csv" / "frames.csv", newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 20 and len({row['frame_timestamp'] for row in rows}) == 20
+
+    # 추출까지 끝난 세션은 건너뛴다
+    assert realsense.convert(str(input_path), str(tmp_path / "output"))
+    assert len(log_file.read_text().splitlines()) == calls
+
+
+def test_stream_replaces_stale_checkpoints(tmp_path):
+    input_path = tmp_path / "input"
+    write_sessions(input_path, crash_at=60)
+    realsense = make_realsense(checkpoint_frames=10)
+    with pytest.raises(FakeCrash):
+        realsense.convert(str(input_path), str(tmp_path / "output"))
+    assert read_checkpoint(tmp_path / "output", "session_1_realsense")['complete'] is False
+
+    write_sessions(input_path)
+    published = []
+    assert realsense.stream(str(input_path), str(tmp_path / "output"), published.append)
+    streamed = tree_bytes(tmp_path / "output")
+    assert len(published) == 160
+
+    checkpoint = read_checkpoint(tmp_path / "output", "session_1_realsense")
+    assert (checkpoint['complete'], checkpoint['exported'], checkpoint['frames']) == (True, True, 120)
+
+    # 이후 배치 변환은 스트리밍으로 끝난 세션을 다시 붙이지 않는다
+    assert realsense.convert(str(input_path), str(tmp_path / "output"))
+    assert tree_bytes(tmp_path / "output") == streamed
+
+
+def test_changed_options_invalidate_completed_sessions(tmp_path):
+    input_path = tmp_path / "input"
+    write_sessions(input_path)
+    assert make_realsense().convert(str(input_path), str(tmp_path / "output"))
+
+    # 옵션이 바뀌면 이전 출력을 지우고 새 옵션으로 처음부터 변환한 것과 같아진다
+    assert make_realsense(crop_box=(2, 2, 4, 2)).convert(str(input_path), str(tmp_path / "output"))
+    assert make_realsense(crop_box=(2, 2, 4, 2)).convert(str(input_path), str(tmp_path / "fresh"))
+    assert tree_bytes(tmp_path / "output") == tree_bytes(tmp_path / "fresh")
+
+    with open(tmp_path / "output" / "realsense" / "csv" / "frames.csv", newline='') as f:
+        assert len(list(csv.DictReader(f))) == 160
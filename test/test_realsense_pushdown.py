@@ -0,0 +1,40 @@
+import csv
+
+from conftest import T0, write_bag
+from ASDconverter.device.realsense import Realsense
+
+
+def rows(output_path):
+    with open(output_path / "realsense" / "csv" / "frames.csv", newline='') as f:
+        return [{k: v for k, v in row.items() if k != 'index'} for row in csv.DictReader(f)]
+
+
+def test_range_pushdown_keeps_exactly_the_in_range_frames(tmp_path):
+    input_path = tmp_path / "input"
+    write_bag(input_path / "session_1_realsense" / "recording.bag", 200)
+    valid_ranges = [
+        {'video_id': '1', 'start': T0 + 10 * 33.3, 'end': T0 + 40 * 33.3},
+        {'video_id': '2', 'start': T0 + 120.5 * 33.3, 'end': T0 + 150.5 * 33.3},
+    ]
+
+    full = Realsense()
+    full.frame_layout = "bucket"
+    assert full.convert(str(input_path), str(tmp_path / "full"))
+
+    pushed = Realsense()
+    pushed.frame_layout = "bucket"
+    pushed.valid_ranges = valid_ranges
+    for shard_count in (1, 3):
+        pushed.shard_count = shard_count
+        output_path = tmp_path / f"pushed_{shard_count}"
+        assert pushed.convert(str(input_path), str(output_path))
+
+        expected = [
+            row for row in rows(tmp_path / "full")
+            if any(r['start'] <= float(row['frame_timestamp']) <= r['end'] for r in valid_ranges)
+        ]
+        assert rows(output_path) == expected
+        assert len(expected) == 31 + 30
+
+        written = {path.name for path in (output_path / "realsense" / "color").rglob("*.png")}
+        assert written == {row['color_file_path'].rsplit('/', 1)[-1] for row in expected}
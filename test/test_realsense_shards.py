@@ -0,0 +1,40 @@
+import pytest
+
+from conftest import T0, write_bag, write_rs_convert, tree_bytes, posix_only
+from ASDconverter.device.realsense import Realsense
+
+
+def convert(input_path, output_path, **options):
+    realsense = Realsense()
+    for name, value in options.items():
+        setattr(realsense, name, value)
+    assert realsense.convert(str(input_path), str(output_path))
+    return tree_bytes(output_path)
+
+
+@pytest.fixture
+def sessions(tmp_path):
+    input_path = tmp_path / "input"
+    write_bag(input_path / "session_1_realsense" / "recording.bag", 120)
+    write_bag(input_path / "session_2_realsense" / "recording.bag", 75, t0=T0 + 60000, interval=33.4)
+    return input_path
+
+
+@pytest.mark.parametrize("shard_count", [2, 3, 7])
+def test_sharded_decode_matches_single_pass(tmp_path, sessions, shard_count):
+    """shard 경계 중복 제거 후 frames.csv와 프레임 파일이 순차 디코딩과 같다"""
+    expected = convert(sessions, tmp_path / "single", frame_layout="bucket")
+    actual = convert(sessions, tmp_path / "sharded", frame_layout="bucket", shard_count=shard_count)
+
+    assert actual == expected
+    assert expected["realsense/csv/frames.csv"].count(b"\n") == 1 + 120 + 75
+
+
+@posix_only
+def test_sharded_rs_convert_csv_matches_single_pass(tmp_path, sessions):
+    rs_convert = write_rs_convert(tmp_path / "rs-convert", 0)
+    expected = convert(sessions, tmp_path / "single", rs_convert_exe=rs_convert)
+    actual = convert(sessions, tmp_path / "sharded", rs_convert_exe=rs_convert, shard_count=4)
+
+    assert actual["realsense/csv/frames.csv"] == expected["realsense/csv/frames.csv"]
+    assert not list((tmp_path / "sharded" / "realsense" / "csv").glob("*.part*.csv"))
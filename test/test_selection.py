@@ -0,0 +1,35 @@
+import csv
+
+from conftest import write_inputs
+from ASDconverter.converter import Converter
+
+
+def make_converter():
+    converter = Converter()
+    converter.realsense.frame_layout = "bucket"
+    return converter
+
+
+def test_selected_reprocessing_replaces_only_selected_video(tmp_path):
+    write_inputs(tmp_path / "input")
+    assert make_converter().convert(str(tmp_path / "input"), str(tmp_path / "output"))
+    with open(tmp_path / "output" / "frames.csv", newline='') as f:
+        expected = list(csv.DictReader(f))
+
+    converter = make_converter()
+    converter.selection.video_ids = ['2']
+    assert converter.convert(str(tmp_path / "input"), str(tmp_path / "output"))
+
+    with open(tmp_path / "output" / "frames.csv", newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert [row['realsense_timestamp'] for row in rows] == [row['realsense_timestamp'] for row in expected]
+
+
+def test_selected_reprocessing_reports_stage_failure(tmp_path):
+    write_inputs(tmp_path / "input")
+    assert make_converter().convert(str(tmp_path / "input"), str(tmp_path / "output"))
+
+    converter = make_converter()
+    converter.selection.video_ids = ['2']
+    converter.realsense.convert = lambda input_dir, output_dir: False
+    assert not converter.convert(str(tmp_path / "input"), str(tmp_path / "output"))
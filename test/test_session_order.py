@@ -0,0 +1,52 @@
+import csv
+import subprocess
+
+from conftest import T0, write_bag, write_rs_convert, posix_only
+from ASDconverter.device import realsense as realsense_module
+from ASDconverter.device.realsense import Realsense
+from ASDconverter.device.session import find_session_dirs
+
+
+def test_sessions_are_ordered_by_number(tmp_path):
+    for number in (10, 2, 1):
+        write_bag(tmp_path / f"session_{number}_realsense" / "recording.bag", 1)
+        (tmp_path / f"session_{number}_tobii").mkdir()
+    (tmp_path / "session_x_tobii").mkdir()
+
+    assert [path.name for path in find_session_dirs(tmp_path, "realsense")] == [
+        "session_1_realsense", "session_2_realsense", "session_10_realsense",
+    ]
+    assert [path.name for path in find_session_dirs(tmp_path, "tobii")] == [
+        "session_1_tobii", "session_2_tobii", "session_10_tobii", "session_x_tobii",
+    ]
+
+
+@posix_only
+def test_stream_publishes_in_session_order_with_bounded_rs_convert(tmp_path, monkeypatch):
+    input_path = tmp_path / "input"
+    for number in (1, 2, 10):
+        write_bag(input_path / f"session_{number}_realsense" / "recording.bag", 5, t0=T0 + number * 1000)
+
+    running = []
+    peak = [0]
+    popen = subprocess.Popen
+    def tracked_popen(*args, **kwargs):
+        running[:] = [process for process in running if process.poll() is None]
+        process = popen(*args, **kwargs)
+        running.append(process)
+        peak[0] = max(peak[0], len(running))
+        return process
+    monkeypatch.setattr(realsense_module.subprocess, "Popen", tracked_popen)
+    monkeypatch.setattr(realsense_module.mp, "cpu_count", lambda: 2)
+
+    realsense = Realsense()
+    realsense.rs_convert_exe = write_rs_convert(tmp_path / "rs-convert", 0)
+    published = []
+    assert realsense.stream(str(input_path), str(tmp_path / "output"), published.append)
+
+    timestamps = [float(row['frame_timestamp']) for row in published]
+    assert len(timestamps) == 15 and timestamps == sorted(timestamps)
+    assert peak[0] <= 2
+
+    with open(tmp_path / "output" / "realsense" / "csv" / "frames.csv", newline='') as f:
+        assert [float(row['frame_timestamp']) for row in csv.DictReader(f)] == timestamps
@@ -0,0 +1,136 @@
+import csv
+import queue
+import random
+
+import pytest
+
+from conftest import T0, TOBII_COLUMNS
+from ASDconverter.converter import argparser
+from ASDconverter.matcher.matcher import Matcher
+from ASDconverter.matcher.stream import StreamMatcher
+
+
+def make_streams(rng):
+    """오름차순 RealSense/Tobii 행 (같은 타임스탬프, 프레임 누락, 긴 빈 구간 포함)"""
+    def timestamps(interval, count):
+        t = T0
+        values = []
+        for _ in range(count):
+            step = rng.choice([interval, interval, interval * rng.uniform(0.5, 1.5), 0.0, interval * rng.uniform(3, 20)])
+            t = max(t, round(t + step, rng.choice([0, 3, 6])))
+            values.append(t)
+        return values
+
+    realsense = [
+        {'index': str(i), 'frame_timestamp': f"{t:.14f}", 'color_file_path': f"c{i}.png", 'depth_file_path': f"d{i}.bin"}
+        for i, t in enumerate(timestamps(33.3, rng.randint(0, 150)))
+    ]
+    tobii = []
+    for i, t in enumerate(timestamps(rng.choice([8.3, 16.7, 40.0]), rng.randint(0, 400))):
+        row = {column: f"{rng.uniform(-1, 1):.6f}" for column in TOBII_COLUMNS}
+        row.update(index=str(i), frame_timestamp=f"{t:.14f}")
+        tobii.append(row)
+    return realsense, tobii
+
+
+def batch_rows(realsense, tobii, valid_ranges):
+    matcher = Matcher()
+    parse = matcher.timestamp.parse
+    rows, *_ = matcher._match_frames(
+        [dict(row, frame_timestamp=parse(row['frame_timestamp'])) for row in realsense],
+        [dict(row, frame_timestamp=parse(row['frame_timestamp'])) for row in tobii],
+        valid_ranges,
+    )
+    return rows
+
+
+def stream_rows(rng, realsense, tobii, valid_ranges):
+    """두 스트림을 임의 순서로 섞어 push (가끔 advance_to로 시각을 알림)"""
+    stream = StreamMatcher(Matcher(), valid_ranges)
+    rows = []
+    i = j = 0
+    while i < len(realsense) or j < len(tobii):
+        if rng.random() < 0.1:
+            upcoming = [float(rows_[k]['frame_timestamp']) for rows_, k in ((realsense, i), (tobii, j)) if k < len(rows_)]
+            rows += stream.advance_to(min(upcoming))
+        if j >= len(tobii) or (i < len(realsense) and rng.random() < 0.4):
+            rows += stream.push_realsense(realsense[i])
+            i += 1
+        else:
+            rows += stream.push_tobii(tobii[j])
+            j += 1
+    return rows + stream.close()
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_stream_matcher_equals_batch_matching(seed):
+    rng = random.Random(seed)
+    realsense, tobii = make_streams(rng)
+    valid_ranges = [{'video_id': '1', 'start': T0 + 500, 'end': T0 + 2000}, {'video_id': '2', 'start': T0 + 2500, 'end': T0 + 9000}]
+
+    assert stream_rows(rng, realsense, tobii, valid_ranges) == batch_rows(realsense, tobii, valid_ranges)
+
+
+def filled_queue(rows):
+    source = queue.Queue()
+    for row in rows:
+        source.put(row)
+    source.put(None)
+    return source
+
+
+def test_match_stream_bounds_tobii_buffer(tmp_path, monkeypatch):
+    """Tobii 입력이 모두 먼저 도착해 있어도 버퍼는 RealSense 주변 구간만 유지"""
+    rng = random.Random(0)
+    realsense = [
+        {'index': str(i), 'frame_timestamp': f"{T0 + i * 33.3:.14f}", 'color_file_path': f"c{i}.png", 'depth_file_path': f"d{i}.bin"}
+        for i in range(300)
+    ]
+    tobii = []
+    for i in range(1200):
+        row = {column: f"{rng.uniform(-1, 1):.6f}" for column in TOBII_COLUMNS}
+        row.update(index=str(i), frame_timestamp=f"{T0 + i * 8.3:.14f}")
+        tobii.append(row)
+    valid_ranges = [{'video_id': '1', 'start': T0, 'end': T0 + 10000}]
+
+    matcher = Matcher()
+    peak = [0]
+    push_tobii = StreamMatcher.push_tobii
+    def tracked_push_tobii(self, row):
+        rows = push_tobii(self, row)
+        peak[0] = max(peak[0], self.statistics()['buffered_tobii'])
+        return rows
+    monkeypatch.setattr(StreamMatcher, "push_tobii", tracked_push_tobii)
+
+    assert matcher.match_stream(filled_queue(realsense), filled_queue(tobii), tmp_path, valid_ranges)
+
+    assert peak[0] <= 3 * matcher.max_time_diff / 8.3 + 2
+    with open(tmp_path / matcher.matched_output_path, newline='') as f:
+        assert len(list(csv.DictReader(f))) == len(realsense)
+
+
+def test_replay_requires_exactly_one_realsense_source(capsys):
+    with pytest.raises(SystemExit):
+        argparser(["replay", "--tobii", "tobii.csv"])
+    assert "--realsense" in capsys.readouterr().err
+
+    with pytest.raises(SystemExit):
+        argparser(["replay", "--tobii", "tobii.csv", "--realsense", "rs.csv", "--bag", "rec.bag"])
+
+    assert argparser(["replay", "--tobii", "tobii.csv", "--bag", "rec.bag"]).bag == "rec.bag"
+
+
+@pytest.mark.parametrize("argv, message", [
+    (["match", "--realsense", "rs.csv"], "--tobii"),
+    (["match", "--tobii", "tobii.csv", "--output_path", "out"], "--realsense"),
+    (["match"], "--output_path"),
+])
+def test_match_requires_csv_pair_or_output_path(capsys, argv, message):
+    with pytest.raises(SystemExit):
+        argparser(argv)
+    assert message in capsys.readouterr().err
+
+
+def test_match_accepts_csv_pair_or_output_path():
+    assert argparser(["match", "--realsense", "rs.csv", "--tobii", "tobii.csv"]).tobii == "tobii.csv"
+    assert argparser(["match", "--output_path", "out"]).output_path == "out"
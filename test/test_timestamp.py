@@ -0,0 +1,64 @@
+import math
+
+import pytest
+
+from ASDconverter.timestamp.timestamp import Timestamp
+
+
+def make_timestamp(unit):
+    timestamp = Timestamp()
+    timestamp.unit = unit
+    return timestamp
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("1723456789012", 1723456789012.0),
+    ("1723456789012.5", 1723456789012.5),
+    ("1723456789012.12345678901234", 1723456789012.12345678901234),
+    ("1723456789012500", 1723456789012.5),
+    ("1723456789012500.0", 1723456789012.5),
+])
+def test_parse_detects_unit_by_magnitude(value, expected):
+    """정수 ms 표기는 ms로, µs 크기의 값만 µs로 읽는다"""
+    assert Timestamp().parse(value) == expected
+
+
+def test_parse_rejects_invalid_values():
+    with pytest.raises(ValueError):
+        Timestamp().parse("bad")
+
+
+def test_parse_array_matches_parse():
+    values = ["1723456789012", "1723456789012.5", "1723456789012500", " 1723456789012123 ", "", "bad"]
+
+    result = Timestamp().parse_array(values)
+
+    assert list(result[:4]) == [1723456789012.0, 1723456789012.5, 1723456789012.5, 1723456789012.123]
+    assert math.isnan(result[4]) and math.isnan(result[5])
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("1723456789012", "1723456789012"),
+    ("1723456789012.5", "1723456789012.5"),
+    ("1723456789012500", "1723456789012.50000000000000"),
+    ("", ""),
+])
+def test_normalize_ms(value, expected):
+    assert make_timestamp("ms").normalize(value) == expected
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("1723456789012", "1723456789012000"),
+    ("1723456789012.5", "1723456789012500"),
+    ("1723456789012500", "1723456789012500"),
+    ("1723456789012500.0", "1723456789012500"),
+])
+def test_normalize_us(value, expected):
+    assert make_timestamp("us").normalize(value) == expected
+
+
+@pytest.mark.parametrize("unit", ["ms", "us"])
+def test_format_round_trips(unit):
+    timestamp = make_timestamp(unit)
+    for ms in (1723456789012.0, 1723456789012.5, 1723456789012.123):
+        assert timestamp.parse(timestamp.format(ms)) == pytest.approx(ms, abs=timestamp.resolution() / 2)